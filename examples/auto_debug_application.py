@@ -1,13 +1,164 @@
 #!/usr/bin/env python3
 """Autonomously debug the full-stack application until it works."""
 
+import json
+import re
+import shutil
+import subprocess
 import sys
-import os
+from dataclasses import dataclass
+from pathlib import Path
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+ENV = ROOT / ".env"
+PROJECT = Path("/home/txz/dev/langest/generated_fullstack_service")
 
-from langest.agents.autonomous_debugger import AutonomousDebuggingAgent
+
+# Display names for the components reported by run_comprehensive_debug()
+_DISPLAY_NAMES = {
+    "backend_build": "Backend Build",
+    "frontend_build": "Frontend Build",
+    "dependencies": "Dependencies",
+    "tilt_setup": "Tilt Setup",
+    "backend_start": "Backend Start",
+    "frontend_start": "Frontend Start",
+    "tests": "Tests",
+}
+
+
+def _display_name(component: str) -> str:
+    """Look up a component's display name, deriving and memoizing unknown ones."""
+    name = _DISPLAY_NAMES.get(component)
+    if name is None:
+        name = _DISPLAY_NAMES.setdefault(component, component.replace('_', ' ').title())
+    return name
+
+
+# Closing advice for the report, keyed by success-rate band
+OUTCOME_MESSAGES = {
+    100: [
+        "🎉 FULL SUCCESS! All components are working!",
+        "🚀 Your application is ready for development and deployment!",
+        "",
+        "💡 Next steps:",
+        "   • Run 'make tilt' to start the development environment",
+        "   • Access frontend: http://localhost:3000",
+        "   • Access backend: http://localhost:8080",
+        "   • Monitor with Tilt UI: http://localhost:10350",
+    ],
+    70: [
+        "🟡 PARTIAL SUCCESS! Most components are working.",
+        "🔧 Some issues remain but core functionality should work",
+        "",
+        "💡 You can try:",
+        "   • Run 'make backend' and 'make frontend' separately",
+        "   • Check the debug history for remaining issues",
+    ],
+    0: [
+        "🔴 MULTIPLE ISSUES REMAINING",
+        "🔍 Check the debug history above for details",
+        "🛠️  You may need to manually address some issues",
+    ],
+}
+
+
+@dataclass
+class Diagnostic:
+    """A finding from a local static-analysis tool."""
+    tool: str
+    path: str
+    line: int
+    message: str
+    fixable: bool = False
+
+    def __str__(self) -> str:
+        return f"[{self.tool}] {self.path}:{self.line}: {self.message}"
+
+
+_GO_DIAGNOSTIC = re.compile(r'^(?:vet: )?(?:\./)?([^\s:]+\.go):(\d+)(?::\d+)?:\s*(.+)$')
+_UNUSED_IMPORT = re.compile(r'"([^"]+)" imported and not used')
+
+
+def _run_tool(command: list, cwd: Path, timeout: int = 60):
+    """Run a static-analysis tool, returning None if it can't be run."""
+    try:
+        return subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def _static_pass(project_path: Path) -> list:
+    """Run fast local checks (go vet, gofmt, eslint) before any LLM call.
+
+    Tools that aren't installed are skipped.
+    """
+    diagnostics = []
+    backend = project_path / "backend"
+    frontend = project_path / "frontend"
+
+    if (backend / "go.mod").exists() and shutil.which("go"):
+        vet = _run_tool(["go", "vet", "./..."], backend)
+        for line in (vet.stderr.splitlines() if vet else []):
+            match = _GO_DIAGNOSTIC.match(line.strip())
+            if match:
+                path, lineno, message = match.groups()
+                diagnostics.append(Diagnostic(
+                    "go vet", f"backend/{path}", int(lineno), message,
+                    fixable=bool(_UNUSED_IMPORT.search(message)),
+                ))
+        gofmt = _run_tool(["gofmt", "-l", "."], backend) if shutil.which("gofmt") else None
+        for path in (gofmt.stdout.split() if gofmt else []):
+            diagnostics.append(Diagnostic("gofmt", f"backend/{path}", 0, "file is not gofmt-formatted", fixable=True))
+
+    # Only use a locally installed eslint; npx would otherwise try to download it
+    if (frontend / "node_modules" / ".bin" / "eslint").exists():
+        eslint = _run_tool(["npx", "--no-install", "eslint", "--format", "json", "src"], frontend)
+        try:
+            reports = json.loads(eslint.stdout) if eslint else []
+        except json.JSONDecodeError:
+            reports = []
+        for report in reports:
+            path = Path(report["filePath"])
+            if path.is_absolute():
+                path = path.relative_to(project_path)
+            for message in report.get("messages", []):
+                diagnostics.append(Diagnostic(
+                    "eslint", str(path), message.get("line", 0),
+                    f"{message.get('message', '')} ({message.get('ruleId')})",
+                    fixable="fix" in message,
+                ))
+
+    return diagnostics
+
+
+def _apply_static_fixes(project_path: Path, diagnostics: list, debugger) -> bool:
+    """Apply the known mechanical rewrites; return True if anything changed."""
+    changed = False
+    fixable = [diagnostic for diagnostic in diagnostics if diagnostic.fixable]
+    # Drop the unused import lines go vet pointed at, bottom up and in one
+    # write per file so the reported line numbers still hold, and before
+    # gofmt can move them
+    unused_imports = {}
+    for diagnostic in fixable:
+        if diagnostic.tool == "go vet":
+            package = _UNUSED_IMPORT.search(diagnostic.message).group(1)
+            unused_imports.setdefault(diagnostic.path, {})[diagnostic.line - 1] = package
+    for path, packages in unused_imports.items():
+        file_path = project_path / path
+        lines = file_path.read_text(encoding="utf-8").splitlines(keepends=True)
+        removed = False
+        for index in sorted(packages, reverse=True):
+            if 0 <= index < len(lines) and f'"{packages[index]}"' in lines[index]:
+                del lines[index]
+                removed = True
+        if removed:
+            changed |= debugger.write_file(str(file_path), "".join(lines))
+    for path in dict.fromkeys(d.path for d in fixable if d.tool == "gofmt"):
+        changed |= _run_tool(["gofmt", "-w", path], project_path) is not None
+    if any(d.tool == "eslint" and d.fixable for d in diagnostics):
+        changed |= _run_tool(["npx", "--no-install", "eslint", "--fix", "src"], project_path / "frontend") is not None
+    return changed
 
 
 def main():
@@ -21,22 +172,39 @@ def main():
     print()
     
     # Check environment
-    env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if not os.path.exists(env_file):
+    if not ENV.exists():
         print("⚠️  WARNING: .env file not found!")
         print("   The debugging agent needs your GROQ_API_KEY to function")
         return
     
+    # Imported only now so a missing .env exits without loading LangChain
+    sys.path.insert(0, str(SRC))
+    from langest.agents.autonomous_debugger import AutonomousDebuggingAgent
+    
     # Initialize the autonomous debugging agent
     print("🚀 Initializing Autonomous Debugging Agent...")
     debugger = AutonomousDebuggingAgent()
     
     # Set project path
-    project_path = "/home/txz/dev/langest/generated_fullstack_service"
+    project_path = str(PROJECT)
     
     print(f"📁 Project: {project_path}")
     print()
     
+    # Fix what local tools can fix before spending any LLM calls
+    print("🎯 PHASE 0: Local Static Analysis")
+    print("-" * 50)
+    diagnostics = _static_pass(PROJECT)
+    if any(d.fixable for d in diagnostics) and _apply_static_fixes(PROJECT, diagnostics, debugger):
+        diagnostics = _static_pass(PROJECT)
+    if diagnostics:
+        print(f"⚠️  {len(diagnostics)} diagnostics remain for the debugging agent")
+        static_context = "STATIC ANALYSIS DIAGNOSTICS:\n" + "\n".join(str(d) for d in diagnostics)
+    else:
+        print("✅ Static analysis clean")
+        static_context = ""
+    print()
+    
     # Start with a specific command that was failing
     print("🎯 PHASE 1: Fix Tilt Configuration")
     print("-" * 50)
@@ -63,52 +231,37 @@ def main():
     print("\n🎯 PHASE 3: Comprehensive Application Debugging")
     print("-" * 50)
     
-    results = debugger.run_comprehensive_debug(project_path)
+    results = debugger.run_comprehensive_debug(project_path, static_context)
     
     # Final report
-    print("\n" + "=" * 70)
-    print("📊 FINAL DEBUGGING REPORT")
-    print("=" * 70)
-    
     total_working = sum(results.values())
     total_components = len(results)
     success_rate = (total_working / total_components) * 100
     
-    print(f"✅ Components Working: {total_working}/{total_components} ({success_rate:.0f}%)")
-    print()
-    
-    for component, status in results.items():
-        status_icon = "✅" if status else "❌"
-        component_name = component.replace('_', ' ').title()
-        print(f"{status_icon} {component_name}")
-    
-    print()
+    lines = [
+        "",
+        "=" * 70,
+        "📊 FINAL DEBUGGING REPORT",
+        "=" * 70,
+        f"✅ Components Working: {total_working}/{total_components} ({success_rate:.0f}%)",
+        "",
+    ]
+    lines.extend(
+        f"{'✅' if status else '❌'} {_display_name(component)}"
+        for component, status in results.items()
+    )
+    lines.append("")
     
     if total_working == total_components:
-        print("🎉 FULL SUCCESS! All components are working!")
-        print("🚀 Your application is ready for development and deployment!")
-        print()
-        print("💡 Next steps:")
-        print("   • Run 'make tilt' to start the development environment")
-        print("   • Access frontend: http://localhost:3000")
-        print("   • Access backend: http://localhost:8080")
-        print("   • Monitor with Tilt UI: http://localhost:10350")
-        
+        band = 100
     elif total_working >= total_components * 0.7:  # 70% success
-        print("🟡 PARTIAL SUCCESS! Most components are working.")
-        print("🔧 Some issues remain but core functionality should work")
-        print()
-        print("💡 You can try:")
-        print("   • Run 'make backend' and 'make frontend' separately")
-        print("   • Check the debug history for remaining issues")
-        
+        band = 70
     else:
-        print("🔴 MULTIPLE ISSUES REMAINING")
-        print("🔍 Check the debug history above for details")
-        print("🛠️  You may need to manually address some issues")
+        band = 0
+    lines.extend(OUTCOME_MESSAGES[band])
+    lines.extend(["", "🤖 Autonomous debugging session completed!"])
     
-    print()
-    print("🤖 Autonomous debugging session completed!")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return total_working == total_components
 
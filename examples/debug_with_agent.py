@@ -2,25 +2,30 @@
 """Demonstrate debugging capabilities with DevOps Agent."""
 
 import sys
-import os
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+ENV = ROOT / ".env"
+PROJECT = Path("/home/txz/dev/langest/generated_fullstack_service")
 
-from langest.agents.devops_engineer import DevOpsEngineerAgent
+if TYPE_CHECKING:
+    from langest.agents.devops_engineer import DevOpsEngineerAgent
 
 
-def debug_current_project():
-    """Debug the current full-stack project."""
+def debug_current_project(devops_agent: "DevOpsEngineerAgent"):
+    """Debug the current full-stack project.
+    
+    Args:
+        devops_agent: Shared agent, so every call reuses one LLM client
+    """
     
     print("🔧 DevOps Agent - Debugging Full-Stack Application")
     print("=" * 60)
     
-    # Initialize the DevOps agent
-    devops_agent = DevOpsEngineerAgent()
-    
     # Define the project path
-    project_path = "/home/txz/dev/langest/generated_fullstack_service"
+    project_path = str(PROJECT)
     
     # Define the error we encountered
     error_description = """
@@ -33,6 +38,8 @@ def debug_current_project():
     This prevents the backend from starting.
     """
     
+    from langest.tools.fix_cache import StructuralFixCache
+    
     print("🔍 Analyzing project and debugging issue...")
     print(f"📁 Project Path: {project_path}")
     print(f"⚠️  Error: Go build failing due to unused import")
@@ -40,9 +47,12 @@ def debug_current_project():
     
     try:
         # Use the DevOps agent to debug the issue
+        # Known error shapes are fixed from the cache without an LLM call
         debug_analysis = devops_agent.debug_application(
             project_path=project_path,
-            error_description=error_description
+            error_description=error_description,
+            fix_cache=StructuralFixCache(),
+            verify_command="cd backend && go build"
         )
         
         print("🤖 DevOps Agent Analysis:")
@@ -74,14 +84,16 @@ def debug_current_project():
     return True
 
 
-def demonstrate_other_capabilities():
-    """Demonstrate other DevOps agent capabilities."""
+def demonstrate_other_capabilities(devops_agent: "DevOpsEngineerAgent"):
+    """Demonstrate other DevOps agent capabilities.
+    
+    Args:
+        devops_agent: Shared agent, so every call reuses one LLM client
+    """
     
     print("\n🚀 Additional DevOps Agent Capabilities:")
     print("=" * 60)
     
-    devops_agent = DevOpsEngineerAgent()
-    
     # Demonstrate deployment pipeline creation
     print("\n📦 Creating Deployment Pipeline...")
     pipeline = devops_agent.create_deployment_pipeline(
@@ -104,7 +116,7 @@ def demonstrate_other_capabilities():
     }
     
     optimization = devops_agent.optimize_performance(
-        project_path="/home/txz/dev/langest/generated_fullstack_service",
+        project_path=str(PROJECT),
         performance_metrics=performance_metrics
     )
     
@@ -121,20 +133,26 @@ def main():
     print()
     
     # Check if we have the required environment
-    env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if not os.path.exists(env_file):
+    if not ENV.exists():
         print("⚠️  WARNING: .env file not found!")
         print("   The DevOps agent needs your GROQ_API_KEY to function")
         print("   Set up your .env file and try again")
         return
     
+    # Imported only now so a missing .env exits without loading LangChain
+    sys.path.insert(0, str(SRC))
+    from langest.agents.devops_engineer import DevOpsEngineerAgent
+    
     try:
+        # One agent (and one HTTP connection pool) for the whole demo
+        devops_agent = DevOpsEngineerAgent()
+        
         # Debug the current project
-        success = debug_current_project()
+        success = debug_current_project(devops_agent)
         
         if success:
             # Demonstrate other capabilities
-            demonstrate_other_capabilities()
+            demonstrate_other_capabilities(devops_agent)
             
             print("\n✅ DevOps Agent Demo Completed Successfully!")
             print("\n💡 Key Capabilities Demonstrated:")
@@ -1,74 +1,78 @@
 #!/usr/bin/env python3
 """Example script demonstrating the AI Development Team workflow."""
 
+import argparse
 import sys
-import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
 
-from langest.graphs.dev_team_graph import create_dev_team_graph
+# Graph node -> (heading, state key) of the deliverable it produces
+RESULT_SECTIONS = {
+    "project_manager": ("🎯 PROJECT PLAN:", "project_plan"),
+    "software_engineer": ("💻 CODE IMPLEMENTATION:", "code_implementation"),
+    "qa_engineer": ("🧪 QA TESTING:", "test_results"),
+    "tech_writer": ("📚 DOCUMENTATION:", "documentation"),
+    "review": ("📋 FINAL DELIVERABLE:", "final_deliverable"),
+}
 
 
-def run_dev_team_project(project_request: str):
+def _truncate(text: str, limit: int = 500) -> str:
+    """Shorten text to `limit` characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _get_graph():
+    """The development team graph shared by every run."""
+    # Imported here so --help and usage errors don't load LangChain
+    sys.path.insert(0, str(SRC))
+    from langest.graphs.dev_team_graph import DEV_TEAM_GRAPH
+    
+    return DEV_TEAM_GRAPH
+
+
+def run_dev_team_project(project_request: str, graph=None):
     """Run a project through the AI development team.
     
     Args:
         project_request: Description of the project to be developed
+        graph: Prebuilt development team graph; defaults to the shared one
     """
     print("🚀 Starting AI Development Team Project")
     print("=" * 60)
     print(f"📋 Project Request: {project_request}")
     print("=" * 60)
     
-    # Create the development team graph
-    graph = create_dev_team_graph()
+    if graph is None:
+        graph = _get_graph()
+    from langest.graphs.dev_team_graph import new_dev_team_state
     
     # Initialize the state
-    initial_state = {
-        "project_request": project_request,
-        "messages": [],
-        "project_plan": "",
-        "code_implementation": "",
-        "test_plan": "",
-        "test_results": "",
-        "documentation": "",
-        "final_deliverable": "",
-        "current_agent": "",
-        "next_step": "project_manager"
-    }
+    initial_state = new_dev_team_state(project_request)
     
     print("⚡ Executing development workflow...")
-    print("   🎯 Project Manager → 💻 Software Engineer → 🧪 QA Engineer → 📚 Tech Writer → 📋 Final Review")
+    print("   🎯 Project Manager → (💻 Software Engineer | 🧪 QA Engineer | 📚 Tech Writer) → 📋 Final Review")
     print()
     
-    # Run the workflow
+    # Run the workflow, showing each deliverable as soon as its agent finishes
     try:
-        result = graph.invoke(initial_state)
+        result = initial_state
+        for mode, chunk in graph.stream(initial_state, stream_mode=["updates", "values"]):
+            if mode == "values":
+                result = chunk
+                continue
+            for node, update in chunk.items():
+                if node in RESULT_SECTIONS:
+                    title, key = RESULT_SECTIONS[node]
+                    print(f"\n{title}")
+                    print("-" * 40)
+                    print(_truncate(update[key]), flush=True)
         
-        # Display results
-        print("✅ PROJECT COMPLETED SUCCESSFULLY!")
+        print()
         print("=" * 60)
-        
-        print("\n🎯 PROJECT PLAN:")
-        print("-" * 40)
-        print(result["project_plan"][:500] + "..." if len(result["project_plan"]) > 500 else result["project_plan"])
-        
-        print("\n💻 CODE IMPLEMENTATION:")
-        print("-" * 40)
-        print(result["code_implementation"][:500] + "..." if len(result["code_implementation"]) > 500 else result["code_implementation"])
-        
-        print("\n🧪 QA TESTING:")
-        print("-" * 40)
-        print(result["test_results"][:500] + "..." if len(result["test_results"]) > 500 else result["test_results"])
-        
-        print("\n📚 DOCUMENTATION:")
-        print("-" * 40)
-        print(result["documentation"][:500] + "..." if len(result["documentation"]) > 500 else result["documentation"])
-        
-        print("\n📋 FINAL DELIVERABLE:")
-        print("-" * 40)
-        print(result["final_deliverable"][:500] + "..." if len(result["final_deliverable"]) > 500 else result["final_deliverable"])
+        print("✅ PROJECT COMPLETED SUCCESSFULLY!")
         
         return result
         
@@ -77,49 +81,94 @@ def run_dev_team_project(project_request: str):
         return None
 
 
-def main():
-    """Main function with example project requests."""
+# Example projects
+EXAMPLE_PROJECTS = [
+    "Create a Python CLI tool that helps developers manage their Git repositories by providing quick statistics, branch information, and commit summaries",
     
-    # Example projects
-    example_projects = [
-        "Create a Python CLI tool that helps developers manage their Git repositories by providing quick statistics, branch information, and commit summaries",
-        
-        "Build a REST API for a task management system that allows users to create, update, delete, and organize tasks with categories and due dates",
-        
-        "Develop a Python library for processing CSV files with advanced filtering, sorting, and data transformation capabilities",
-        
-        "Create a web scraping tool that can extract product information from e-commerce websites and save the data in various formats"
-    ]
+    "Build a REST API for a task management system that allows users to create, update, delete, and organize tasks with categories and due dates",
+    
+    "Develop a Python library for processing CSV files with advanced filtering, sorting, and data transformation capabilities",
     
+    "Create a web scraping tool that can extract product information from e-commerce websites and save the data in various formats"
+]
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command line; with no options the interactive menu is used."""
+    parser = argparse.ArgumentParser(description="Run projects through the AI development team.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--project-index", type=int, choices=range(1, len(EXAMPLE_PROJECTS) + 1),
+                       metavar=f"1-{len(EXAMPLE_PROJECTS)}", help="run one of the example projects")
+    group.add_argument("--project", type=str, help="run a custom project request")
+    group.add_argument("--all", action="store_true", help="run every example project concurrently")
+    args = parser.parse_args(argv)
+    if args.project is not None and not args.project.strip():
+        parser.error("--project must not be empty")
+    if args.project_index is None and args.project is None and not args.all and not sys.stdin.isatty():
+        parser.error("stdin is not a terminal; pass --project-index, --project or --all")
+    return args
+
+
+def _choose_project():
+    """Ask for a project on the interactive menu; returns None to exit."""
     print("🎯 AI Development Team - Project Examples")
     print("=" * 60)
     
-    for i, project in enumerate(example_projects, 1):
+    for i, project in enumerate(EXAMPLE_PROJECTS, 1):
         print(f"{i}. {project}")
     
-    print(f"{len(example_projects) + 1}. Enter custom project")
+    print(f"{len(EXAMPLE_PROJECTS) + 1}. Enter custom project")
     print("0. Exit")
     
+    choice = input("\nSelect a project (0-{}): ".format(len(EXAMPLE_PROJECTS) + 1))
+    choice = int(choice)
+    
+    if choice == 0:
+        print("👋 Goodbye!")
+        return None
+    elif 1 <= choice <= len(EXAMPLE_PROJECTS):
+        return EXAMPLE_PROJECTS[choice - 1]
+    elif choice == len(EXAMPLE_PROJECTS) + 1:
+        project_request = input("Enter your custom project request: ").strip()
+        if not project_request:
+            print("❌ Empty project request. Exiting.")
+        return project_request or None
+    else:
+        print("❌ Invalid choice. Exiting.")
+        return None
+
+
+def main(argv=None):
+    """Main function with example project requests.
+    
+    Args:
+        argv: Command line arguments; defaults to sys.argv[1:]
+    """
+    args = _parse_args(argv)
+    
+    # Compile once up front; every project run reuses the same graph
+    graph = _get_graph()
+    
     try:
-        choice = input("\nSelect a project (0-{}): ".format(len(example_projects) + 1))
-        choice = int(choice)
-        
-        if choice == 0:
-            print("👋 Goodbye!")
+        if args.all:
+            # The projects are independent LLM pipelines, so run them side by side
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda project: run_dev_team_project(project, graph), EXAMPLE_PROJECTS))
+            completed = sum(result is not None for result in results)
+            print(f"\n🎉 {completed}/{len(results)} projects completed successfully!")
             return
-        elif 1 <= choice <= len(example_projects):
-            project_request = example_projects[choice - 1]
-        elif choice == len(example_projects) + 1:
-            project_request = input("Enter your custom project request: ").strip()
-            if not project_request:
-                print("❌ Empty project request. Exiting.")
-                return
+        
+        if args.project is not None:
+            project_request = args.project.strip()
+        elif args.project_index is not None:
+            project_request = EXAMPLE_PROJECTS[args.project_index - 1]
         else:
-            print("❌ Invalid choice. Exiting.")
-            return
+            project_request = _choose_project()
+            if project_request is None:
+                return
         
         # Run the selected project
-        result = run_dev_team_project(project_request)
+        result = run_dev_team_project(project_request, graph)
         
         if result:
             print("\n🎉 Project completed successfully!")
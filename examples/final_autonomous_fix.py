@@ -1,36 +1,95 @@
 #!/usr/bin/env python3
 """Final autonomous fix for the remaining frontend and test issues."""
 
+import asyncio
+import collections
 import os
+import shlex
+import signal
 import subprocess
+import threading
 import time
+from pathlib import Path
+from typing import Union
 
+import httpx
 
-def run_command(command: str, cwd: str = "/home/txz/dev/langest/generated_fullstack_service", timeout: int = 30) -> dict:
-    """Run a command and return results."""
-    print(f"🔧 Executing: {command}")
+PROJECT = Path("/home/txz/dev/langest/generated_fullstack_service")
+
+
+MAX_OUTPUT_LINES = 200
+# Bytes read from an async pipe at a time, and kept of a line that runs on
+MAX_LINE_BYTES = 1024 * 1024
+
+
+def _drain(pipe, sink: collections.deque):
+    """Copy lines from a pipe into a bounded deque until EOF."""
+    with pipe:
+        for line in pipe:
+            sink.append(line)
+
+
+def _run_streaming(command: Union[str, list], cwd: str, timeout: int) -> tuple:
+    """Run a command, keeping only the last lines of each stream.
+
+    Output is read line by line as it is produced, so a chatty command like
+    `npm test` costs at most MAX_OUTPUT_LINES lines of memory per stream.
+    A string goes through /bin/sh; an argv list is exec'd directly.
+    """
+    proc = subprocess.Popen(
+        command,
+        shell=isinstance(command, str),
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1,
+    )
+    tails = (collections.deque(maxlen=MAX_OUTPUT_LINES), collections.deque(maxlen=MAX_OUTPUT_LINES))
+    readers = [
+        threading.Thread(target=_drain, args=(pipe, sink), daemon=True)
+        for pipe, sink in zip((proc.stdout, proc.stderr), tails)
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        return_code = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        return 124, "".join(tails[0]), f"Command timed out after {timeout} seconds"
+    for reader in readers:
+        reader.join()
+    return return_code, "".join(tails[0]), "".join(tails[1])
+
+
+def _display(command: Union[str, list]) -> str:
+    return command if isinstance(command, str) else shlex.join(command)
+
+
+def run_command(command: Union[str, list], cwd: Path = PROJECT, timeout: int = 30) -> dict:
+    """Run a command and return results.
+
+    A string is run through the shell; prefer an argv list for simple
+    commands, which is exec'd directly with no shell in between.
+    """
+    print(f"🔧 Executing: {_display(command)}")
     
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        return_code, stdout, stderr = _run_streaming(command, cwd, timeout)
         
-        success = result.returncode == 0
+        success = return_code == 0
         if success:
             print(f"✅ Command succeeded")
         else:
-            print(f"❌ Command failed (exit code: {result.returncode})")
+            print(f"❌ Command failed (exit code: {return_code})")
         
         return {
             "command": command,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "return_code": result.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "return_code": return_code,
             "success": success
         }
     except Exception as e:
@@ -38,14 +97,29 @@ def run_command(command: str, cwd: str = "/home/txz/dev/langest/generated_fullst
         return {"command": command, "success": False, "stderr": str(e)}
 
 
-def write_file(file_path: str, content: str, base_path: str = "/home/txz/dev/langest/generated_fullstack_service") -> bool:
-    """Write content to a file."""
+_updated_files = set()
+
+
+def write_file(file_path: str, content: str, base_path: Path = PROJECT) -> bool:
+    """Write content to a file atomically, skipping writes that change nothing.
+
+    Unchanged files are left alone so Tilt/webpack watchers don't rebuild;
+    paths that were actually rewritten are recorded in ``_updated_files``.
+    """
     try:
-        full_path = os.path.join(base_path, file_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        full_path = Path(base_path) / file_path
+        data = content.encode("utf-8")
+        
+        # Compare sizes before reading so most real edits skip the read
+        if full_path.is_file() and full_path.stat().st_size == len(data) and full_path.read_bytes() == data:
+            print(f"✔️  Unchanged: {file_path}")
+            return True
         
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = full_path.with_name(full_path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, full_path)
+        _updated_files.add(file_path)
         
         print(f"📝 Fixed file: {file_path}")
         return True
@@ -176,60 +250,262 @@ test('app contains some content', () => {
     return True
 
 
-def test_everything():
-    """Test that everything is working after our fixes."""
-    print("🔬 TESTING EVERYTHING AFTER FIXES")
-    print("-" * 50)
+# name -> (argv, log file, pid file); all paths relative to PROJECT/<name>
+SERVICES = {
+    "backend": (["go", "run", "main.go"], "server.log", "server.pid"),
+    "frontend": (["npm", "start"], "frontend.log", "frontend.pid"),
+}
+
+_procs = {}
+
+
+def start_service(name: str) -> subprocess.Popen:
+    """Start a service detached in its own session and record its PID."""
+    argv, log_name, pid_name = SERVICES[name]
+    service_dir = PROJECT / name
+    print(f"🚀 Starting {name}: {' '.join(argv)}")
+    with open(service_dir / log_name, "wb") as log:
+        proc = subprocess.Popen(
+            argv,
+            cwd=service_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    (service_dir / pid_name).write_text(str(proc.pid))
+    _procs[name] = proc
+    return proc
+
+
+def _wait_exit(pid: int, timeout: float) -> bool:
+    """Wait for a process we didn't spawn to exit; True once it's gone."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _service_running(name: str) -> bool:
+    """Return True if the service from our PID file is still alive."""
+    proc = _procs.get(name)
+    if proc is not None:
+        return proc.poll() is None
+    try:
+        pid = int((PROJECT / name / SERVICES[name][2]).read_text())
+        return os.getpgid(pid) == pid
+    except (OSError, ValueError):
+        return False
+
+
+def stop_service(name: str):
+    """Stop a service by its tracked Popen or, failing that, its PID file.
+
+    The whole process group is signalled because `go run` and `npm start`
+    both fork the real server as a child.
+    """
+    pid_file = PROJECT / name / SERVICES[name][2]
+    proc = _procs.pop(name, None)
+    if proc is not None:
+        pid = proc.pid
+    else:
+        try:
+            pid = int(pid_file.read_text())
+        except (OSError, ValueError):
+            return
+    try:
+        # Only signal a group we created (start_new_session makes pgid == pid)
+        if os.getpgid(pid) == pid:
+            os.killpg(pid, signal.SIGTERM)
+            if proc is not None:
+                try:
+                    proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    os.killpg(pid, signal.SIGKILL)
+                    proc.wait()
+            elif not _wait_exit(pid, timeout=2):
+                os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    pid_file.unlink(missing_ok=True)
+
+
+def stop_services():
+    """Stop every known service."""
+    for name in SERVICES:
+        stop_service(name)
+
+
+async def run_command_async(command: Union[str, list], cwd: Path = PROJECT, timeout: int = 30) -> dict:
+    """Run a long command on the event loop, keeping only its output tail.
+
+    Counterpart of run_command() for the concurrent checks in
+    test_everything(): no thread per command, and the timeout composes
+    with the other coroutines through asyncio.wait_for().
+    """
+    print(f"🔧 Executing: {_display(command)}")
+    argv = ["bash", "-c", command] if isinstance(command, str) else command
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        print(f"❌ Command error: {str(e)}")
+        return {"command": command, "success": False, "stderr": str(e)}
+    tails = (collections.deque(maxlen=MAX_OUTPUT_LINES), collections.deque(maxlen=MAX_OUTPUT_LINES))
+
+    async def drain(stream, sink):
+        # Chunks, not lines: readline() raises on a line over the stream's limit
+        partial = b""
+        while True:
+            chunk = await stream.read(MAX_LINE_BYTES)
+            if not chunk:
+                break
+            *lines, partial = (partial + chunk).split(b"\n")
+            sink.extend(line.decode(errors="replace") + "\n" for line in lines)
+            partial = partial[-MAX_LINE_BYTES:]
+        if partial:
+            sink.append(partial.decode(errors="replace"))
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(drain(proc.stdout, tails[0]), drain(proc.stderr, tails[1]), proc.wait()),
+            timeout,
+        )
+        return_code, stderr = proc.returncode, "".join(tails[1])
+    except asyncio.TimeoutError:
+        return_code, stderr = 124, f"Command timed out after {timeout} seconds"
+    finally:
+        # Timed out, or failed or cancelled while reading: don't leave it running
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
     
-    results = {
-        "backend_health": False,
-        "frontend_startup": False,
-        "tests": False
+    success = return_code == 0
+    if success:
+        print("✅ Command succeeded")
+    else:
+        print(f"❌ Command failed (exit code: {return_code})")
+    return {
+        "command": command,
+        "stdout": "".join(tails[0]),
+        "stderr": stderr,
+        "return_code": return_code,
+        "success": success
     }
-    
-    # Kill any existing processes
-    run_command("pkill -f 'go run main.go' || true")
-    run_command("pkill -f 'npm start' || true")
-    time.sleep(2)
-    
-    # Test backend
+
+
+# One pooled client for every health probe instead of a curl process each
+_http = httpx.Client(timeout=1.0)
+
+
+def _probe(url: str) -> bool:
+    """Return True if the URL answers with a non-error status."""
+    try:
+        return _http.get(url).status_code < 400
+    except Exception:
+        return False
+
+
+async def _wait_ready(url: str, timeout: float = 30, interval: float = 0.25) -> bool:
+    """Wait until the URL answers a probe.
+
+    Polls with capped exponential backoff and returns as soon as the
+    service is ready instead of sleeping for a worst-case startup time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = interval
+    while True:
+        if await asyncio.to_thread(_probe, url):
+            return True
+        if loop.time() + delay > deadline:
+            return False
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 2.0)
+
+
+async def _check_backend_health() -> bool:
+    """Wait for the backend health endpoint to come up."""
     print("🏥 Testing backend health...")
-    run_command("cd backend && nohup go run main.go > server.log 2>&1 &")
-    time.sleep(3)
-    
-    health_result = run_command("curl -f http://localhost:8080/health")
-    if health_result["success"]:
-        results["backend_health"] = True
+    if await _wait_ready("http://localhost:8080/health"):
         print("✅ Backend health check passed")
-    else:
-        print("❌ Backend health check failed")
-    
-    # Test frontend startup
+        return True
+    print("❌ Backend health check failed")
+    return False
+
+
+async def _check_frontend_startup() -> bool:
+    """Wait for the React dev server to come up."""
     print("🌐 Testing frontend startup...")
-    run_command("cd frontend && nohup npm start > frontend.log 2>&1 &")
-    time.sleep(15)  # React needs more time
-    
-    frontend_result = run_command("curl -f http://localhost:3000")
-    if frontend_result["success"]:
-        results["frontend_startup"] = True
+    if await _wait_ready("http://localhost:3000", timeout=60):
         print("✅ Frontend startup successful")
-    else:
-        print("❌ Frontend startup failed")
-        # Check the log
-        log_result = run_command("cd frontend && tail -10 frontend.log")
-        print(f"📋 Frontend log: {log_result.get('stdout', 'No log')}")
-    
-    # Test tests
+        return True
+    print("❌ Frontend startup failed")
+    # Check the log
+    log_result = await asyncio.to_thread(run_command, ["tail", "-10", "frontend.log"], PROJECT / "frontend")
+    print(f"📋 Frontend log: {log_result.get('stdout', 'No log')}")
+    return False
+
+
+async def _check_tests() -> bool:
+    """Run the frontend test suite once."""
     print("🧪 Testing tests...")
-    test_result = run_command("cd frontend && npm test -- --watchAll=false")
+    test_result = await run_command_async(["npm", "test", "--", "--watchAll=false"], PROJECT / "frontend")
     if test_result["success"]:
-        results["tests"] = True
         print("✅ Tests passed")
-    else:
-        print("❌ Tests failed")
-        print(f"Test output: {test_result.get('stderr', 'No error details')}")
+        return True
+    print("❌ Tests failed")
+    print(f"Test output: {test_result.get('stderr', 'No error details')}")
+    return False
+
+
+async def test_everything():
+    """Test that everything is working after our fixes."""
+    print("🔬 TESTING EVERYTHING AFTER FIXES")
+    print("-" * 50)
+    
+    # (Re)start both services up front; the checks below wait for them
+    # concurrently. A service still running from last time is reused when
+    # none of its files were rewritten by this run.
+    for name in SERVICES:
+        if _service_running(name) and not any(path.startswith(f"{name}/") for path in _updated_files):
+            print(f"♻️  {name} files unchanged; keeping the running instance")
+            continue
+        stop_service(name)
+        start_service(name)
     
-    return results
+    checks = {
+        "backend_health": _check_backend_health(),
+        "frontend_startup": _check_frontend_startup(),
+        "tests": _check_tests(),
+    }
+    outcomes = await asyncio.gather(*checks.values())
+    return dict(zip(checks, outcomes))
+
+
+# Display names for the checks reported by test_everything()
+_DISPLAY_NAMES = {
+    "backend_health": "Backend Health",
+    "frontend_startup": "Frontend Startup",
+    "tests": "Tests",
+}
+
+
+def _display_name(component: str) -> str:
+    """Look up a component's display name, deriving and memoizing unknown ones."""
+    name = _DISPLAY_NAMES.get(component)
+    if name is None:
+        name = _DISPLAY_NAMES.setdefault(component, component.replace('_', ' ').title())
+    return name
 
 
 def main():
@@ -242,13 +518,16 @@ def main():
     print("   2. React test mismatches")
     print()
     
-    # Fix the issues
-    fix_frontend_startup_issue()
-    fix_test_issues()
-    
-    # Test everything
-    print()
-    results = test_everything()
+    try:
+        # Fix the issues
+        fix_frontend_startup_issue()
+        fix_test_issues()
+        
+        # Test everything
+        print()
+        results = asyncio.run(test_everything())
+    finally:
+        _http.close()
     
     # Final report
     print()
@@ -265,8 +544,7 @@ def main():
     
     for component, status in results.items():
         icon = "✅" if status else "❌"
-        name = component.replace('_', ' ').title()
-        print(f"{icon} {name}")
+        print(f"{icon} {_display_name(component)}")
     
     if success_rate == 100:
         print("\n🎉 PERFECT! All issues resolved!")
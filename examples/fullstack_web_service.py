@@ -1,13 +1,200 @@
 #!/usr/bin/env python3
 """Generate a full-stack web service with Go backend, React frontend, and Tilt configuration."""
 
+import hashlib
+import json
+import math
+import sqlite3
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+ENV = ROOT / ".env"
 
-from langest.graphs.dev_team_graph import create_dev_team_graph
+# Finished runs, keyed by a hash of the exact request text
+RESULT_CACHE_DIR = Path.home() / ".cache" / "langest" / "fullstack"
+DELIVERABLE_KEYS = ("project_plan", "code_implementation", "test_plan",
+                    "test_results", "documentation", "final_deliverable")
+
+# Where the deliverables are written, and which result field each file holds
+OUTPUT_DIR = "generated_fullstack_service"
+DELIVERABLE_FILES = (
+    ("01_project_plan.md", "project_plan"),
+    ("02_code_implementation.md", "code_implementation"),
+    ("03_qa_testing.md", "test_results"),
+    ("04_documentation.md", "documentation"),
+    ("05_final_deliverable.md", "final_deliverable"),
+)
+# Records which request the files in OUTPUT_DIR were generated for
+REQUEST_MARKER = ".request_hash"
+
+# Progress of unfinished workflow runs, so a failed run resumes where it stopped
+CHECKPOINT_DB = RESULT_CACHE_DIR / "checkpoints.db"
+
+# Large buffer so a big deliverable is written in a few syscalls
+WRITE_BUFFER_SIZE = 128 * 1024
+
+# Paraphrased requests at least this similar reuse an earlier run
+SIMILARITY_THRESHOLD = 0.95
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def _request_digest(project_request: str) -> str:
+    """Short hash identifying a request."""
+    return hashlib.sha256(project_request.encode()).hexdigest()[:12]
+
+
+def _load_existing_deliverables(output_dir: str, project_request: str):
+    """Read back the deliverables if output_dir already holds this request's run."""
+    try:
+        with open(os.path.join(output_dir, REQUEST_MARKER)) as f:
+            if f.read().strip() != _request_digest(project_request):
+                return None
+        result = {}
+        for filename, key in DELIVERABLE_FILES:
+            with open(os.path.join(output_dir, filename), encoding="utf-8") as f:
+                result[key] = f.read()
+    except OSError:
+        return None
+    return result if result["final_deliverable"].strip() else None
+
+
+def _result_cache_path(project_request: str) -> Path:
+    """Locate the cached deliverables for a request."""
+    return RESULT_CACHE_DIR / f"{hashlib.sha256(project_request.encode()).hexdigest()}.json"
+
+
+def _load_cached_result(project_request: str):
+    """Return the deliverables of an earlier identical run, if any."""
+    try:
+        return json.loads(_result_cache_path(project_request).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1)
+def _embedding_model():
+    """Load the sentence embedding model, or None if it isn't installed or won't load."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    try:
+        return SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:  # offline before the model was ever downloaded, say
+        print(f"⚠️  Couldn't load {EMBEDDING_MODEL} ({e}); only exact repeats of a request are reused")
+        return None
+
+
+def _embed(text: str):
+    """Embed a request as a sparse vector, or None without an embedding model.
+    
+    There is no word-count fallback: requests that differ only in one
+    technology (Go or Rust, in-memory or PostgreSQL) score well above the
+    threshold on word counts, and would silently reuse the wrong run.
+    """
+    model = _embedding_model()
+    if model is None:
+        return None
+    return {str(i): float(value) for i, value in enumerate(model.encode(text))}
+
+
+def _cosine(a: dict, b: dict) -> float:
+    """Cosine similarity of two sparse vectors."""
+    dot = sum(value * b.get(key, 0.0) for key, value in a.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def _load_index() -> list:
+    """Read the embeddings of every cached request."""
+    try:
+        return json.loads((RESULT_CACHE_DIR / "index.json").read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def _find_similar_result(project_request: str):
+    """Return (similarity, deliverables) of the closest earlier request above the threshold."""
+    vector = _embed(project_request)
+    if vector is None:
+        return None
+    best = max(
+        ((_cosine(vector, entry["vector"]), entry["file"])
+         for entry in _load_index() if entry["model"] == EMBEDDING_MODEL),
+        default=None
+    )
+    if best is None or best[0] < SIMILARITY_THRESHOLD:
+        return None
+    try:
+        return best[0], json.loads((RESULT_CACHE_DIR / best[1]).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data):
+    """Replace a cache file atomically."""
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+def _store_result(project_request: str, result: dict):
+    """Save a run's deliverables so the same or a paraphrased request is answered instantly."""
+    path = _result_cache_path(project_request)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json(path, {"project_request": project_request, **{key: result[key] for key in DELIVERABLE_KEYS}})
+    
+    vector = _embed(project_request)
+    if vector is None:
+        return
+    index = [entry for entry in _load_index() if entry["file"] != path.name]
+    index.append({"file": path.name, "model": EMBEDDING_MODEL, "vector": vector})
+    _write_json(RESULT_CACHE_DIR / "index.json", index)
+
+
+def _checkpointer():
+    """Saver for workflow progress: on disk when the SQLite saver is installed."""
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:  # optional: keep progress for retries in this process only
+        from langgraph.checkpoint.memory import InMemorySaver
+        return InMemorySaver()
+    CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+    return SqliteSaver(sqlite3.connect(CHECKPOINT_DB, check_same_thread=False))
+
+
+def _run_workflow(graph, initial_state, project_request: str, attempts: int = 2):
+    """Invoke the graph, resuming an unfinished run of the same request.
+    
+    The request hash is the checkpoint thread, so after a failure (a rate
+    limit halfway through QA, say) the next attempt - in this process or a
+    later one - only re-runs the agents that hadn't finished. A finished
+    run's checkpoint is cleared first, so its messages don't carry over.
+    """
+    thread_id = hashlib.sha256(project_request.encode()).hexdigest()
+    config = {
+        "configurable": {"thread_id": thread_id},
+        # The engineering, QA and docs branches run concurrently
+        "max_concurrency": 4,
+    }
+    for attempt in range(attempts):
+        snapshot = graph.get_state(config)
+        pending = snapshot.next
+        if pending:
+            print(f"⏯️  Resuming unfinished run at: {', '.join(pending)}")
+        elif snapshot.values:
+            graph.checkpointer.delete_thread(thread_id)
+        try:
+            return graph.invoke(None if pending else initial_state, config)
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            print(f"⚠️  Workflow failed ({e}); retrying from the last checkpoint")
 
 
 def generate_fullstack_service():
@@ -64,22 +251,22 @@ def generate_fullstack_service():
     print("   📋 Go Backend + React Frontend + Tilt Development")
     print("=" * 70)
     
+    # The files from an earlier run of this exact request are the answer
+    existing = _load_existing_deliverables(OUTPUT_DIR, project_request)
+    if existing is not None:
+        print(f"♻️  ./{OUTPUT_DIR}/ already holds this request's deliverables; skipping the workflow")
+        display_project_summary(existing)
+        return existing
+    
+    # Imported only here so a declined .env prompt exits without loading LangChain
+    sys.path.insert(0, str(SRC))
+    from langest.graphs.dev_team_graph import create_dev_team_graph, new_dev_team_state
+    
     # Create the development team graph
-    graph = create_dev_team_graph()
+    graph = create_dev_team_graph(checkpointer=_checkpointer())
     
     # Initialize the state
-    initial_state = {
-        "project_request": project_request,
-        "messages": [],
-        "project_plan": "",
-        "code_implementation": "",
-        "test_plan": "",
-        "test_results": "",
-        "documentation": "",
-        "final_deliverable": "",
-        "current_agent": "",
-        "next_step": "project_manager"
-    }
+    initial_state = new_dev_team_state(project_request)
     
     print("⚡ Development Team Workflow:")
     print("   🎯 Project Manager (Planning & Architecture)")
@@ -91,14 +278,32 @@ def generate_fullstack_service():
     
     # Execute the workflow
     try:
-        print("🔄 Executing workflow... (This may take a few minutes)")
-        result = graph.invoke(initial_state)
+        result = _load_cached_result(project_request)
+        generated = False
+        similar = None if result is not None else _find_similar_result(project_request)
+        if result is not None:
+            print("♻️  Same request as an earlier run; reusing its deliverables")
+        elif similar is not None:
+            similarity, result = similar
+            print(f"♻️  Request matches an earlier run ({similarity:.0%} similar); reusing its deliverables")
+        else:
+            print("🔄 Executing workflow... (This may take a few minutes)")
+            result = _run_workflow(graph, initial_state, project_request)
+            generated = True
         
         print("\n✅ FULL-STACK WEB SERVICE GENERATED!")
         print("=" * 70)
         
         # Save deliverables to files
-        save_deliverables_to_files(result)
+        save_deliverables_to_files(result, project_request)
+        
+        # Only after the files are safe: a cache that can't be written
+        # mustn't throw away a finished run
+        if generated:
+            try:
+                _store_result(project_request, result)
+            except OSError as e:
+                print(f"⚠️  Couldn't cache this run's deliverables: {e}")
         
         # Display summary
         display_project_summary(result)
@@ -111,36 +316,47 @@ def generate_fullstack_service():
         return None
 
 
-def save_deliverables_to_files(result):
-    """Save the generated deliverables to files for easy access."""
+def _write_text(path: str, content: str):
+    """Write a text file through a large buffer."""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(content)
+
+
+def save_deliverables_to_files(result, project_request=None):
+    """Save the generated deliverables to files for easy access.
     
-    output_dir = "generated_fullstack_service"
+    Args:
+        result: Final graph state
+        project_request: Request the result answers; recorded so a rerun of
+            the same request can reuse the files
+    """
+    
+    output_dir = OUTPUT_DIR
     os.makedirs(output_dir, exist_ok=True)
+    marker = os.path.join(output_dir, REQUEST_MARKER)
+    if os.path.exists(marker):
+        # Files are about to change; don't let a partial write look complete
+        os.remove(marker)
     
-    deliverables = [
-        ("01_project_plan.md", result["project_plan"]),
-        ("02_code_implementation.md", result["code_implementation"]),
-        ("03_qa_testing.md", result["test_results"]),
-        ("04_documentation.md", result["documentation"]),
-        ("05_final_deliverable.md", result["final_deliverable"])
-    ]
+    deliverables = [(filename, result[key]) for filename, key in DELIVERABLE_FILES]
     
     print(f"\n💾 Saving deliverables to ./{output_dir}/")
     
-    for filename, content in deliverables:
-        filepath = os.path.join(output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    # The files are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=len(deliverables)) as executor:
+        list(executor.map(lambda item: _write_text(os.path.join(output_dir, item[0]), item[1]), deliverables))
+    for filename, _ in deliverables:
         print(f"   📄 {filename}")
     
     # Create a summary file with quick start instructions
     create_quick_start_guide(output_dir, result)
+    
+    if project_request is not None:
+        _write_text(marker, _request_digest(project_request) + "\n")
 
 
-def create_quick_start_guide(output_dir, result):
-    """Create a quick start guide for the generated project."""
-    
-    quick_start = f"""# Quick Start Guide - Full-Stack Web Service
+# Filled in with the output directory name by create_quick_start_guide()
+_QUICK_START_TEMPLATE = """# Quick Start Guide - Full-Stack Web Service
 
 ## Generated Project Overview
 - **Backend**: Go with Gin framework
@@ -207,12 +423,17 @@ def create_quick_start_guide(output_dir, result):
 4. Run tests as described in the QA guide
 5. Use Tilt for seamless local development
 
-Generated on: {os.path.basename(output_dir)}
+Generated on: {name}
 """
+
+
+def create_quick_start_guide(output_dir, result):
+    """Create a quick start guide for the generated project."""
+    
+    quick_start = _QUICK_START_TEMPLATE.format(name=os.path.basename(output_dir))
     
     quick_start_path = os.path.join(output_dir, "README_QUICK_START.md")
-    with open(quick_start_path, 'w', encoding='utf-8') as f:
-        f.write(quick_start)
+    _write_text(quick_start_path, quick_start)
     
     print(f"   📄 README_QUICK_START.md")
 
@@ -220,25 +441,28 @@ Generated on: {os.path.basename(output_dir)}
 def display_project_summary(result):
     """Display a summary of the generated project."""
     
+    # Measure every text field once up front
+    sizes = {key: len(value) for key, value in result.items() if isinstance(value, str)}
+    
     print("\n📊 PROJECT SUMMARY")
     print("-" * 50)
     print("🎯 Project Plan:")
-    print(f"   {len(result['project_plan'])} characters of detailed planning")
+    print(f"   {sizes['project_plan']} characters of detailed planning")
     
     print("\n💻 Code Implementation:")
-    print(f"   {len(result['code_implementation'])} characters of code and config")
+    print(f"   {sizes['code_implementation']} characters of code and config")
     print("   Includes: Go backend, React frontend, Tilt config, Docker files")
     
     print("\n🧪 QA & Testing:")
-    print(f"   {len(result['test_results'])} characters of testing strategy")
+    print(f"   {sizes['test_results']} characters of testing strategy")
     print("   Covers: Unit tests, integration tests, e2e tests")
     
     print("\n📚 Documentation:")
-    print(f"   {len(result['documentation'])} characters of comprehensive docs")
+    print(f"   {sizes['documentation']} characters of comprehensive docs")
     print("   Includes: Setup, API docs, user guides, troubleshooting")
     
     print("\n📋 Final Deliverable:")
-    print(f"   {len(result['final_deliverable'])} characters of project summary")
+    print(f"   {sizes['final_deliverable']} characters of project summary")
     print("   Executive summary and deployment readiness assessment")
     
     print("\n🚀 READY TO DEPLOY!")
@@ -254,8 +478,7 @@ def main():
     print("=" * 70)
     
     # Check if .env file exists
-    env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if not os.path.exists(env_file):
+    if not ENV.exists():
         print("⚠️  WARNING: .env file not found!")
         print("   Please copy .env.example to .env and add your GROQ_API_KEY")
         print("   Get your API key from: https://console.groq.com/keys")
@@ -2,13 +2,12 @@
 """Run the Autonomous Updater Agent to implement new features."""
 
 import sys
-import os
 import argparse
+from pathlib import Path
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from langest.agents.autonomous_updater import AutonomousUpdaterAgent
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+ENV = ROOT / ".env"
 
 
 def main():
@@ -28,7 +27,7 @@ def main():
     parser.add_argument(
         "--project-path",
         type=str,
-        default=os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'generated_fullstack_service')),
+        default=str(ROOT / "generated_fullstack_service"),
         help="Path to the project directory to be updated. Defaults to the generated_fullstack_service directory."
     )
 
@@ -42,13 +41,16 @@ def main():
     args = parser.parse_args()
 
     # Check if .env file exists
-    env_file = os.path.join(os.path.dirname(__file__), '..', '.env')
-    if not os.path.exists(env_file):
+    if not ENV.exists():
         print("⚠️  WARNING: .env file not found!")
         print("   The updater agent needs your GROQ_API_KEY to function.")
         print("   Please copy .env.example to .env and add your API key.")
         sys.exit(1)
 
+    # Imported only now so --help and a missing .env skip loading LangChain
+    sys.path.insert(0, str(SRC))
+    from langest.agents.autonomous_updater import AutonomousUpdaterAgent
+
     try:
         agent = AutonomousUpdaterAgent()
         success = agent.run_update(
@@ -6,26 +6,183 @@ import re
 import sys
 from pathlib import Path
 
+try:
+    import regex
+except ImportError:  # optional: re has possessive quantifiers from Python 3.11
+    regex = re if sys.version_info >= (3, 11) else None
+
+# Code blocks with an optional language and a "// filename" comment. The
+# body and filename are possessive, so an unclosed fence fails in one
+# linear scan instead of backtracking through every shorter match.
+if regex is not None:
+    _CODE_BLOCK_RE = regex.compile(
+        r'```(?P<language>\w++)?\s*(?://[ ](?P<filename>[^\n]+?)[^\S\n]*+)?\n'
+        r'(?P<content>(?:[^`]++|`(?!``))*+)```'
+    )
+else:
+    _CODE_BLOCK_RE = re.compile(
+        r'```(?P<language>\w+)?\s*(?:// (?P<filename>.+?)\s*)?\n(?P<content>.*?)```', re.DOTALL
+    )
+
+# Known file names and where they go in the project
+_FILE_MAPPINGS = {
+    # Go files
+    'main.go': ('backend/main.go', 'go'),
+    'go.mod': ('backend/go.mod', 'go'),
+    'go.sum': ('backend/go.sum', 'go'),
+    
+    # React files  
+    'App.js': ('frontend/src/App.js', 'jsx'),
+    'App.tsx': ('frontend/src/App.tsx', 'tsx'),
+    'index.js': ('frontend/src/index.js', 'jsx'),
+    'index.tsx': ('frontend/src/index.tsx', 'tsx'),
+    'package.json': ('frontend/package.json', 'json'),
+    'index.html': ('frontend/public/index.html', 'html'),
+    
+    # Docker files
+    'Dockerfile': ('backend/Dockerfile', 'dockerfile'),
+    'Dockerfile.frontend': ('frontend/Dockerfile', 'dockerfile'),
+    'docker-compose.yml': ('docker-compose.yml', 'yaml'),
+    
+    # Tilt files
+    'Tiltfile': ('Tiltfile', 'python'),
+    
+    # Kubernetes files
+    'deployment.yaml': ('k8s/deployment.yaml', 'yaml'),
+    'service.yaml': ('k8s/service.yaml', 'yaml'),
+    'configmap.yaml': ('k8s/configmap.yaml', 'yaml'),
+    
+    # Scripts
+    'Makefile': ('Makefile', 'makefile'),
+    'setup.sh': ('scripts/setup.sh', 'bash'),
+    'start.sh': ('scripts/start.sh', 'bash'),
+}
+
+# Substrings that identify what an unnamed code block is
+_SIGNATURES = {
+    'package_main': 'package main',
+    'gin_new': 'gin.New()',
+    'module': 'module ',
+    'import_react': 'import React',
+    'function_app': 'function App',
+    'json_name': '"name":',
+    'json_scripts': '"scripts":',
+    'from_golang': 'FROM golang',
+    'from_node': 'FROM node',
+    'version': 'version:',
+    'services': 'services:',
+    'docker_build': 'docker_build',
+    'k8s_yaml': 'k8s_yaml',
+    'api_version': 'apiVersion:',
+    'kind': 'kind:',
+    'deployment': 'Deployment',
+    'service': 'Service',
+    'config_map': 'ConfigMap',
+    'phony': '.PHONY:',
+    'build': 'build:',
+}
+# One pass finds every signature, overlapping ones included: an Aho-Corasick
+# automaton when pyahocorasick is installed, else a lookahead alternation
+try:
+    import ahocorasick
+except ImportError:  # optional
+    ahocorasick = None
+
+if ahocorasick is not None:
+    _SIGNATURE_AUTOMATON = ahocorasick.Automaton()
+    for _name, _text in _SIGNATURES.items():
+        _SIGNATURE_AUTOMATON.add_word(_text, _name)
+    _SIGNATURE_AUTOMATON.make_automaton()
+else:
+    _SIGNATURE_RE = re.compile(
+        '(?=' + '|'.join(f'(?P<{name}>{re.escape(text)})' for name, text in _SIGNATURES.items()) + ')'
+    )
+
+
+# Tells a setup script from a start script without lowercasing the whole block
+_SETUP_RE = re.compile('setup', re.IGNORECASE)
+
+
+def _find_signatures(content):
+    """Names of all the signatures that occur in content."""
+    if ahocorasick is not None:
+        return {name for _, name in _SIGNATURE_AUTOMATON.iter(content)}
+    return {match.lastgroup for match in _SIGNATURE_RE.finditer(content)}
+
+
+def infer_file_path(content, language):
+    """Guess where an unnamed code block belongs from what it contains."""
+    found = _find_signatures(content)
+    
+    if {'package_main', 'gin_new'} <= found:
+        return 'backend/main.go'
+    if 'module' in found and language == 'go':
+        return 'backend/go.mod'
+    if found & {'import_react', 'function_app'}:
+        return 'frontend/src/App.js'
+    if {'json_name', 'json_scripts'} <= found:
+        return 'frontend/package.json'
+    if 'from_golang' in found:
+        return 'backend/Dockerfile'
+    if 'from_node' in found:
+        return 'frontend/Dockerfile'
+    if {'version', 'services'} <= found:
+        return 'docker-compose.yml'
+    if found & {'docker_build', 'k8s_yaml'}:
+        return 'Tiltfile'
+    if {'api_version', 'kind'} <= found:
+        if 'deployment' in found:
+            return 'k8s/deployment.yaml'
+        if 'service' in found:
+            return 'k8s/service.yaml'
+        if 'config_map' in found:
+            return 'k8s/configmap.yaml'
+        return None
+    if content.startswith('<!DOCTYPE html'):
+        return 'frontend/public/index.html'
+    if found & {'phony', 'build'}:
+        return 'Makefile'
+    if content.startswith('#!/bin/bash'):
+        return 'scripts/setup.sh' if _SETUP_RE.search(content) else 'scripts/start.sh'
+    return None
+
 
 def extract_code_blocks(markdown_content):
-    """Extract code blocks from markdown content."""
-    # Pattern to match code blocks with optional file names
-    pattern = r'```(\w+)?\s*(?:// (.+?)\s*)?\n(.*?)```'
-    matches = re.findall(pattern, markdown_content, re.DOTALL)
-    
-    code_blocks = []
-    for match in matches:
-        language = match[0] if match[0] else 'text'
-        filename = match[1] if match[1] else None
-        content = match[2]
-        
-        code_blocks.append({
-            'language': language,
-            'filename': filename,
-            'content': content
-        })
+    """Yield the code blocks in markdown content, one at a time.
     
-    return code_blocks
+    Each block's language is lowercased and its content stripped.
+    """
+    for match in _CODE_BLOCK_RE.finditer(markdown_content):
+        yield {
+            'language': (match.group('language') or 'text').lower(),
+            'filename': match.group('filename') or None,
+            'content': match.group('content').strip()
+        }
+
+
+# Directories already created this run, so later files skip the mkdir
+_ensured_dirs = set()
+
+
+def _ensure_dir(directory):
+    """Create a directory (and parents) unless this run already did."""
+    if directory and directory not in _ensured_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+
+def _write_file(path, content, executable=False):
+    """Write a file with one raw os.write, setting the mode on the open fd."""
+    data = content.encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if executable:
+            os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
 
 
 def create_project_structure():
@@ -39,7 +196,7 @@ def create_project_structure():
     ]
     
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        _ensure_dir(directory)
         print(f"📁 Created directory: {directory}")
 
 
@@ -50,59 +207,19 @@ def extract_and_create_files(markdown_file, output_dir="."):
     
     try:
         with open(markdown_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+            markdown = f.read()
     except FileNotFoundError:
         print(f"❌ File not found: {markdown_file}")
         return
     
-    # Extract code blocks
-    code_blocks = extract_code_blocks(content)
-    
-    if not code_blocks:
-        print(f"⚠️  No code blocks found in {markdown_file}")
-        return
-    
-    print(f"📝 Found {len(code_blocks)} code blocks")
+    # Decide every block's path first so the writes can be batched
+    planned_files = {}
+    block_count = 0
     
-    # Define file mappings based on content and context
-    file_mappings = {
-        # Go files
-        'main.go': ('backend/main.go', 'go'),
-        'go.mod': ('backend/go.mod', 'go'),
-        'go.sum': ('backend/go.sum', 'go'),
-        
-        # React files  
-        'App.js': ('frontend/src/App.js', 'jsx'),
-        'App.tsx': ('frontend/src/App.tsx', 'tsx'),
-        'index.js': ('frontend/src/index.js', 'jsx'),
-        'index.tsx': ('frontend/src/index.tsx', 'tsx'),
-        'package.json': ('frontend/package.json', 'json'),
-        'index.html': ('frontend/public/index.html', 'html'),
-        
-        # Docker files
-        'Dockerfile': ('backend/Dockerfile', 'dockerfile'),
-        'Dockerfile.frontend': ('frontend/Dockerfile', 'dockerfile'),
-        'docker-compose.yml': ('docker-compose.yml', 'yaml'),
-        
-        # Tilt files
-        'Tiltfile': ('Tiltfile', 'python'),
-        
-        # Kubernetes files
-        'deployment.yaml': ('k8s/deployment.yaml', 'yaml'),
-        'service.yaml': ('k8s/service.yaml', 'yaml'),
-        'configmap.yaml': ('k8s/configmap.yaml', 'yaml'),
-        
-        # Scripts
-        'Makefile': ('Makefile', 'makefile'),
-        'setup.sh': ('scripts/setup.sh', 'bash'),
-        'start.sh': ('scripts/start.sh', 'bash'),
-    }
-    
-    created_files = []
-    
-    for block in code_blocks:
-        content = block['content'].strip()
-        language = block['language'].lower()
+    for block in extract_code_blocks(markdown):
+        block_count += 1
+        content = block['content']
+        language = block['language']
         filename = block['filename']
         
         # Skip empty blocks
@@ -110,68 +227,35 @@ def extract_and_create_files(markdown_file, output_dir="."):
             continue
         
         # Determine file path based on filename or content analysis
-        file_path = None
-        
-        if filename and filename in file_mappings:
-            file_path = file_mappings[filename][0]
+        if filename and filename in _FILE_MAPPINGS:
+            file_path = _FILE_MAPPINGS[filename][0]
         else:
-            # Try to infer from content
-            if 'package main' in content and 'gin.New()' in content:
-                file_path = 'backend/main.go'
-            elif 'module ' in content and language == 'go':
-                file_path = 'backend/go.mod'
-            elif 'import React' in content or 'function App' in content:
-                file_path = 'frontend/src/App.js'
-            elif '"name":' in content and '"scripts":' in content:
-                file_path = 'frontend/package.json'
-            elif 'FROM golang' in content:
-                file_path = 'backend/Dockerfile'
-            elif 'FROM node' in content:
-                file_path = 'frontend/Dockerfile'
-            elif 'version:' in content and 'services:' in content:
-                file_path = 'docker-compose.yml'
-            elif 'docker_build' in content or 'k8s_yaml' in content:
-                file_path = 'Tiltfile'
-            elif 'apiVersion:' in content and 'kind:' in content:
-                if 'Deployment' in content:
-                    file_path = 'k8s/deployment.yaml'
-                elif 'Service' in content:
-                    file_path = 'k8s/service.yaml'
-                elif 'ConfigMap' in content:
-                    file_path = 'k8s/configmap.yaml'
-            elif content.startswith('<!DOCTYPE html'):
-                file_path = 'frontend/public/index.html'
-            elif '.PHONY:' in content or 'build:' in content:
-                file_path = 'Makefile'
-            elif content.startswith('#!/bin/bash'):
-                if 'setup' in content.lower():
-                    file_path = 'scripts/setup.sh'
-                else:
-                    file_path = 'scripts/start.sh'
+            file_path = infer_file_path(content, language)
         
-        # Create file if we determined a path
         if file_path:
-            # Ensure directory exists
-            dir_path = os.path.dirname(file_path)
-            if dir_path:  # Only create if there's actually a directory
-                os.makedirs(dir_path, exist_ok=True)
-            
-            # Write file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Make scripts executable
-            if file_path.endswith('.sh') or file_path == 'Tiltfile':
-                os.chmod(file_path, 0o755)
-            
-            created_files.append(file_path)
-            print(f"✅ Created: {file_path}")
+            # A later block for the same path replaces the earlier one
+            planned_files[file_path] = content
         else:
             print(f"⚠️  Couldn't determine file path for {language} block")
             if len(content) < 200:
                 print(f"   Content preview: {content[:100]}...")
     
-    return created_files
+    if not block_count:
+        print(f"⚠️  No code blocks found in {markdown_file}")
+        return
+    
+    print(f"📝 Found {block_count} code blocks")
+    
+    # Create each directory once, then write every file
+    for dir_path in {os.path.dirname(path) for path in planned_files}:
+        _ensure_dir(dir_path)
+    
+    for file_path, content in planned_files.items():
+        # Scripts are made executable
+        _write_file(file_path, content, executable=file_path.endswith('.sh') or file_path == 'Tiltfile')
+        print(f"✅ Created: {file_path}")
+    
+    return list(planned_files)
 
 
 def create_additional_files():
@@ -281,8 +365,13 @@ def main():
     print("🚀 Extracting Full-Stack Web Service Code")
     print("=" * 50)
     
+    # One directory read answers every "is it already here?" question below
+    with os.scandir('.') as it:
+        cwd_entries = {entry.name: entry for entry in it}
+    _ensured_dirs.update(name for name, entry in cwd_entries.items() if entry.is_dir())
+    
     # Check if we're in the right directory
-    if not os.path.exists('02_code_implementation.md'):
+    if '02_code_implementation.md' not in cwd_entries:
         print("❌ 02_code_implementation.md not found!")
         print("   Make sure you're running this script from the generated_fullstack_service/ directory")
         return 1
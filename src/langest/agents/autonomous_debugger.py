@@ -1,35 +1,216 @@
 """Autonomous Debugging Agent that fixes issues until application works."""
 
 from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 import os
-import subprocess
+import threading
 import time
 import json
 import re
-from dotenv import load_dotenv
+import socket
+import fnmatch
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from langest.tools.file_io import PARALLEL_WRITE_THRESHOLD, ensure_dir, io_pool, write_text
+from langest.tools.groq_client import MODEL_TIERS, client_options
+from langest.tools.json_extract import decode_first_object, dumps_compact, stream_first_object
+from langest.tools.llm_cache import LLMCache
+from langest.tools.process import exec_args, run_command
+
+
+# Read-only probes whose successful output can be reused until something
+# changes: a file is written or a command outside this list is run. Each is
+# an argv pattern matched one argument at a time with fnmatch, and a trailing
+# ... allows any further arguments. A command only matches if it runs
+# without a shell, so redirection, pipes and chaining never count as probes;
+# a leading 'cd dir &&' is fine, since it just sets the working directory.
+CACHEABLE_COMMANDS = (
+    ("go", "version"),
+    ("node", "-v"),
+    ("node", "--version"),
+    ("npm", "--version"),
+    ("which", ...),
+    ("ls", ...),
+    ("cat", ...),
+    ("curl", "-f", "http://localhost:*/health"),
+    # Checks whose result depends only on the sources, which only change
+    # through a file write or a non-probe command
+    ("tilt", "doctor"),
+    ("go", "build"),
+    ("go", "vet"),
+)
+
+# Characters of stdout kept from a command that succeeded
+SUCCESS_OUTPUT_CHARS = 512
+
+# Delays between re-checks of a service probe after a fix that ran
+# commands, in case a restarted service is still coming up
+SETTLE_DELAYS = (0.1, 0.2, 0.4)
+
+# Fixes that made a failing command pass, reused when the same error recurs
+SOLUTION_CACHE_SIZE = 64
+
+# Seconds a port probe waits for a local connection before calling it free
+PORT_PROBE_TIMEOUT = 0.05
+
+# Sent when the LLM proposes a fix that was already applied for the same error
+REPEATED_FIX_PROMPT = (
+    "That exact fix was already applied for this error and the error remained. "
+    "Propose a different fix, as the single JSON object described in your instructions."
+)
+
+# Characters of stderr (from the start) and stdout (from the end) scanned
+# for paths, and how many mentioned files are read into the prompt
+ERROR_SCAN_CHARS = 8192
+MAX_CONTEXT_FILES = 10
+
+# What debug_until_working looks for in a failure to gather more context
+_FILE_PATH_RE = re.compile(r'[\./\w-]+\.(?:js|go|py|json|yaml|yml|toml|mod|sum|html|css|ts|tsx|jsx|test\.js)')
+_LOG_FILE_RE = re.compile(r'>\s*([\w\./-]+\.log)')
+# e.g., "directory 'path/to/dir'" or "'path/to/dir/'"
+_DIR_RE = re.compile(r"directory\s+'([^']+)'|'([\./\w-]+/)'")
+
+_CD_PREFIX = re.compile(r"\s*(cd\s+\S+\s*&&\s*)")
+
+
+def _in_command_dir(target_command: str, command: str) -> str:
+    """Run a fix command in the same directory the failing command cd's into."""
+    prefix = _CD_PREFIX.match(target_command)
+    return (prefix.group(1) if prefix else "") + command
+
+
+def _kill_port(match, target_command):
+    port = match.group("node_port") or match.group("go_port")
+    return {
+        "root_cause": f"Port {port} is already in use by another process",
+        "solution_type": "COMMAND_RUN",
+        "commands_to_run": [
+            f"lsof -t -i:{port} | xargs kill -9 2>/dev/null || true",
+            f"fuser -k {port}/tcp 2>/dev/null || true",
+        ],
+    }
+
+
+def _npm_install_module(match, target_command):
+    module = match.group("module")
+    # Install the package, not the file inside it: @scope/pkg/x -> @scope/pkg
+    package = "/".join(module.split("/")[:2 if module.startswith("@") else 1])
+    return {
+        "root_cause": f"The npm package '{package}' is not installed",
+        "solution_type": "COMMAND_RUN",
+        "commands_to_run": [_in_command_dir(target_command, f"npm install {package}")],
+    }
+
+
+def _npm_install(match, target_command):
+    return {
+        "root_cause": f"'{match.group('tool')}' is missing because node_modules is not installed",
+        "solution_type": "COMMAND_RUN",
+        "commands_to_run": [_in_command_dir(target_command, "npm install")],
+    }
+
+
+def _go_mod_tidy(match, target_command):
+    return {
+        "root_cause": "go.mod/go.sum are out of date with the imported packages",
+        "solution_type": "COMMAND_RUN",
+        "commands_to_run": [_in_command_dir(target_command, "go mod tidy")],
+    }
+
+
+# Errors with a deterministic fix, tried before asking the LLM:
+# (name, pattern matched against stderr, builder(match, target_command))
+KNOWN_ERRORS = (
+    ("port_in_use", re.compile(r"EADDRINUSE[^\n]*?:(?P<node_port>\d+)|:(?P<go_port>\d+): bind: address already in use"), _kill_port),
+    ("npm_module", re.compile(r"Cannot find module '(?P<module>[^./'][^']*)'"), _npm_install_module),
+    ("npm_tool", re.compile(r"(?P<tool>react-scripts|jest|vite|tsc): (?:command )?not found"), _npm_install),
+    ("go_mod", re.compile(r"missing go\.sum entry|no required module provides package|updates to go\.mod needed"), _go_mod_tidy),
+)
+
+
+def _port_in_use(port: int) -> bool:
+    """Whether anything accepts connections on the port, over IPv4 or IPv6 loopback."""
+    for family, host in ((socket.AF_INET, "127.0.0.1"), (socket.AF_INET6, "::1")):
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(PORT_PROBE_TIMEOUT)
+                if sock.connect_ex((host, port)) == 0:
+                    return True
+        except OSError:  # no IPv6 on this host
+            continue
+    return False
+
+
+def _poll_url(url: str, timeout: int) -> str:
+    """Shell snippet that returns as soon as url answers, or after timeout seconds."""
+    return f"timeout {timeout} sh -c 'until curl -sf {url} > /dev/null; do sleep 0.1; done'"
+
+
+def _within(path: str, directory: str) -> bool:
+    """Whether a normalised absolute path is the directory or inside it.
+
+    Compares whole path components: a plain prefix check lets
+    '/srv/app-evil/x' pass for '/srv/app'.
+    """
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
 
-load_dotenv()
+def _is_probe(command: str, cwd: str) -> bool:
+    """Whether a command matches CACHEABLE_COMMANDS and runs without a shell."""
+    args, shell, _ = exec_args(command, cwd)
+    if shell:
+        return False
+    for pattern in CACHEABLE_COMMANDS:
+        open_ended = pattern[-1] is ...
+        fixed = pattern[:-1] if open_ended else pattern
+        if len(args) < len(fixed) or (len(args) > len(fixed) and not open_ended):
+            continue
+        if all(fnmatch.fnmatchcase(arg, part) for arg, part in zip(args, fixed)):
+            return True
+    return False
 
 
 class AutonomousDebuggingAgent:
     """AI Agent that autonomously debugs and fixes issues until application works."""
     
-    def __init__(self, model: str = "llama3-70b-8192", temperature: float = 0.1):
+    def __init__(self, model: str = MODEL_TIERS["balanced"], temperature: float = 0.1, history_log: str = None,
+                 llm_cache: LLMCache = None):
         """Initialize the autonomous debugging agent.
         
         Args:
             model: Groq model to use (using larger model for complex debugging)
             temperature: Low temperature for precise debugging
+            history_log: JSONL file that every attempt's full solution is
+                appended to; ``debug_history`` itself keeps no file contents
+            llm_cache: Replies to reuse for identical requests; pass one
+                cache to several agents to share it, else each gets its own
         """
+        self.model = model
+        self.temperature = temperature
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options()
         )
+        # Groq's JSON mode always returns one valid object but can't stream,
+        # so it is kept for the retry after a reply that didn't decode
+        self._json_llm = self.llm.bind(response_format={"type": "json_object"})
         
         self.max_iterations = 10  # Maximum debugging attempts
-        self.debug_history = []   # Track all debugging attempts
+        self.debug_history = []   # Track all debugging attempts (without file contents)
+        self.history_log = history_log
+        self._history_summaries = []  # Compact per-attempt records for prompts
+        self._probe_cache = {}    # (command, cwd) -> successful probe result
+        self._solution_cache = OrderedDict()  # error key -> verified solution
+        self._llm_cache = llm_cache if llm_cache is not None else LLMCache()  # identical request -> decoded reply
+        self._abs_project_cache = {}  # project_path -> its absolute path
+        self._tried_fingerprints = set()  # LLM fixes already proposed, see _fix_fingerprint
+        # Guards the history and caches when debugging sessions run concurrently
+        self._lock = threading.Lock()
+        # Held by the one session applying and verifying fixes, see debug_until_working
+        self._fix_lock = threading.Lock()
         
         self.system_prompt = """You are an Expert Autonomous Debugging Agent with the ability to:
         1. Execute commands and analyze their output
@@ -55,77 +236,116 @@ class AutonomousDebuggingAgent:
         - Explain the reasoning behind each fix
         - Prioritize the most critical issues first
         
-        You can fix:
-        - Tiltfile syntax and configuration errors
-        - Docker build issues and Dockerfile problems
-        - Kubernetes manifest errors
-        - Missing dependencies and package issues
-        - Port conflicts and networking problems
-        - File permission and path issues
-        - Environment variable and configuration problems"""
+        You can fix Tiltfile, Dockerfile and Kubernetes manifest errors, missing
+        dependencies, port conflicts, file permissions and paths, and environment
+        or configuration problems."""
+
+        self.response_instructions = """For every failing command you are given, follow these rules.
+
+        **CRITICAL INSTRUCTIONS:**
+        1.  **Analyze the PREVIOUS DEBUG HISTORY.** If previous attempts to fix this exact error have failed, you **MUST** propose a **NEW and DIFFERENT** solution.
+        2.  **Do not repeat a fix that has already failed.** If updating a file didn't work, consider other causes. Is a configuration file missing? Is a dependency incorrect? Is an environment variable missing?
+        3.  **Think step-by-step.** The error might be a symptom of a deeper problem. For example, a React test failing might not be the component's fault, but a missing test setup file (like `setupTests.js`).
+
+        **YOUR TASK:**
+        Analyze the error and provide an EXACT solution. If file contents or directory listings are provided in the 'ADDITIONAL CONTEXT', use them to inform your diagnosis. Your response must include:
+
+        1. ROOT_CAUSE: Brief explanation of what's wrong
+        2. SOLUTION_TYPE: One of [FILE_CREATE, FILE_UPDATE, COMMAND_RUN]. Use COMMAND_RUN for installing dependencies or running build steps, NOT for verification.
+        3. FILES_TO_CREATE: A list of files to create, including their full relative path and exact content.
+        4. FILES_TO_UPDATE: A list of files to update, including their full relative path and complete new content.
+        5. COMMANDS_TO_RUN: A list of commands to execute to apply the fix (e.g., `npm install`). **Do NOT include test commands like `npm test` or `go test` here.** The original failing command will be re-run automatically for verification. If a command needs to run in a subdirectory, you must include the `cd` command (e.g., `cd frontend && npm install some-package`).
+
+        **IMPORTANT**: Your response MUST be a single, valid JSON object. Do not include any text outside of the JSON.
+
+        JSON Response Format (Do not include a `verification_command` field):
+        {
+            "root_cause": "explanation",
+            "solution_type": "type",
+            "files_to_create": [
+                {
+                    "path": "relative/path/to/file",
+                    "content": "exact file content here"
+                }
+            ],
+            "files_to_update": [
+                {
+                    "path": "relative/path/to/file",
+                    "content": "complete updated file content"
+                }
+            ],
+            "commands_to_run": ["cd frontend && npm install some-package"]
+        }"""
+
+        # Built once so every request starts with an identical, cacheable prefix
+        self._prefix_messages = [
+            SystemMessage(content=self.system_prompt + "\n\n" + self.response_instructions)
+        ]
     
-    def execute_command(self, command: str, cwd: str = None, timeout: int = 60) -> dict:
-        """Execute a command and return detailed results."""
+    def execute_command(self, command: str, cwd: str = None, timeout: int = 60, cacheable: bool = None) -> dict:
+        """Execute a command and return detailed results.
+
+        Successful results of read-only probes in CACHEABLE_COMMANDS are
+        reused until a file is written or a non-probe command runs. Pass
+        ``cacheable=False`` to always execute.
+        """
+        is_probe = _is_probe(command, cwd)
+        if cacheable is None:
+            cacheable = is_probe
+        key = (command, cwd or os.getcwd())
+        with self._lock:
+            cached = self._probe_cache.get(key) if cacheable else None
+            if cached is None and not is_probe:
+                # Anything outside the allowlist may mutate state (kill, start, install)
+                self._probe_cache.clear()
+        if cached is not None:
+            print(f"♻️  Cached: {command}")
+            return dict(cached)
+
+        execution_result = self._run_command(command, cwd, timeout)
+        if cacheable and execution_result["success"]:
+            with self._lock:
+                self._probe_cache[key] = dict(execution_result)
+        return execution_result
+
+    def _run_command(self, command: str, cwd: str, timeout: int) -> dict:
+        """Run a shell command, keeping only the head and tail of its output."""
         print(f"🔧 Executing: {command}")
         
-        try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            
-            execution_result = {
-                "command": command,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode,
-                "success": result.returncode == 0,
-                "cwd": cwd or os.getcwd()
-            }
-            
-            # Print results for visibility
-            if execution_result["success"]:
-                print(f"✅ Command succeeded")
-                if execution_result["stdout"]:
-                    print(f"📤 Output: {execution_result['stdout'][:200]}...")
-            else:
-                print(f"❌ Command failed (exit code: {result.returncode})")
-                if execution_result["stderr"]:
-                    print(f"📤 Error: {execution_result['stderr'][:300]}...")
-                    
-            return execution_result
-            
-        except subprocess.TimeoutExpired:
-            return {
-                "command": command,
-                "stdout": "",
-                "stderr": f"Command timed out after {timeout} seconds",
-                "return_code": 124,
-                "success": False,
-                "cwd": cwd or os.getcwd()
-            }
-        except Exception as e:
-            return {
-                "command": command,
-                "stdout": "",
-                "stderr": str(e),
-                "return_code": 1,
-                "success": False,
-                "cwd": cwd or os.getcwd()
-            }
+        result = run_command(command, cwd, timeout)
+        
+        # Only a failure's output is analysed, so a success keeps just a preview
+        success = result["success"]
+        execution_result = {
+            "command": command,
+            "stdout": result["stdout"][:SUCCESS_OUTPUT_CHARS] if success else result["stdout"],
+            "stderr": "" if success else result["stderr"],
+            "return_code": result["return_code"],
+            "success": success,
+            "cwd": cwd or os.getcwd()
+        }
+        
+        # Print results for visibility
+        if execution_result["success"]:
+            print(f"✅ Command succeeded")
+            if execution_result["stdout"]:
+                print(f"📤 Output: {execution_result['stdout'][:200]}...")
+        else:
+            print(f"❌ Command failed (exit code: {execution_result['return_code']})")
+            if execution_result["stderr"]:
+                print(f"📤 Error: {execution_result['stderr'][:300]}...")
+                
+        return execution_result
     
-    def write_file(self, file_path: str, content: str) -> bool:
-        """Write content to a file, creating directories if needed."""
+    def write_file(self, file_path: str, content: str, skip_mkdir: bool = False) -> bool:
+        """Write content to a file, creating directories if needed.
+        
+        ``skip_mkdir`` is for callers that created the directory already.
+        """
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with self._lock:
+                self._probe_cache.clear()
+            write_text(file_path, content, ensure_parent=not skip_mkdir)
             
             print(f"📝 Created/Updated: {file_path}")
             return True
@@ -134,14 +354,25 @@ class AutonomousDebuggingAgent:
             print(f"❌ Failed to write {file_path}: {str(e)}")
             return False
     
+    def _resolve(self, path: str, project_path: str) -> tuple:
+        """Absolute forms of a project and a path in it, without repeat getcwd calls.
+        
+        The project's is computed once per project; an absolute path (the
+        usual case, joined onto an absolute project) only needs normalising.
+        """
+        abs_project_path = self._abs_project_cache.get(project_path)
+        if abs_project_path is None:
+            abs_project_path = self._abs_project_cache[project_path] = os.path.abspath(project_path)
+        abs_path = os.path.normpath(path) if os.path.isabs(path) else os.path.abspath(path)
+        return abs_project_path, abs_path
+
     def read_file(self, file_path: str, project_path: str) -> str:
         """Read the content of a file, ensuring it's within the project directory."""
         try:
             # Security: Ensure the file path is within the project directory
-            abs_project_path = os.path.abspath(project_path)
-            abs_file_path = os.path.abspath(file_path)
+            abs_project_path, abs_file_path = self._resolve(file_path, project_path)
             
-            if not abs_file_path.startswith(abs_project_path):
+            if not _within(abs_file_path, abs_project_path):
                 return f"ERROR: Access to file {file_path} is restricted outside the project directory."
 
             with open(abs_file_path, 'r', encoding='utf-8') as f:
@@ -159,10 +390,9 @@ class AutonomousDebuggingAgent:
         """List files in a directory, ensuring it's within the project directory."""
         try:
             # Security: Ensure the directory path is within the project directory
-            abs_project_path = os.path.abspath(project_path)
-            abs_dir_path = os.path.abspath(dir_path)
+            abs_project_path, abs_dir_path = self._resolve(dir_path, project_path)
 
-            if not abs_dir_path.startswith(abs_project_path):
+            if not _within(abs_dir_path, abs_project_path):
                 return f"ERROR: Access to directory {dir_path} is restricted outside the project directory."
             
             if not os.path.isdir(abs_dir_path):
@@ -178,106 +408,185 @@ class AutonomousDebuggingAgent:
         except Exception as e:
             return f"ERROR: Could not list files in {dir_path}. Reason: {str(e)}"
 
-    def analyze_and_fix_issue(self, command: str, execution_result: dict, context: str = "") -> dict:
-        """Analyze an issue and generate a fix using AI, truncating context to avoid token limit errors."""
-        # Truncate debug history to last 2 entries
-        debug_history_short = self.debug_history[-2:] if self.debug_history else []
+    def _static_prefix(self) -> list:
+        """Return the frozen message prefix shared by every analysis request.
+
+        The system prompt and response instructions never change between
+        iterations, so keeping them byte-identical at the front of each request
+        lets the provider's automatic prompt caching reuse the prefix.
+        """
+        return list(self._prefix_messages)
+
+    def _dynamic_suffix(self, command: str, execution_result: dict, context: str = "") -> HumanMessage:
+        """Build the per-call message carrying the command output and context."""
+        # This command's last 2 attempts, summarised without file contents;
+        # other sessions may be running alongside
+        with self._lock:
+            debug_history_short = [summary for summary in self._history_summaries
+                                   if summary["command"] == command][-2:]
         # Truncate stdout/stderr to first 1000 characters (preserve start of error/log)
         stdout_short = execution_result.get('stdout', 'No output')[:1000]
         stderr_short = execution_result.get('stderr', 'No errors')[:1000]
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=(
-                f"""
-                DEBUGGING CONTEXT:
-                Command executed: {command}
-                Working directory: {execution_result.get('cwd', 'unknown')}
-                Exit code: {execution_result.get('return_code', 'unknown')}
-
-                STDOUT (truncated):
-                {stdout_short}
-
-                STDERR (truncated):
-                {stderr_short}
-
-                ADDITIONAL CONTEXT:
-                {context}
-
-                PREVIOUS DEBUG HISTORY (last 2):
-                {json.dumps(debug_history_short, indent=2) if debug_history_short else 'None'}
-
-                **CRITICAL INSTRUCTIONS:**
-                1.  **Analyze the PREVIOUS DEBUG HISTORY.** If previous attempts to fix this exact error have failed, you **MUST** propose a **NEW and DIFFERENT** solution.
-                2.  **Do not repeat a fix that has already failed.** If updating a file didn't work, consider other causes. Is a configuration file missing? Is a dependency incorrect? Is an environment variable missing?
-                3.  **Think step-by-step.** The error might be a symptom of a deeper problem. For example, a React test failing might not be the component's fault, but a missing test setup file (like `setupTests.js`).
-
-
-                **YOUR TASK:**
-                Analyze this error and provide an EXACT solution. If file contents or directory listings are provided in the 'ADDITIONAL CONTEXT', use them to inform your diagnosis. Your response must include:
-
-                1. ROOT_CAUSE: Brief explanation of what's wrong
-                2. SOLUTION_TYPE: One of [FILE_CREATE, FILE_UPDATE, COMMAND_RUN]. Use COMMAND_RUN for installing dependencies or running build steps, NOT for verification.
-                3. FILES_TO_CREATE: A list of files to create, including their full relative path and exact content.
-                4. FILES_TO_UPDATE: A list of files to update, including their full relative path and complete new content.
-                5. COMMANDS_TO_RUN: A list of commands to execute to apply the fix (e.g., `npm install`). **Do NOT include test commands like `npm test` or `go test` here.** The original failing command will be re-run automatically for verification. If a command needs to run in a subdirectory, you must include the `cd` command (e.g., `cd frontend && npm install some-package`).
-
-                **IMPORTANT**: Your response MUST be a single, valid JSON object. Do not include any text outside of the JSON.
-
-                JSON Response Format (Do not include a `verification_command` field):
-                {{
-                    "root_cause": "explanation",
-                    "solution_type": "type",
-                    "files_to_create": [
-                        {{
-                            "path": "relative/path/to/file",
-                            "content": "exact file content here"
-                        }}
-                    ],
-                    "files_to_update": [
-                        {{
-                            "path": "relative/path/to/file",
-                            "content": "complete updated file content"
-                        }}
-                    ],
-                    "commands_to_run": ["cd frontend && npm install some-package"]
-                }}
-                """
-            ))
-        ]
+        return HumanMessage(content=(
+            f"""
+            DEBUGGING CONTEXT:
+            Command executed: {command}
+            Working directory: {execution_result.get('cwd', 'unknown')}
+            Exit code: {execution_result.get('return_code', 'unknown')}
+
+            STDOUT (truncated):
+            {stdout_short}
+
+            STDERR (truncated):
+            {stderr_short}
+
+            ADDITIONAL CONTEXT:
+            {context}
+
+            PREVIOUS DEBUG HISTORY (last 2):
+            {dumps_compact(debug_history_short) if debug_history_short else 'None'}
+
+            Respond with the single JSON object described in your instructions.
+            """
+        ))
+
+    @staticmethod
+    def _fix_fingerprint(execution_result: dict, solution: dict):
+        """Identify a fix by the error's first line and exactly what it changes.
+
+        None for a solution that changes nothing (a parse failure, say).
+        """
+        files = solution.get("files_to_create", []) + solution.get("files_to_update", [])
+        commands = solution.get("commands_to_run", [])
+        if not files and not commands:
+            return None
+        error_lines = execution_result.get("stderr", "").strip().splitlines()
+        changes = sorted((f.get("path", ""), hashlib.sha1(f.get("content", "").encode()).hexdigest()) for f in files)
+        payload = dumps_compact([error_lines[0] if error_lines else "", solution.get("solution_type"), changes, commands])
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _is_repeated_fix(self, execution_result: dict, solution: dict) -> bool:
+        """Record a proposed fix, reporting whether it was proposed for this error before."""
+        fingerprint = self._fix_fingerprint(execution_result, solution)
+        if fingerprint is None:
+            return False
+        with self._lock:
+            if fingerprint in self._tried_fingerprints:
+                return True
+            self._tried_fingerprints.add(fingerprint)
+        return False
+
+    @staticmethod
+    def _solution_key(command: str, execution_result: dict) -> str:
+        """Identify a failure by its command and the start of its stderr."""
+        error = execution_result.get("stderr", "")[:2000]
+        return hashlib.blake2b((command + "\0" + error).encode()).hexdigest()
+
+    def _remember_solution(self, key: str, solution: dict):
+        """Keep a solution that fixed the error, evicting the oldest past the limit."""
+        with self._lock:
+            self._solution_cache[key] = solution
+            self._solution_cache.move_to_end(key)
+            while len(self._solution_cache) > SOLUTION_CACHE_SIZE:
+                self._solution_cache.popitem(last=False)
+
+    def _match_known_error(self, command: str, execution_result: dict):
+        """Build the standard fix for a recognised error, if it hasn't already failed.
+
+        A rule whose fix was applied and left the same error behind is
+        skipped, so the LLM gets to try something different.
+        """
+        error = execution_result.get("stderr", "")[:2000]
+        with self._lock:
+            tried = {entry["solution"].get("rule") for entry in self.debug_history
+                     if entry["command"] == command and entry["error"][:2000] == error}
+        for name, pattern, build in KNOWN_ERRORS:
+            match = pattern.search(error)
+            if match and name not in tried:
+                return {**build(match, command), "rule": name}
+        return None
+
+    def _stream_response(self, messages: list):
+        """Stream the LLM's reply, stopping as soon as it holds a whole JSON object.
+
+        Returns:
+            (text received, decoded object or None)
+        """
+        return stream_first_object(self.llm, messages)
+
+    def analyze_and_fix_issue(self, command: str, execution_result: dict, context: str = "") -> dict:
+        """Analyze an issue and generate a fix using AI, truncating context to avoid token limit errors.
+
+        An error that an earlier solution is known to have fixed gets that
+        solution back without calling the LLM, and so does an error matching
+        one of the KNOWN_ERRORS rules. A request identical to one already
+        answered gets the same decoded reply from the LLM cache.
+        """
+        key = self._solution_key(command, execution_result)
+        with self._lock:
+            cached = self._solution_cache.get(key)
+            if cached is not None:
+                self._solution_cache.move_to_end(key)
+        if cached is not None:
+            print("♻️  Reusing the fix that solved this error before")
+            return dict(cached)
+        
+        known = self._match_known_error(command, execution_result)
+        if known is not None:
+            print(f"📐 Known error ({known['rule']}); applying its standard fix")
+            return known
+
+        # Static prefix first, dynamic error output last; retries only append.
+        messages = self._static_prefix() + [self._dynamic_suffix(command, execution_result, context)]
+        solution = self._ask_llm(messages)
+        if self._is_repeated_fix(execution_result, solution):
+            print("🔁 That exact fix was already applied for this error; asking for a different one")
+            messages += [AIMessage(content=dumps_compact(solution)), HumanMessage(content=REPEATED_FIX_PROMPT)]
+            solution = self._ask_llm(messages)
+            self._is_repeated_fix(execution_result, solution)
+        return solution
+
+    def _ask_llm(self, messages: list) -> dict:
+        """Get a decoded solution for a request from the LLM cache or the LLM.
+
+        A reply that isn't valid JSON is retried once with a stricter prompt,
+        in JSON mode.
+        """
+        messages = list(messages)
+        cache_key = self._llm_cache.key(self.model, messages, self.temperature)
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            print(f"♻️  Same request answered before (LLM cache: {self._llm_cache.stats})")
+            return cached
         
         for attempt in range(2): # Allow one retry for JSON parsing
             try:
-                response = self.llm.invoke(messages)
-                
-                # Try to extract JSON from the response
-                response_text = response.content
-                json_text = None
-
-                # 1. Best case: Find a JSON markdown block
-                json_markdown_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-                if json_markdown_match:
-                    json_text = json_markdown_match.group(1)
+                if attempt == 0:
+                    response_text, solution = self._stream_response(messages)
                 else:
-                    # 2. Fallback: Find the first '{' and last '}'
-                    first_brace = response_text.find('{')
-                    last_brace = response_text.rfind('}')
-                    if first_brace != -1 and last_brace > first_brace:
-                        json_text = response_text[first_brace:last_brace + 1]
+                    response_text, solution = self._json_llm.invoke(messages).content, None
+                if solution is not None:
+                    self._llm_cache.set(cache_key, solution)
+                    return solution
+                
+                # Not one object from the first brace; look further into the reply
+                json_start = response_text.find('{')
 
-                if json_text:
+                if json_start != -1:
                     try:
-                        solution = json.loads(json_text)
+                        solution = decode_first_object(response_text)
+                        self._llm_cache.set(cache_key, solution)
                         return solution
                     except json.JSONDecodeError as e:
                         print(f"⚠️  JSON decode failed on attempt {attempt + 1}: {e}")
                         if attempt == 0:
                             print("   Retrying with a stricter prompt...")
                             # Add a message to the history to guide the LLM
-                            messages.append(response) # Add the bad response
+                            messages.append(AIMessage(content=response_text)) # Add the bad response
                             messages.append(HumanMessage(content="Your last response was not valid JSON. Please correct it and provide ONLY the JSON object without any other text."))
                             continue # Go to the next attempt in the loop
                         else:
-                            print(f"   Problematic JSON text (first 500 chars): {json_text[:500]}...")
+                            print(f"   Problematic JSON text (first 500 chars): {response_text[json_start:json_start + 500]}...")
                 else:
                     print("⚠️  Could not find any JSON in the AI response.")
 
@@ -300,19 +609,27 @@ class AutonomousDebuggingAgent:
         print(f"\n🔧 Applying solution: {solution.get('solution_type', 'Unknown')}")
         print(f"💡 Root cause: {solution.get('root_cause', 'Unknown')}")
         
-        success = True
+        # Create new files, then update existing ones; an update of a path
+        # that is also created wins, as it did when they were written in turn
+        targets = {}
+        for file_info in solution.get("files_to_create", []) + solution.get("files_to_update", []):
+            targets[os.path.normpath(os.path.join(project_path, file_info["path"]))] = file_info["content"]
         
-        # Create new files
-        for file_info in solution.get("files_to_create", []):
-            file_path = os.path.join(project_path, file_info["path"])
-            if not self.write_file(file_path, file_info["content"]):
-                success = False
+        # Each directory once, parents first, before any of the writes
+        for directory in sorted({os.path.dirname(path) for path in targets}):
+            try:
+                ensure_dir(directory)
+            except OSError as e:
+                print(f"❌ Failed to create {directory}: {str(e)}")
+        
+        def write(target):
+            return self.write_file(*target, skip_mkdir=True)
         
-        # Update existing files
-        for file_info in solution.get("files_to_update", []):
-            file_path = os.path.join(project_path, file_info["path"])
-            if not self.write_file(file_path, file_info["content"]):
-                success = False
+        if len(targets) > PARALLEL_WRITE_THRESHOLD:
+            written = list(io_pool().map(write, targets.items()))
+        else:
+            written = [write(target) for target in targets.items()]
+        success = all(written)
         
         # Run commands
         for command in solution.get("commands_to_run", []):
@@ -323,8 +640,15 @@ class AutonomousDebuggingAgent:
         
         return success
     
-    def debug_until_working(self, target_command: str, project_path: str = None) -> bool:
-        """Autonomously debug until the target command works."""
+    def debug_until_working(self, target_command: str, project_path: str = None, initial_context: str = "") -> bool:
+        """Autonomously debug until the target command works.
+
+        Args:
+            target_command: Command that must exit successfully
+            project_path: Directory to run the command in
+            initial_context: Extra findings (e.g. static-analysis diagnostics)
+                included in every analysis request
+        """
         
         if not project_path:
             project_path = os.getcwd()
@@ -335,114 +659,228 @@ class AutonomousDebuggingAgent:
         print(f"🔄 Max iterations: {self.max_iterations}")
         print("=" * 70)
         
-        for iteration in range(self.max_iterations):
-            print(f"\n🔄 ITERATION {iteration + 1}/{self.max_iterations}")
-            print("-" * 50)
-            
-            # Execute target command
-            result = self.execute_command(target_command, cwd=project_path)
-            
-            # If successful, we're done!
-            if result["success"]:
-                print(f"\n🎉 SUCCESS! Command '{target_command}' completed successfully!")
-                print("✅ Application debugging completed")
-                return True
-            
-            # Analyze the error and get a solution
-            print(f"\n🔍 Analyzing error (iteration {iteration + 1})...")
-            
-            # --- NEW: Use the read_file tool to gather more context ---
-            context = f"This is debugging iteration {iteration + 1}/{self.max_iterations} for command: '{target_command}'"
-            error_output = result.get("stderr", "") + result.get("stdout", "")
-            
-            files_to_read = set()
+        # (error key, solution) applied in the previous iteration, pending verification
+        applied = None
+        # Fixes edit the shared tree, so concurrent sessions take turns at the
+        # analyze-apply-verify phase; the first run of the command doesn't wait
+        fixing = False
+        
+        try:
+            for iteration in range(self.max_iterations):
+                print(f"\n🔄 ITERATION {iteration + 1}/{self.max_iterations}")
+                print("-" * 50)
+                
+                # Execute target command
+                result = self.execute_command(target_command, cwd=project_path)
+                if not result["success"] and applied is not None and self._needs_settling(target_command, applied[1]):
+                    for delay in SETTLE_DELAYS:
+                        time.sleep(delay)
+                        result = self.execute_command(target_command, cwd=project_path)
+                        if result["success"]:
+                            break
+                
+                if applied is not None:
+                    applied_key, applied_solution = applied
+                    if result["success"]:
+                        self._remember_solution(applied_key, applied_solution)
+                    elif self._solution_key(target_command, result) == applied_key:
+                        # The same error survived this fix; ask for a new one next time
+                        with self._lock:
+                            self._solution_cache.pop(applied_key, None)
+                    applied = None
+                
+                # If successful, we're done!
+                if result["success"]:
+                    print(f"\n🎉 SUCCESS! Command '{target_command}' completed successfully!")
+                    print("✅ Application debugging completed")
+                    return True
+                
+                if not fixing:
+                    waited = not self._fix_lock.acquire(blocking=False)
+                    if waited:
+                        self._fix_lock.acquire()
+                    fixing = True
+                    if waited:
+                        # Another session's fix may have cleared this error meanwhile
+                        continue
+                
+                # Analyze the error and get a solution
+                print(f"\n🔍 Analyzing error (iteration {iteration + 1})...")
+                
+                # --- NEW: Use the read_file tool to gather more context ---
+                context = f"This is debugging iteration {iteration + 1}/{self.max_iterations} for command: '{target_command}'"
+                if initial_context:
+                    context += f"\n\n{initial_context}"
+                # The first error opens stderr, and build tools print theirs last
+                error_output = (result.get("stderr") or "")[:ERROR_SCAN_CHARS] + (result.get("stdout") or "")[-ERROR_SCAN_CHARS:]
+                
+                files_to_read = set()
 
-            # Find file paths mentioned in the error output
-            mentioned_files = re.findall(r'[\./\w-]+\.(?:js|go|py|json|yaml|yml|toml|mod|sum|html|css|ts|tsx|jsx|test\.js)', error_output)
-            files_to_read.update(mentioned_files)
-            
-            # Heuristic: If a startup command fails, read its log file for more context.
-            log_file_match = re.search(r'>\s*([\w\./-]+\.log)', target_command)
-            if log_file_match:
-                log_file_name = log_file_match.group(1)
-                log_file_path = ""
-                if 'cd backend' in target_command:
-                    log_file_path = os.path.join("backend", log_file_name)
-                elif 'cd frontend' in target_command:
-                    log_file_path = os.path.join("frontend", log_file_name)
+                # Find file paths mentioned in the error output
+                mentioned_files = list(dict.fromkeys(_FILE_PATH_RE.findall(error_output)))
+                files_to_read.update(mentioned_files[:MAX_CONTEXT_FILES])
                 
-                if log_file_path:
-                    files_to_read.add(log_file_path)
-
-            # Heuristic: Find directory paths mentioned in the error output
-            # e.g., "directory 'path/to/dir'" or "'path/to/dir/'"
-            mentioned_dirs_raw = re.findall(r"directory\s+'([^']+)'|'([\./\w-]+/)'", error_output)
-            dirs_to_list = {item.strip() for tpl in mentioned_dirs_raw for item in tpl if item}
-
-            if files_to_read:
-                print(f"💡 Reading context from files: {list(files_to_read)}")
-                file_contents_context = "\n\nRELEVANT FILE CONTENTS (truncated to 1000 chars):\n"
-                for file in files_to_read:
-                    full_file_path = os.path.join(project_path, file)
-                    if os.path.exists(full_file_path):
-                        content = self.read_file(full_file_path, project_path)
-                        file_contents_context += f"--- START OF {file} ---\n{content[:1000]}\n--- END OF {file} ---\n\n"
-                context += file_contents_context
-
-            if dirs_to_list:
-                print(f"💡 Found mentions of directories in logs: {list(dirs_to_list)}")
-                dir_listings_context = "\n\nDIRECTORY LISTINGS:\n"
-                for directory in dirs_to_list:
-                    full_dir_path = os.path.join(project_path, directory)
-                    if os.path.isdir(full_dir_path):
-                        listing = self.list_files(full_dir_path, project_path)
-                        dir_listings_context += f"--- START OF {directory} LISTING ---\n{listing}\n--- END OF {directory} LISTING ---\n\n"
-                context += dir_listings_context
-
-            solution = self.analyze_and_fix_issue(target_command, result, context)
-            
-            # Store debug history
-            self.debug_history.append({
-                "iteration": iteration + 1,
-                "command": target_command,
-                "error": result.get("stderr", "Unknown error"),
-                "solution": solution
-            })
+                # Heuristic: If a startup command fails, read its log file for more context.
+                log_file_match = _LOG_FILE_RE.search(target_command)
+                if log_file_match:
+                    log_file_name = log_file_match.group(1)
+                    log_file_path = ""
+                    if 'cd backend' in target_command:
+                        log_file_path = os.path.join("backend", log_file_name)
+                    elif 'cd frontend' in target_command:
+                        log_file_path = os.path.join("frontend", log_file_name)
+                    
+                    if log_file_path:
+                        files_to_read.add(log_file_path)
+
+                # Heuristic: Find directory paths mentioned in the error output
+                mentioned_dirs_raw = _DIR_RE.findall(error_output)
+                dirs_to_list = {item.strip() for tpl in mentioned_dirs_raw for item in tpl if item}
+
+                # Reads overlap on the I/O pool; sorted so the same failure
+                # always builds the same prompt
+                if files_to_read:
+                    print(f"💡 Reading context from files: {list(files_to_read)}")
+                    def read_context(file):
+                        full_file_path = os.path.join(project_path, file)
+                        if os.path.exists(full_file_path):
+                            return file, self.read_file(full_file_path, project_path)
+                        return file, None
+                    file_contents_context = "\n\nRELEVANT FILE CONTENTS (truncated to 1000 chars):\n"
+                    for file, content in io_pool().map(read_context, sorted(files_to_read)):
+                        if content is not None:
+                            file_contents_context += f"--- START OF {file} ---\n{content[:1000]}\n--- END OF {file} ---\n\n"
+                    context += file_contents_context
+
+                if dirs_to_list:
+                    print(f"💡 Found mentions of directories in logs: {list(dirs_to_list)}")
+                    def list_context(directory):
+                        full_dir_path = os.path.join(project_path, directory)
+                        if os.path.isdir(full_dir_path):
+                            return directory, self.list_files(full_dir_path, project_path)
+                        return directory, None
+                    dir_listings_context = "\n\nDIRECTORY LISTINGS:\n"
+                    for directory, listing in io_pool().map(list_context, sorted(dirs_to_list)):
+                        if listing is not None:
+                            dir_listings_context += f"--- START OF {directory} LISTING ---\n{listing}\n--- END OF {directory} LISTING ---\n\n"
+                    context += dir_listings_context
+
+                solution = self.analyze_and_fix_issue(target_command, result, context)
+                
+                # Store debug history; whole solutions only go to the on-disk log
+                files_changed = [f.get("path") for f in
+                                 solution.get("files_to_create", []) + solution.get("files_to_update", [])]
+                with self._lock:
+                    self.debug_history.append({
+                        "iteration": iteration + 1,
+                        "command": target_command,
+                        "error": result.get("stderr", "Unknown error")[:2000],
+                        "solution": {**{k: v for k, v in solution.items() if k not in ("files_to_create", "files_to_update", "raw_response")},
+                                     "files_changed": files_changed}
+                    })
+                    if self.history_log:
+                        with open(self.history_log, "a", encoding="utf-8") as log:
+                            log.write(dumps_compact({"iteration": iteration + 1, "command": target_command,
+                                                     "error": result.get("stderr", ""), "solution": solution}) + "\n")
+                    self._history_summaries.append({
+                        "iteration": iteration + 1,
+                        "command": target_command,
+                        "error_head": result.get("stderr", "Unknown error")[:200],
+                        "root_cause": solution.get("root_cause"),
+                        "files_changed": files_changed,
+                        "commands_run": solution.get("commands_to_run", []),
+                    })
+                
+                # Apply the solution
+                if not self.apply_solution(solution, project_path):
+                    print(f"❌ Failed to apply solution in iteration {iteration + 1}")
+                    continue
+                applied = (self._solution_key(target_command, result), solution)
+                
+                print(f"✅ Solution applied in iteration {iteration + 1}. Retrying target command...")
             
-            # Apply the solution
-            if not self.apply_solution(solution, project_path):
-                print(f"❌ Failed to apply solution in iteration {iteration + 1}")
-                continue
+            # If we get here, we've exhausted all iterations
+            print(f"\n❌ DEBUGGING FAILED after {self.max_iterations} iterations")
+            print("🔍 Debug history:")
+            for entry in [entry for entry in self.debug_history if entry["command"] == target_command]:
+                print(f"   Iteration {entry['iteration']}: {entry['solution'].get('root_cause', 'Unknown')}")
             
-            # Give a moment for changes to take effect before retrying
-            time.sleep(1)
-            print(f"✅ Solution applied in iteration {iteration + 1}. Retrying target command...")
-        
-        # If we get here, we've exhausted all iterations
-        print(f"\n❌ DEBUGGING FAILED after {self.max_iterations} iterations")
-        print("🔍 Debug history:")
-        for entry in self.debug_history:
-            print(f"   Iteration {entry['iteration']}: {entry['solution'].get('root_cause', 'Unknown')}")
-        
-        return False
+            return False
+        finally:
+            if fixing:
+                self._fix_lock.release()
     
+    @staticmethod
+    def _needs_settling(target_command: str, solution: dict) -> bool:
+        """Whether a failed re-check may just be a service that isn't up yet.
+
+        Only probes of a running service qualify, and only after a fix that
+        ran commands (which may have restarted it); file edits and builds
+        are complete as soon as they return.
+        """
+        probes_service = "curl" in target_command or "localhost" in target_command
+        return probes_service and solution.get("solution_type") == "COMMAND_RUN"
+
     def _cleanup_ports(self, ports: list[int], project_path: str):
         """Kill any processes using the specified ports to ensure a clean state."""
         print("\n🧹 Cleaning up ports...")
-        for port in ports:
-            # Use lsof which is generally available. Fallback to fuser.
-            # These commands are designed to not require sudo and to fail silently.
-            commands = [
-                f"lsof -t -i:{port} | xargs kill -9 2>/dev/null || true",
-                f"fuser -k {port}/tcp 2>/dev/null || true"
-            ]
-            for cmd in commands:
-                # Use a shorter timeout for cleanup commands
-                self.execute_command(cmd, cwd=project_path, timeout=10)
-        time.sleep(1) # Give a moment for processes to terminate
-
-    def run_comprehensive_debug(self, project_path: str = None) -> dict:
-        """Run comprehensive debugging for a full-stack application."""
+        # Most of the time nothing is listening; skip the kill commands then
+        ports = [port for port in ports if _port_in_use(port)]
+        if not ports:
+            return
+        # Use lsof which is generally available. Fallback to fuser.
+        # These commands are designed to not require sudo and to fail silently.
+        commands = [command for port in ports for command in (
+            f"lsof -t -i:{port} | xargs kill -9 2>/dev/null || true",
+            f"fuser -k {port}/tcp 2>/dev/null || true"
+        )]
+        # They only wait on the process table, so run them all at once
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            # Use a shorter timeout for cleanup commands
+            list(executor.map(lambda cmd: self.execute_command(cmd, cwd=project_path, timeout=10), commands))
+        # Give the processes up to a second to let go of the ports
+        deadline = time.monotonic() + 1
+        while any(_port_in_use(port) for port in ports) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    @staticmethod
+    def _run_steps(steps: dict) -> dict:
+        """Run interdependent steps, starting each as soon as its prerequisites finish.
+
+        Args:
+            steps: Mapping of step name to (callable returning bool, names of
+                steps that must finish first). A prerequisite's failure
+                doesn't cancel the step; it still runs, as it would in order.
+
+        Returns:
+            Mapping of step name to its result
+        """
+        results = {}
+        pending = dict(steps)
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            running = {}
+            while pending or running:
+                for name, (run, requires) in list(pending.items()):
+                    if all(dependency in results for dependency in requires):
+                        print(f"\n▶️  {name.replace('_', ' ').upper()}")
+                        running[executor.submit(run)] = name
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ {name} failed with an unexpected error: {e}")
+                        results[name] = False
+        return results
+
+    def run_comprehensive_debug(self, project_path: str = None, initial_context: str = "") -> dict:
+        """Run comprehensive debugging for a full-stack application.
+
+        ``initial_context`` (e.g. leftover static-analysis diagnostics) is
+        passed to the backend and frontend build steps.
+        """
         # Always use top-level generated_fullstack_service for all operations
         if not project_path:
             project_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../generated_fullstack_service'))
@@ -461,72 +899,50 @@ class AutonomousDebuggingAgent:
                 "tests": False
             }
 
-            # 1. Check and fix dependencies
-            print("\n1️⃣  CHECKING DEPENDENCIES")
-            print("-" * 30)
             backend_path = os.path.join(project_path, "backend")
             frontend_path = os.path.join(project_path, "frontend")
-            backend_deps = self.debug_until_working("go mod tidy", backend_path)
-            frontend_deps = self.debug_until_working("npm install", frontend_path)
-            if backend_deps and frontend_deps:
-                results["dependencies"] = True
-
-            # 2. Fix backend build
-            print("\n2️⃣  DEBUGGING BACKEND BUILD")
-            print("-" * 30)
-            if self.debug_until_working("cd backend && go build", project_path):
-                results["backend_build"] = True
-
-            # 3. Fix frontend build
-            print("\n3️⃣  DEBUGGING FRONTEND BUILD")
-            print("-" * 30)
-            if self.debug_until_working("cd frontend && npm run build", project_path):
-                results["frontend_build"] = True
-
-            # 4. Fix Tilt configuration
-            print("\n4️⃣  DEBUGGING TILT SETUP")
-            print("-" * 30)
-            if self.debug_until_working("tilt doctor", project_path):
-                results["tilt_setup"] = True
-
-            # 5. Test backend startup
-            print("\n5️⃣  TESTING BACKEND STARTUP")
-            # Proactively clean up ports to avoid "address already in use" errors
-            self._cleanup_ports([8080, 3000], project_path)
-            print("-" * 30)
 
-            # This command is designed to be more robust for background processes.
-            # 1. `nohup ... &` ensures the process detaches and keeps running.
-            # 2. Output is redirected to a log file for later inspection if needed.
-            # 3. `sleep 5` gives the Go server ample time to start.
-            # 4. `curl` checks if the server is healthy.
+            # Backend startup: `nohup ... &` detaches the server with its output
+            # in a log file, the `until` loop polls every 0.1s for up to 20s
+            # until it answers, and the final `curl` reports its health (or
+            # the error, if it never came up).
             backend_startup_command = (
                 'bash -c "cd backend && nohup go run main.go > backend.log 2>&1 &" && '
-                'sleep 5 && curl -f http://localhost:8080/health'
+                f'{_poll_url("http://localhost:8080/health", 20)}; curl -f http://localhost:8080/health'
             )
-            backend_test = self.debug_until_working(backend_startup_command, project_path)
-            if backend_test:
-                results["backend_start"] = True
-
-            # 6. Test frontend startup
-            print("\n6️⃣  TESTING FRONTEND STARTUP")
-            print("-" * 30)
-            # This command is for the frontend service.
-            # `BROWSER=none` prevents opening a browser tab.
-            # `sleep 15` gives React dev server time to compile and start.
+            # Frontend startup: `BROWSER=none` prevents opening a browser tab;
+            # the React dev server gets up to 45s to compile and start.
             frontend_startup_command = (
                 'bash -c "cd frontend && BROWSER=none nohup npm start > frontend.log 2>&1 &" && '
-                'sleep 15 && curl -f http://localhost:3000'
+                f'{_poll_url("http://localhost:3000", 45)}; curl -f http://localhost:3000'
             )
-            frontend_test = self.debug_until_working(frontend_startup_command, project_path)
-            if frontend_test:
-                results["frontend_start"] = True
-
-            # 7. Run tests
-            print("\n7️⃣  RUNNING TESTS")
-            print("-" * 30)
-            if self.debug_until_working("make test", project_path):
-                results["tests"] = True
+
+            def start_service(command: str, port: int):
+                # Clear the port first to avoid "address already in use" errors
+                self._cleanup_ports([port], project_path)
+                return self.debug_until_working(command, project_path)
+
+            # Each step waits only for the steps it needs; the rest run side by side
+            steps = {
+                "backend_deps": (lambda: self.debug_until_working("go mod tidy", backend_path), []),
+                "frontend_deps": (lambda: self.debug_until_working("npm install", frontend_path), []),
+                "tilt_setup": (lambda: self.debug_until_working("tilt doctor", project_path), []),
+                "backend_build": (lambda: self.debug_until_working(
+                    "cd backend && go build", project_path, initial_context), ["backend_deps"]),
+                "frontend_build": (lambda: self.debug_until_working(
+                    "cd frontend && npm run build", project_path, initial_context), ["frontend_deps"]),
+                "backend_start": (lambda: start_service(backend_startup_command, 8080), ["backend_build"]),
+                "frontend_start": (lambda: start_service(frontend_startup_command, 3000), ["frontend_build"]),
+                # The tests hit the running services, and starting one clears its port
+                "tests": (lambda: self.debug_until_working("make test", project_path),
+                          ["backend_start", "frontend_start"]),
+            }
+            outcomes = self._run_steps(steps)
+
+            # Both pops must happen: a short-circuit left frontend_deps in the results
+            backend_deps, frontend_deps = outcomes.pop("backend_deps"), outcomes.pop("frontend_deps")
+            outcomes["dependencies"] = backend_deps and frontend_deps
+            results.update(outcomes)
 
             # Summary
             print("\n📊 DEBUGGING SUMMARY")
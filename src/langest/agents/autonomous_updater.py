@@ -3,27 +3,98 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 import os
-import subprocess
+import re
+import hashlib
+import threading
 import time
 import json
-import re
-from dotenv import load_dotenv
+from bisect import insort
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from langest.tools.file_io import PARALLEL_WRITE_THRESHOLD, ensure_dir, io_pool, write_text
+from langest.tools.groq_client import MODEL_TIERS, client_options
+from langest.tools.json_extract import decode_first_object, dumps_compact, stream_first_object
+from langest.tools.process import run_command
+
+
+# Update jobs run at the same time by run_updates, at most
+MAX_CONCURRENT_UPDATES = 8
+
+# Noise left out of the project file listing
+IGNORED_DIRS = frozenset({".git", "node_modules", "__pycache__"})
+IGNORED_FILES = frozenset({".DS_Store"})
+
+# Characters of a failed verification's output sent back to the LLM, from
+# the start and from the end, and how many error lines are pulled out first
+TEST_ERROR_HEAD_CHARS = 4000
+TEST_ERROR_TAIL_CHARS = 4000
+MAX_ERROR_LINES = 20
+# Outcomes of writing one proposed file
+WRITTEN, UNCHANGED, FAILED = "written", "unchanged", "failed"
+
+# Shown with the old error when a fix changed nothing, so verification was skipped
+UNCHANGED_FIX_NOTE = ("Your last changes were identical to the files already on disk and ran no commands, "
+                      "so the error below still stands. Propose a different change.\n\n")
+
+_ERROR_LINE_RE = re.compile(r"^(?:FAIL|ERROR|Traceback|.*[Ee]rror:).*$", re.MULTILINE)
+
+
+def _truncate_log(text: str, head: int = TEST_ERROR_HEAD_CHARS, tail: int = TEST_ERROR_TAIL_CHARS) -> str:
+    """Keep the start and end of a long log, noting how much was cut between."""
+    if len(text) <= head + tail:
+        return text
+    return f"{text[:head]}\n...[TRUNCATED {len(text) - head - tail} CHARACTERS]...\n{text[-tail:]}"
+
 
-load_dotenv()
+def _test_error(result: dict) -> str:
+    """What the LLM is shown of a failed verification: its error lines, then the truncated output."""
+    output = result["stderr"] + "\n" + result["stdout"]
+    error_lines = [match.group(0) for match in islice(_ERROR_LINE_RE.finditer(output), MAX_ERROR_LINES)]
+    summary = "Error lines:\n" + "\n".join(error_lines) + "\n\nOutput:\n" if error_lines else ""
+    return summary + _truncate_log(output)
+
+
+def _walk_files(directory: str, prefix: str = ""):
+    """Yield the relative paths of the project's files, skipping IGNORED_DIRS.
+
+    scandir's entries already know their type, so only the directories
+    that are descended into cost a syscall; unreadable ones are skipped,
+    as os.walk does.
+    """
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir():
+            if entry.name not in IGNORED_DIRS and not entry.is_symlink():
+                yield from _walk_files(entry.path, prefix + entry.name + os.sep)
+        elif entry.name not in IGNORED_FILES:
+            yield prefix + entry.name
 
 
 class AutonomousUpdaterAgent:
     """AI Agent that autonomously updates a codebase based on new requirements."""
 
-    def __init__(self, model: str = "llama3-70b-8192", temperature: float = 0.2):
-        """Initialize the autonomous updater agent."""
+    def __init__(self, model: str = MODEL_TIERS["balanced"], temperature: float = 0.2, history_log: str = None):
+        """Initialize the autonomous updater agent.
+
+        Args:
+            model: Groq model to use
+            temperature: Sampling temperature
+            history_log: JSONL file that every iteration's full changes are
+                appended to; ``update_history`` itself keeps no file contents
+        """
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options()
         )
         self.max_iterations = 5  # Max update attempts for a single run
-        self.update_history = []
+        self.update_history = []  # Plans, changed paths and content hashes per iteration
+        self.history_log = history_log
+        self._log_lock = threading.Lock()  # run_updates jobs share the log
 
         self.system_prompt = """You are an Expert Autonomous Software Development Agent. Your goal is to update an existing codebase to implement new features based on a set of requirements.
 
@@ -42,41 +113,84 @@ class AutonomousUpdaterAgent:
         -   After applying changes, the system will run tests to verify the implementation.
         -   If tests fail, analyze the error and propose a new set of changes to fix the issue.
         -   Do not suggest running test commands yourself; the system handles verification.
+
+        **YOUR TASK:**
+        Based on the requirements and the current project state, provide a set of changes to implement the features.
+        If the previous attempt failed, analyze the error and provide a fix.
+        Your response must be a single, valid JSON object.
+
+        JSON Response Format:
+        {
+            "plan": "A brief, step-by-step plan of the changes you are about to make.",
+            "files_to_create": [
+                {
+                    "path": "relative/path/to/new_file.js",
+                    "content": "exact file content here"
+                }
+            ],
+            "files_to_update": [
+                {
+                    "path": "relative/path/to/existing_file.go",
+                    "content": "complete updated file content"
+                }
+            ],
+            "commands_to_run": ["cd frontend && npm install new-package"]
+        }
         """
+        # Built once: every request starts with the same byte-identical
+        # instructions, which the provider's prompt cache can reuse
+        self._system_message = SystemMessage(content=self.system_prompt)
+
+        # Each project's sorted file listing, kept between iterations and
+        # patched with the files apply_changes writes; a command run through
+        # apply_changes can add or remove anything, so it drops the listing
+        self._file_lists = {}
+        # path -> (mtime_ns, size, content) of files read into the context
+        self._file_contents = {}
 
     def execute_command(self, command: str, cwd: str = None, timeout: int = 60) -> dict:
         """Execute a command and return detailed results."""
         print(f"🔧 Executing: {command}")
+        execution_result = {"command": command, **run_command(command, cwd, timeout), "cwd": cwd or os.getcwd()}
+        if execution_result["success"]:
+            print(f"✅ Command succeeded")
+        else:
+            print(f"❌ Command failed (exit code: {execution_result['return_code']})")
+            if execution_result["stderr"]:
+                print(f"📤 Error: {execution_result['stderr'][:300]}...")
+        return execution_result
+
+    def write_file(self, file_path: str, content: str, skip_mkdir: bool = False) -> bool:
+        """Write content to a file, creating directories if needed.
+
+        ``skip_mkdir`` is for callers that created the directory already.
+        """
         try:
-            result = subprocess.run(
-                command, shell=True, cwd=cwd, capture_output=True, text=True, timeout=timeout
-            )
-            execution_result = {
-                "command": command, "stdout": result.stdout, "stderr": result.stderr,
-                "return_code": result.returncode, "success": result.returncode == 0, "cwd": cwd or os.getcwd()
-            }
-            if execution_result["success"]:
-                print(f"✅ Command succeeded")
-            else:
-                print(f"❌ Command failed (exit code: {result.returncode})")
-                if execution_result["stderr"]:
-                    print(f"📤 Error: {execution_result['stderr'][:300]}...")
-            return execution_result
-        except Exception as e:
-            return {"command": command, "stdout": "", "stderr": str(e), "return_code": 1, "success": False, "cwd": cwd or os.getcwd()}
-
-    def write_file(self, file_path: str, content: str) -> bool:
-        """Write content to a file, creating directories if needed."""
-        try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_text(file_path, content, ensure_parent=not skip_mkdir)
             print(f"📝 Wrote to: {file_path}")
             return True
         except Exception as e:
             print(f"❌ Failed to write {file_path}: {str(e)}")
             return False
 
+    def _write_if_changed(self, file_path: str, content: str) -> str:
+        """Write a file unless it already holds exactly this content.
+
+        Returns:
+            WRITTEN, UNCHANGED or FAILED
+        """
+        data = content.encode("utf-8")
+        try:
+            # Only a file of the same size can match, so others aren't read
+            if os.path.getsize(file_path) == len(data):
+                with open(file_path, 'rb') as f:
+                    if f.read() == data:
+                        print(f"⏭️  Skipped unchanged: {file_path}")
+                        return UNCHANGED
+        except OSError:
+            pass
+        return WRITTEN if self.write_file(file_path, content, skip_mkdir=True) else FAILED
+
     def read_file(self, file_path: str) -> str:
         """Read the content of a file."""
         try:
@@ -88,47 +202,66 @@ class AutonomousUpdaterAgent:
             print(f"⚠️  Could not read file {file_path}: {e}")
             return f"ERROR: Could not read file {file_path}. Reason: {str(e)}"
 
+    def _read_cached(self, file_path: str) -> str:
+        """Read a file, reusing the last read while its mtime and size are unchanged."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return self.read_file(file_path)
+        cached = self._file_contents.get(file_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        content = self.read_file(file_path)
+        self._file_contents[file_path] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
     def get_project_context(self, project_path: str, files_to_read: list = None) -> str:
         """Get the project context by listing files and reading key files."""
+        file_list = self._file_lists.get(project_path)
+        if file_list is None:
+            file_list = self._file_lists[project_path] = sorted(_walk_files(project_path))
         context = "Project file structure:\n"
-        file_list = []
-        for root, _, files in os.walk(project_path):
-            for name in files:
-                # Ignore some common noisy directories/files
-                if '.git' in root or 'node_modules' in root or '.DS_Store' in name:
-                    continue
-                rel_path = os.path.relpath(os.path.join(root, name), project_path)
-                file_list.append(rel_path)
-        
-        context += "\n".join(sorted(file_list))
+        context += "\n".join(file_list)
         context += "\n\n"
 
         if files_to_read:
             context += "Contents of relevant files:\n"
-            for file in files_to_read:
+            # The reads overlap; map keeps them in the order asked for
+            def read(file):
                 full_path = os.path.join(project_path, file)
-                if os.path.exists(full_path):
-                    content = self.read_file(full_path)
-                    context += f"--- START OF {file} ---\n{content}\n--- END OF {file} ---\n\n"
+                return file, self._read_cached(full_path) if os.path.exists(full_path) else None
+            with ThreadPoolExecutor(max_workers=min(32, len(files_to_read))) as executor:
+                for file, content in executor.map(read, files_to_read):
+                    if content is not None:
+                        context += f"--- START OF {file} ---\n{content}\n--- END OF {file} ---\n\n"
         return context
 
-    def analyze_and_propose_changes(self, requirements: str, project_context: str, test_error: str = None) -> dict:
-        """Analyze requirements and project context to propose changes."""
-        history_short = self.update_history[-2:]
+    def analyze_and_propose_changes(self, requirements: str, project_context: str, test_error: str = None,
+                                    history: list = None) -> dict:
+        """Analyze requirements and project context to propose changes.
+
+        ``history`` is the update history to show the LLM; it defaults to
+        ``self.update_history``.
+        """
+        history_short = (self.update_history if history is None else history)[-2:]
         
-        prompt = f"""
+        # Requirements and project context repeat between iterations, so they
+        # follow the fixed system message; what changes comes last
+        stable_context = f"""
         **REQUIREMENTS:**
         {requirements}
 
         **CURRENT PROJECT CONTEXT:**
         {project_context}
+        """
 
+        delta = f"""
         **PREVIOUS UPDATE HISTORY (last 2 attempts):**
-        {json.dumps(history_short, indent=2) if history_short else 'None'}
+        {dumps_compact(history_short) if history_short else 'None'}
         """
 
         if test_error:
-            prompt += f"""
+            delta += f"""
             **VERIFICATION FAILED:**
             The last update was applied, but the tests failed with the following error. You must fix this.
             
@@ -136,70 +269,85 @@ class AutonomousUpdaterAgent:
             {test_error}
             """
 
-        prompt += """
-        **YOUR TASK:**
-        Based on the requirements and the current project state, provide a set of changes to implement the features.
-        If the previous attempt failed, analyze the error and provide a fix.
-        Your response must be a single, valid JSON object.
-
-        JSON Response Format:
-        {
-            "plan": "A brief, step-by-step plan of the changes you are about to make.",
-            "files_to_create": [
-                {
-                    "path": "relative/path/to/new_file.js",
-                    "content": "exact file content here"
-                }
-            ],
-            "files_to_update": [
-                {
-                    "path": "relative/path/to/existing_file.go",
-                    "content": "complete updated file content"
-                }
-            ],
-            "commands_to_run": ["cd frontend && npm install new-package"]
-        }
+        delta += """
+        Respond with the single JSON object described in your instructions.
         """
 
         messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
+            self._system_message,
+            HumanMessage(content=stable_context),
+            HumanMessage(content=delta)
         ]
 
-        response = self.llm.invoke(messages)
-        response_text = response.content
+        # Stop reading once the object is complete; trailing prose is dropped
+        response_text, changes = stream_first_object(self.llm, messages)
+        if changes is not None:
+            return changes
         
         try:
-            # Simple JSON extraction
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            else:
-                raise ValueError("No JSON object found in the response.")
+            return decode_first_object(response_text)
         except (json.JSONDecodeError, ValueError) as e:
             print(f"❌ Failed to parse AI response: {e}")
             return {"plan": "Failed to parse AI response.", "raw_response": response_text}
 
     def apply_changes(self, changes: dict, project_path: str) -> bool:
         """Apply the changes proposed by the AI."""
+        return self._apply_changes(changes, project_path)[0]
+
+    def _apply_changes(self, changes: dict, project_path: str):
+        """Apply the changes proposed by the AI.
+
+        Files whose content is already on disk aren't rewritten.
+
+        Returns:
+            (whether every write succeeded, whether anything was written or run)
+        """
         print(f"\n💡 Plan: {changes.get('plan', 'No plan provided.')}")
-        success = True
-        for file_info in changes.get("files_to_create", []):
-            path = os.path.join(project_path, file_info["path"])
-            if not self.write_file(path, file_info["content"]):
-                success = False
-        for file_info in changes.get("files_to_update", []):
-            path = os.path.join(project_path, file_info["path"])
-            if not self.write_file(path, file_info["content"]):
-                success = False
+        # Distinct paths have no ordering between them; a path both created
+        # and updated gets the update, as when they were written in turn
+        targets = {}
+        for file_info in changes.get("files_to_create", []) + changes.get("files_to_update", []):
+            targets[os.path.normpath(os.path.join(project_path, file_info["path"]))] = file_info["content"]
+
+        # Each directory once, parents first, before any of the writes
+        for directory in sorted({os.path.dirname(path) for path in targets}):
+            try:
+                ensure_dir(directory)
+            except OSError as e:
+                print(f"❌ Failed to create {directory}: {str(e)}")
+
+        def write(target):
+            return self._write_if_changed(*target)
+
+        if len(targets) > PARALLEL_WRITE_THRESHOLD:
+            outcomes = list(io_pool().map(write, targets.items()))
+        else:
+            outcomes = [write(target) for target in targets.items()]
+        success = FAILED not in outcomes
+        changed = WRITTEN in outcomes or bool(changes.get("commands_to_run"))
+
+        file_list = self._file_lists.get(project_path)
+        if file_list is not None:
+            for path, outcome in zip(targets, outcomes):
+                relative = os.path.relpath(path, project_path)
+                if outcome == WRITTEN and not relative.startswith(os.pardir) and relative not in file_list:
+                    insort(file_list, relative)
+        if changes.get("commands_to_run"):
+            self._file_lists.pop(project_path, None)
         for command in changes.get("commands_to_run", []):
             result = self.execute_command(command, cwd=project_path)
             if not result["success"]:
                 print(f"⚠️  Command failed: {command}")
-        return success
+        return success, changed
+
+    def run_update(self, project_path: str, requirements_path: str, verification_command: str = "make test",
+                   history: list = None):
+        """Run the autonomous update process.
 
-    def run_update(self, project_path: str, requirements_path: str, verification_command: str = "make test"):
-        """Run the autonomous update process."""
+        Attempts are recorded in ``history``, ``self.update_history`` by default.
+        """
+        if history is None:
+            history = self.update_history
         print("🚀 Starting autonomous code update session.")
         
         try:
@@ -213,6 +361,8 @@ class AutonomousUpdaterAgent:
         print(f"📁 Project path: {project_path}")
         print("=" * 70)
 
+        # Start from a fresh listing; the project may have changed since the last session
+        self._file_lists.pop(project_path, None)
         test_error = None
         for i in range(self.max_iterations):
             print(f"\n🔄 UPDATE ITERATION {i + 1}/{self.max_iterations}")
@@ -222,22 +372,40 @@ class AutonomousUpdaterAgent:
             # the agent can ask for them if needed.
             project_context = self.get_project_context(project_path)
 
-            changes = self.analyze_and_propose_changes(requirements, project_context, test_error)
+            changes = self.analyze_and_propose_changes(requirements, project_context, test_error, history)
             
-            self.update_history.append({
+            # The history is shown to the LLM next iteration, so it names the
+            # files written instead of repeating them; whole changes only go
+            # to the on-disk log
+            files = changes.get("files_to_create", []) + changes.get("files_to_update", [])
+            history.append({
                 "iteration": i + 1,
                 "plan": changes.get("plan"),
-                "changes": {k: v for k, v in changes.items() if k != 'plan'}
+                "files_changed": [f.get("path") for f in files],
+                "file_hashes": {f.get("path"): hashlib.blake2b(str(f.get("content", "")).encode(), digest_size=16).hexdigest()
+                                for f in files},
+                "commands_run": changes.get("commands_to_run", [])
             })
+            if self.history_log:
+                with self._log_lock, open(self.history_log, "a", encoding="utf-8") as log:
+                    log.write(dumps_compact({"project": project_path, "iteration": i + 1, "changes": changes}) + "\n")
 
             if not changes.get("files_to_create") and not changes.get("files_to_update") and not changes.get("commands_to_run"):
                 print("⚠️ Agent proposed no changes. Ending session.")
                 break
 
-            if not self.apply_changes(changes, project_path):
+            success, changed = self._apply_changes(changes, project_path)
+            if not success:
                 print("❌ Failed to apply changes. Aborting.")
                 return False
 
+            if not changed and test_error is not None:
+                # Nothing on disk moved since the last failed run; it would fail the same way
+                print("⏭️  Changes match the files on disk; skipping verification.")
+                if not test_error.startswith(UNCHANGED_FIX_NOTE):
+                    test_error = UNCHANGED_FIX_NOTE + test_error
+                continue
+
             print("\n✅ Verifying changes with tests...")
             verification_result = self.execute_command(verification_command, cwd=project_path)
 
@@ -246,8 +414,27 @@ class AutonomousUpdaterAgent:
                 return True
             else:
                 print("❌ Verification failed. The agent will try to fix it.")
-                test_error = verification_result["stderr"] + "\n" + verification_result["stdout"]
+                test_error = _test_error(verification_result)
                 time.sleep(1)
 
         print(f"\n❌ UPDATE FAILED after {self.max_iterations} iterations.")
-        return False
\ No newline at end of file
+        return False
+
+    def run_updates(self, jobs: list, verification_command: str = "make test") -> list:
+        """Run independent update jobs concurrently.
+
+        Each job is a ``(project_path, requirements_path)`` pair with its own
+        update history, so while one waits on the LLM or its tests the
+        others keep going. The jobs' histories are added to
+        ``self.update_history`` once all of them finish.
+
+        Returns:
+            Each job's ``run_update`` result, in the order given
+        """
+        histories = [[] for _ in jobs]
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_UPDATES, len(jobs)) or 1) as executor:
+            results = list(executor.map(
+                lambda job, history: self.run_update(*job, verification_command, history), jobs, histories))
+        for history in histories:
+            self.update_history.extend(history)
+        return results
\ No newline at end of file
@@ -3,27 +3,68 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 import os
-import subprocess
-import json
-from dotenv import load_dotenv
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional
 
-load_dotenv()
+from langest.tools.fix_cache import FixProgram, StructuralFixCache
+from langest.tools.groq_client import MODEL_TIERS, client_options
+from langest.tools.json_extract import decode_first_object, dumps_compact
+from langest.tools.llm_cache import DEFAULT_CACHE_PATH, LLMCache, cached_invoke
+from langest.tools.process import run_command
+
+
+# Files listed in the project structure analysis
+PROJECT_FILE_SUFFIXES = frozenset({".go", ".js", ".json", ".yaml", ".yml"})
+PROJECT_FILE_NAMES = frozenset({"Dockerfile", "Makefile"})
+PROJECT_FILES_SHOWN = 20
+CONFIG_FILES = ("package.json", "go.mod", "docker-compose.yml", "Dockerfile", "Makefile")
+
+# Prerequisite checks per setup requirement, as (label, command)
+PREREQUISITE_CHECKS = {
+    "go": [("Go", "go version")],
+    "node": [("Node", "node --version"), ("NPM", "npm --version")],
+    "docker": [("Docker", "docker --version")],
+    "tilt": [("Tilt", "tilt version")],
+}
+
+
+def _project_files(project_path: str):
+    """Yield the project's source and config files, skipping .git and node_modules."""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [name for name in dirs if name not in (".git", "node_modules")]
+        for name in files:
+            if name in PROJECT_FILE_NAMES or os.path.splitext(name)[1] in PROJECT_FILE_SUFFIXES:
+                yield os.path.join(root, name)
+
+
+# Seconds a saved answer is reused for an identical request in later sessions
+RESPONSE_CACHE_TTL = 24 * 3600
 
 
 class DevOpsEngineerAgent:
     """DevOps Engineer AI Agent with execution capabilities."""
     
-    def __init__(self, model: str = "llama3-8b-8192", temperature: float = 0.2):
+    def __init__(self, model: str = MODEL_TIERS["instant"], temperature: float = 0.2,
+                 response_cache: Optional[LLMCache] = None):
         """Initialize the DevOps Engineer agent.
         
         Args:
             model: Groq model to use
             temperature: Temperature for response generation
+            response_cache: Cache of answers to identical requests; defaults
+                to one persisted under ~/.cache/langest for a day, which
+                skips requests sampled above MAX_CACHEABLE_TEMPERATURE
         """
+        self.model = model
+        self.temperature = temperature
+        self.response_cache = response_cache or LLMCache(
+            path=DEFAULT_CACHE_PATH, ttl=RESPONSE_CACHE_TTL)
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options()
         )
         
         self.system_prompt = """You are a Senior DevOps Engineer with expertise in:
@@ -49,6 +90,46 @@ class DevOpsEngineerAgent:
         - Consider different environments (development, staging, production)
         - Prioritize automation and repeatability
         - Include error handling and rollback strategies"""
+
+        # Every call starts with the same byte-identical system prompt, a
+        # prefix the provider's prompt cache can reuse; a task's extra
+        # instructions follow in a second system message. Built once.
+        base = SystemMessage(content=self.system_prompt)
+        self.system_messages = {
+            "default": [base],
+            "debug": [base, SystemMessage(content="""For debugging tasks:
+            - Analyze the error message and context
+            - Identify the root cause
+            - Provide step-by-step fix instructions
+            - Include prevention strategies
+            - Test the solution if possible""")],
+            "pipeline": [base, SystemMessage(content="""For deployment pipeline creation:
+            - Design automated CI/CD workflows
+            - Include testing, building, and deployment stages
+            - Consider security and compliance requirements
+            - Provide rollback strategies
+            - Include monitoring and alerting""")],
+            "performance": [base, SystemMessage(content="""For performance optimization:
+            - Identify bottlenecks in code and infrastructure
+            - Suggest specific optimizations
+            - Consider scalability and resource efficiency
+            - Provide monitoring strategies
+            - Include load testing recommendations""")],
+            "fix_program": [base, SystemMessage(content="""For fix program generation, respond ONLY with a JSON object:
+            {"pattern": "<regex matching the error message; use named groups for the varying parts>",
+             "search": "<regex to find in the affected files; ${group} inserts a group from pattern>",
+             "template": "<re.sub replacement for search; ${group} is also allowed>",
+             "files_glob": "<glob of files to rewrite, relative to the project root>"}
+            The pattern must match any error of the same kind, not only this occurrence.""")],
+        }
+    
+    def _invoke(self, messages: list) -> str:
+        """Answer a request from the response cache, or ask the LLM and cache it.
+        
+        The key is the whole request, so the project facts and diagnostics
+        in it have to match too, not only the question.
+        """
+        return cached_invoke(self.response_cache, self.llm, self.model, self.temperature, messages)
     
     def execute_command(self, command: str, cwd: str = None) -> dict:
         """Execute a shell command and return results.
@@ -60,70 +141,46 @@ class DevOpsEngineerAgent:
         Returns:
             Dictionary with stdout, stderr, return_code
         """
-        try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            return {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode,
-                "success": result.returncode == 0
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                "stdout": "",
-                "stderr": "Command timed out after 30 seconds",
-                "return_code": 124,
-                "success": False
-            }
-        except Exception as e:
-            return {
-                "stdout": "",
-                "stderr": str(e),
-                "return_code": 1,
-                "success": False
-            }
+        return run_command(command, cwd, timeout=30)
     
-    def debug_application(self, project_path: str, error_description: str) -> str:
+    def debug_application(self, project_path: str, error_description: str,
+                          fix_cache: Optional[StructuralFixCache] = None,
+                          verify_command: Optional[str] = None) -> str:
         """Debug an application by analyzing errors and providing fixes.
         
         Args:
             project_path: Path to the project directory
             error_description: Description of the error encountered
+            fix_cache: Cache of fix programs for previously seen error shapes
+            verify_command: Command that reproduces the error; required for
+                fix programs to be applied or learned
             
         Returns:
             Debug analysis and fix recommendations
         """
+        use_cache = fix_cache is not None and verify_command is not None
+        if use_cache:
+            cached = self._apply_cached_fix(fix_cache, project_path, error_description, verify_command)
+            if cached:
+                return cached
+        
         # First, gather information about the project
         project_info = self._analyze_project_structure(project_path)
         
         # Try to reproduce the error if possible
         execution_results = self._run_diagnostics(project_path)
         
+        # Project facts first, the error last, to keep the shared prefix long
         messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For debugging tasks:
-            - Analyze the error message and context
-            - Identify the root cause
-            - Provide step-by-step fix instructions
-            - Include prevention strategies
-            - Test the solution if possible"""),
+            *self.system_messages["debug"],
             HumanMessage(content=f"""
             Project Path: {project_path}
-            Error Description: {error_description}
-            
             Project Structure Analysis: {project_info}
             
             Diagnostic Results: {execution_results}
             
+            Error Description: {error_description}
+            
             Please provide:
             1. Root cause analysis
             2. Step-by-step fix instructions
@@ -133,8 +190,54 @@ class DevOpsEngineerAgent:
             """)
         ]
         
-        response = self.llm.invoke(messages)
-        return response.content
+        answer = self._invoke(messages)
+        if use_cache and self._learn_fix_program(fix_cache, project_path, error_description, verify_command):
+            return answer + "\n\n(A fix program for this error was validated and cached.)"
+        return answer
+    
+    def _apply_cached_fix(self, fix_cache: StructuralFixCache, project_path: str,
+                          error_description: str, verify_command: str) -> Optional[str]:
+        """Fix a known error shape locally, without calling the LLM."""
+        program = fix_cache.lookup(error_description)
+        if program is None or self.execute_command(verify_command, cwd=project_path)["success"]:
+            return None
+        
+        try:
+            originals = program.apply(error_description, project_path)
+        except (OSError, re.error):
+            return None
+        if originals and self.execute_command(verify_command, cwd=project_path)["success"]:
+            files = ", ".join(os.path.relpath(path, project_path) for path in originals)
+            return f"Applied cached fix program to {files}; `{verify_command}` now succeeds."
+        FixProgram.restore(originals)
+        return None
+    
+    def _learn_fix_program(self, fix_cache: StructuralFixCache, project_path: str,
+                           error_description: str, verify_command: str) -> bool:
+        """Ask the LLM for a fix program and cache it if it verifiably works."""
+        messages = [
+            *self.system_messages["fix_program"],
+            HumanMessage(content=f"""
+            Project Path: {project_path}
+            Verification Command: {verify_command}
+            
+            Error Description: {error_description}
+            """)
+        ]
+        
+        try:
+            program = FixProgram.from_dict(decode_first_object(self._invoke(messages)))
+        except (ValueError, KeyError, TypeError, re.error):
+            return False
+        
+        try:
+            valid = fix_cache.validate(program, error_description, project_path, verify_command, self.execute_command)
+        except (OSError, re.error):
+            valid = False
+        if not valid:
+            return False
+        fix_cache.add(error_description, program)
+        return True
     
     def setup_development_environment(self, project_path: str, requirements: dict) -> str:
         """Set up a complete development environment.
@@ -146,32 +249,21 @@ class DevOpsEngineerAgent:
         Returns:
             Setup instructions and status
         """
+        # Check prerequisites; the checks are independent, so they run at once
+        checks = [check for requirement, requirement_checks in PREREQUISITE_CHECKS.items()
+                  if requirements.get(requirement) for check in requirement_checks]
         setup_results = []
-        
-        # Check prerequisites
-        if requirements.get("go"):
-            go_check = self.execute_command("go version")
-            setup_results.append(f"Go check: {go_check}")
-        
-        if requirements.get("node"):
-            node_check = self.execute_command("node --version")
-            npm_check = self.execute_command("npm --version")
-            setup_results.append(f"Node check: {node_check}")
-            setup_results.append(f"NPM check: {npm_check}")
-        
-        if requirements.get("docker"):
-            docker_check = self.execute_command("docker --version")
-            setup_results.append(f"Docker check: {docker_check}")
-        
-        if requirements.get("tilt"):
-            tilt_check = self.execute_command("tilt version")
-            setup_results.append(f"Tilt check: {tilt_check}")
+        if checks:
+            with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+                # map keeps the results in a fixed order, so the prompt is stable
+                results = executor.map(self.execute_command, [command for _, command in checks])
+                setup_results = [f"{label} check: {result}" for (label, _), result in zip(checks, results)]
         
         messages = [
-            SystemMessage(content=self.system_prompt),
+            *self.system_messages["default"],
             HumanMessage(content=f"""
             Project Path: {project_path}
-            Requirements: {json.dumps(requirements, indent=2)}
+            Requirements: {dumps_compact(requirements)}
             
             Current Environment Status:
             {chr(10).join(str(result) for result in setup_results)}
@@ -185,8 +277,7 @@ class DevOpsEngineerAgent:
             """)
         ]
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._invoke(messages)
     
     def create_deployment_pipeline(self, project_description: str, target_environment: str) -> str:
         """Create a CI/CD deployment pipeline.
@@ -199,14 +290,7 @@ class DevOpsEngineerAgent:
             Deployment pipeline configuration and instructions
         """
         messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For deployment pipeline creation:
-            - Design automated CI/CD workflows
-            - Include testing, building, and deployment stages
-            - Consider security and compliance requirements
-            - Provide rollback strategies
-            - Include monitoring and alerting"""),
+            *self.system_messages["pipeline"],
             HumanMessage(content=f"""
             Project Description: {project_description}
             Target Environment: {target_environment}
@@ -222,8 +306,7 @@ class DevOpsEngineerAgent:
             """)
         ]
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._invoke(messages)
     
     def optimize_performance(self, project_path: str, performance_metrics: dict) -> str:
         """Analyze and optimize application performance.
@@ -239,20 +322,13 @@ class DevOpsEngineerAgent:
         project_analysis = self._analyze_project_structure(project_path)
         
         messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For performance optimization:
-            - Identify bottlenecks in code and infrastructure
-            - Suggest specific optimizations
-            - Consider scalability and resource efficiency
-            - Provide monitoring strategies
-            - Include load testing recommendations"""),
+            *self.system_messages["performance"],
             HumanMessage(content=f"""
             Project Path: {project_path}
-            Current Performance Metrics: {json.dumps(performance_metrics, indent=2)}
-            
             Project Analysis: {project_analysis}
             
+            Current Performance Metrics: {dumps_compact(performance_metrics)}
+            
             Please provide:
             1. Performance bottleneck analysis
             2. Specific optimization recommendations
@@ -264,36 +340,33 @@ class DevOpsEngineerAgent:
             """)
         ]
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._invoke(messages)
     
     def _analyze_project_structure(self, project_path: str) -> dict:
         """Analyze the project structure and gather basic information."""
         analysis = {}
         
-        # Get directory structure
-        tree_result = self.execute_command(f"find {project_path} -type f -name '*.go' -o -name '*.js' -o -name '*.json' -o -name '*.yaml' -o -name '*.yml' -o -name 'Dockerfile' -o -name 'Makefile' | head -20")
-        analysis["files"] = tree_result
+        # Get directory structure, in-process rather than through find
+        analysis["files"] = list(islice(_project_files(project_path), PROJECT_FILES_SHOWN))
         
         # Check for common config files
-        config_files = ["package.json", "go.mod", "docker-compose.yml", "Dockerfile", "Makefile"]
-        for config_file in config_files:
-            file_check = self.execute_command(f"ls {project_path}/{config_file}", cwd=project_path)
-            analysis[f"{config_file}_exists"] = file_check["success"]
+        for config_file in CONFIG_FILES:
+            analysis[f"{config_file}_exists"] = os.path.isfile(os.path.join(project_path, config_file))
         
         return analysis
     
     def _run_diagnostics(self, project_path: str) -> dict:
         """Run basic diagnostic commands on the project."""
-        diagnostics = {}
-        
-        # Try to build/compile
-        if os.path.exists(os.path.join(project_path, "backend", "go.mod")):
-            go_build = self.execute_command("go build", cwd=os.path.join(project_path, "backend"))
-            diagnostics["go_build"] = go_build
-        
-        if os.path.exists(os.path.join(project_path, "frontend", "package.json")):
-            npm_check = self.execute_command("npm ls", cwd=os.path.join(project_path, "frontend"))
-            diagnostics["npm_dependencies"] = npm_check
+        # Try to build/compile; the backend and frontend checks run side by side
+        candidates = [
+            ("go_build", "go build", os.path.join(project_path, "backend"), "go.mod"),
+            ("npm_dependencies", "npm ls", os.path.join(project_path, "frontend"), "package.json"),
+        ]
+        checks = [(key, command, cwd) for key, command, cwd, marker in candidates
+                  if os.path.exists(os.path.join(cwd, marker))]
+        if not checks:
+            return {}
         
-        return diagnostics
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {key: executor.submit(self.execute_command, command, cwd=cwd) for key, command, cwd in checks}
+        return {key: future.result() for key, future in futures.items()}
@@ -3,8 +3,21 @@ LangServ Autonomous Debug Agent for generated_fullstack_service
 """
 
 from langest.agents.autonomous_debugger import AutonomousDebuggingAgent
+from langest.tools.llm_cache import LLMCache
+from functools import lru_cache
 import os
 
+
+@lru_cache(maxsize=1)
+def _get_debug_agent():
+    """The debugging agent shared by every debug run in this process.
+
+    Its model client, caches and reply cache are built once, so a run
+    repeating a request an earlier one already sent skips the LLM.
+    """
+    return AutonomousDebuggingAgent(llm_cache=LLMCache(max_entries=256))
+
+
 class GeneratedFullstackDebugAgent:
     """
     Autonomous agent for debugging the generated_fullstack_service project using LangServ.
@@ -13,7 +26,7 @@ class GeneratedFullstackDebugAgent:
         if project_path is None:
             project_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../generated_fullstack_service'))
         self.project_path = project_path
-        self.agent = AutonomousDebuggingAgent()
+        self.agent = _get_debug_agent()
 
     def debug(self):
         """
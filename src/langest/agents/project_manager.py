@@ -2,26 +2,134 @@
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
-import os
-from dotenv import load_dotenv
+from typing import AsyncIterator, Optional
 
-load_dotenv()
+from langest.tools.groq_client import MAX_ATTEMPTS, MODEL_TIERS, client_options, request_slots, run_limited
+from langest.tools.llm_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LLMCache, astream_cached, cached_invoke
+
+
+# What each task asks for, filled in per call with str.format
+_CREATE_PROJECT_PLAN_PROMPT = """
+            Please create a comprehensive project plan including:
+            1. Project Overview and Objectives
+            2. Scope Definition (In-scope and Out-of-scope)
+            3. Success Criteria and Acceptance Criteria
+            4. Work Breakdown Structure (WBS)
+            5. Timeline and Milestones
+            6. Resource Requirements
+            7. Risk Assessment and Mitigation Strategies
+            8. Quality Assurance Plan
+            9. Communication and Reporting Plan
+            10. Dependencies and Assumptions
+            11. Budget Considerations (if applicable)
+            12. Next Steps and Action Items
+            
+            Ensure the plan is detailed enough to guide the development team through successful project completion.
+            
+            Project Request: {project_request}
+            """
+
+_REVIEW_DELIVERABLES_PROMPT = """
+            Please conduct a comprehensive final review including:
+            1. Executive Summary
+            2. Requirements Compliance Assessment
+            3. Quality Evaluation of All Deliverables
+            4. Gap Analysis and Outstanding Issues
+            5. Project Success Metrics Evaluation
+            6. Final Deliverable Package Organization
+            7. Deployment Readiness Assessment
+            8. Post-Deployment Recommendations
+            9. Lessons Learned and Improvements
+            10. Stakeholder Communication Summary
+            11. Project Closure Activities
+            12. Maintenance and Support Transition Plan
+            
+            Original Project Request: {project_request}
+            
+            Project Plan: {project_plan}
+            
+            Code Implementation: {code_implementation}
+            
+            Test Results: {test_results}
+            
+            Documentation: {documentation}
+            """
+
+_ASSESS_PROJECT_RISKS_PROMPT = """
+            Please provide a comprehensive risk assessment including:
+            1. Risk Identification and Categorization
+            2. Probability and Impact Analysis
+            3. Risk Priority Matrix
+            4. Mitigation Strategies for High-Priority Risks
+            5. Contingency Plans
+            6. Risk Monitoring and Control Processes
+            7. Risk Communication Plan
+            8. Early Warning Indicators
+            9. Risk Response Strategies
+            10. Overall Risk Profile Assessment
+            
+            Project Description: {project_description}
+            
+            Timeline: {timeline}
+            
+            Resources: {resources}
+            """
+
+_CREATE_STATUS_REPORT_PROMPT = """
+            Please create a professional status report including:
+            1. Executive Summary
+            2. Project Health Dashboard
+            3. Progress Against Plan
+            4. Key Achievements This Period
+            5. Current Issues and Blockers
+            6. Risk Status Update
+            7. Budget and Resource Status
+            8. Upcoming Milestones
+            9. Next Steps and Action Items
+            10. Stakeholder Action Required
+            11. Success Metrics and KPIs
+            12. Overall Project Health Assessment
+            
+            Project Plan: {project_plan}
+            
+            Current Progress: {current_progress}
+            
+            Issues: {issues}
+            
+            Next Steps: {next_steps}
+            """
 
 
 class ProjectManagerAgent:
     """Project Manager AI Agent."""
     
-    def __init__(self, model: str = "mixtral-8x7b-32768", temperature: float = 0.2):
+    def __init__(self, model: str = MODEL_TIERS["balanced"], temperature: float = 0.2,
+                 response_cache: Optional[LLMCache] = None, instant_model: str = MODEL_TIERS["instant"],
+                 max_attempts: int = MAX_ATTEMPTS):
         """Initialize the Project Manager agent.
         
         Args:
             model: Groq model to use
             temperature: Temperature for response generation
+            response_cache: Replies to reuse for identical requests; by
+                default persisted to DEFAULT_CACHE_PATH for DEFAULT_TTL, so
+                reruns of a pipeline skip the calls they already made.
+                Requests sampled above MAX_CACHEABLE_TEMPERATURE aren't cached
+            instant_model: Faster model for the quick, low-stakes tasks
+            max_attempts: Tries per request before a rate limit or a
+                connection error is raised
         """
+        self.model = model
+        self.instant_model = instant_model
+        self._instant_llm = None  # built on first use
+        self.temperature = temperature
+        self.max_attempts = max_attempts
+        self.response_cache = response_cache or LLMCache(
+            path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL)
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options(self.max_attempts)
         )
         
         self.system_prompt = """You are an experienced Project Manager with expertise in software development projects. Your responsibilities:
@@ -65,45 +173,91 @@ class ProjectManagerAgent:
         - Risk assessment with mitigation strategies
         - Success criteria and quality metrics
         - Communication and reporting plans"""
+
+        # Every call starts with the same byte-identical system prompt, a
+        # prefix the provider's prompt cache can reuse; a task's extra
+        # instructions follow in a second system message. Built once.
+        base = SystemMessage(content=self.system_prompt)
+        self.system_messages = {
+            "default": [base],
+            "review": [base, SystemMessage(content="""For final project review:
+            - Assess completeness against original requirements
+            - Verify quality of all deliverables
+            - Identify any gaps or missing elements
+            - Evaluate overall project success
+            - Provide recommendations for deployment
+            - Create executive summary for stakeholders
+            - Plan post-deployment activities""")],
+            "risks": [base, SystemMessage(content="""Focus on comprehensive risk assessment:
+            - Technical risks and complexity
+            - Schedule and timeline risks
+            - Resource and skill availability risks
+            - External dependency risks
+            - Quality and performance risks
+            - Budget and cost risks
+            - Stakeholder and communication risks""")],
+            "status": [base, SystemMessage(content="""For status reporting:
+            - Provide clear progress summary
+            - Highlight key achievements and milestones
+            - Identify issues and blockers with impact
+            - Communicate risks and mitigation actions
+            - Define clear next steps and timeline
+            - Include metrics and KPIs
+            - Format for stakeholder consumption""")],
+        }
+    
+    def _client(self, instant: bool = False) -> tuple:
+        """The (chat model, model name) to call, the instant tier's if asked for."""
+        if not instant:
+            return self.llm, self.model
+        if self._instant_llm is None:
+            self._instant_llm = ChatGroq(
+                model=self.instant_model,
+                temperature=self.temperature,
+                **client_options(self.max_attempts)
+            )
+        return self._instant_llm, self.instant_model
+    
+    def _invoke(self, messages: list, instant: bool = False, **options) -> str:
+        """Answer a request from the response cache, or ask the LLM and cache it."""
+        llm, model = self._client(instant)
+        return cached_invoke(self.response_cache, llm, model, self.temperature, messages, **options)
     
-    def create_project_plan(self, project_request: str) -> str:
+    def create_project_plan(self, project_request: str, max_tokens: Optional[int] = 4000) -> str:
         """Create a comprehensive project plan from requirements.
         
         Args:
             project_request: Original project requirements and objectives
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Detailed project plan with timeline, tasks, and risk assessment
         """
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""
-            Project Request: {project_request}
-            
-            Please create a comprehensive project plan including:
-            1. Project Overview and Objectives
-            2. Scope Definition (In-scope and Out-of-scope)
-            3. Success Criteria and Acceptance Criteria
-            4. Work Breakdown Structure (WBS)
-            5. Timeline and Milestones
-            6. Resource Requirements
-            7. Risk Assessment and Mitigation Strategies
-            8. Quality Assurance Plan
-            9. Communication and Reporting Plan
-            10. Dependencies and Assumptions
-            11. Budget Considerations (if applicable)
-            12. Next Steps and Action Items
-            
-            Ensure the plan is detailed enough to guide the development team through successful project completion.
-            """)
+        return self._invoke(self._create_project_plan_messages(project_request), max_tokens=max_tokens)
+    
+    async def acreate_project_plan(self, project_request: str, max_tokens: Optional[int] = 4000) -> str:
+        """Async variant of create_project_plan, so other agents' calls can run alongside it."""
+        return await run_limited(self.create_project_plan, project_request, max_tokens)
+    
+    async def acreate_project_plan_stream(self, project_request: str,
+                                          max_tokens: Optional[int] = 4000) -> AsyncIterator[str]:
+        """Yield the answer of create_project_plan in pieces as it is generated."""
+        messages = self._create_project_plan_messages(project_request)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _create_project_plan_messages(self, project_request: str) -> list:
+        """Messages for create_project_plan."""
+        return [
+            *self.system_messages["default"],
+            HumanMessage(content=_CREATE_PROJECT_PLAN_PROMPT.format(project_request=project_request))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
     def review_deliverables(self, project_request: str, project_plan: str, 
                           code_implementation: str, test_results: str, 
-                          documentation: str) -> str:
+                          documentation: str, max_tokens: Optional[int] = 3500) -> str:
         """Conduct final review of all project deliverables.
         
         Args:
@@ -112,99 +266,87 @@ class ProjectManagerAgent:
             code_implementation: Code deliverable from Software Engineer
             test_results: Testing results from QA Engineer
             documentation: Documentation from Technical Writer
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Final project review and deliverable package
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For final project review:
-            - Assess completeness against original requirements
-            - Verify quality of all deliverables
-            - Identify any gaps or missing elements
-            - Evaluate overall project success
-            - Provide recommendations for deployment
-            - Create executive summary for stakeholders
-            - Plan post-deployment activities"""),
-            HumanMessage(content=f"""
-            Original Project Request: {project_request}
-            
-            Project Plan: {project_plan}
-            
-            Code Implementation: {code_implementation}
-            
-            Test Results: {test_results}
-            
-            Documentation: {documentation}
-            
-            Please conduct a comprehensive final review including:
-            1. Executive Summary
-            2. Requirements Compliance Assessment
-            3. Quality Evaluation of All Deliverables
-            4. Gap Analysis and Outstanding Issues
-            5. Project Success Metrics Evaluation
-            6. Final Deliverable Package Organization
-            7. Deployment Readiness Assessment
-            8. Post-Deployment Recommendations
-            9. Lessons Learned and Improvements
-            10. Stakeholder Communication Summary
-            11. Project Closure Activities
-            12. Maintenance and Support Transition Plan
-            """)
+        return self._invoke(self._review_deliverables_messages(project_request, project_plan,
+                                                               code_implementation, test_results,
+                                                               documentation), max_tokens=max_tokens)
+    
+    async def areview_deliverables(self, project_request: str, project_plan: str, 
+                                 code_implementation: str, test_results: str, 
+                                 documentation: str, max_tokens: Optional[int] = 3500) -> str:
+        """Async variant of review_deliverables, so other agents' calls can run alongside it."""
+        return await run_limited(self.review_deliverables, project_request, project_plan,
+                                 code_implementation, test_results, documentation, max_tokens)
+    
+    async def areview_deliverables_stream(self, project_request: str, project_plan: str, 
+                                        code_implementation: str, test_results: str, 
+                                        documentation: str,
+                                        max_tokens: Optional[int] = 3500) -> AsyncIterator[str]:
+        """Yield the answer of review_deliverables in pieces as it is generated."""
+        messages = self._review_deliverables_messages(project_request, project_plan, code_implementation,
+                                                      test_results, documentation)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _review_deliverables_messages(self, project_request: str, project_plan: str, 
+                                    code_implementation: str, test_results: str, 
+                                    documentation: str) -> list:
+        """Messages for review_deliverables."""
+        return [
+            *self.system_messages["review"],
+            HumanMessage(content=_REVIEW_DELIVERABLES_PROMPT.format(project_request=project_request,
+                                                                    project_plan=project_plan,
+                                                                    code_implementation=code_implementation,
+                                                                    test_results=test_results,
+                                                                    documentation=documentation))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def assess_project_risks(self, project_description: str, timeline: str, resources: str) -> str:
+    def assess_project_risks(self, project_description: str, timeline: str, resources: str,
+                             max_tokens: Optional[int] = None) -> str:
         """Assess and analyze project risks.
         
         Args:
             project_description: Description of the project
             timeline: Project timeline
             resources: Available resources
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Risk assessment with mitigation strategies
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            Focus on comprehensive risk assessment:
-            - Technical risks and complexity
-            - Schedule and timeline risks
-            - Resource and skill availability risks
-            - External dependency risks
-            - Quality and performance risks
-            - Budget and cost risks
-            - Stakeholder and communication risks"""),
-            HumanMessage(content=f"""
-            Project Description: {project_description}
-            
-            Timeline: {timeline}
-            
-            Resources: {resources}
-            
-            Please provide a comprehensive risk assessment including:
-            1. Risk Identification and Categorization
-            2. Probability and Impact Analysis
-            3. Risk Priority Matrix
-            4. Mitigation Strategies for High-Priority Risks
-            5. Contingency Plans
-            6. Risk Monitoring and Control Processes
-            7. Risk Communication Plan
-            8. Early Warning Indicators
-            9. Risk Response Strategies
-            10. Overall Risk Profile Assessment
-            """)
+        return self._invoke(self._assess_project_risks_messages(project_description, timeline, resources),
+                            max_tokens=max_tokens)
+    
+    async def aassess_project_risks(self, project_description: str, timeline: str, resources: str,
+                                    max_tokens: Optional[int] = None) -> str:
+        """Async variant of assess_project_risks, so other agents' calls can run alongside it."""
+        return await run_limited(self.assess_project_risks, project_description, timeline, resources, max_tokens)
+    
+    async def aassess_project_risks_stream(self, project_description: str, timeline: str,
+                                           resources: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of assess_project_risks in pieces as it is generated."""
+        messages = self._assess_project_risks_messages(project_description, timeline, resources)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _assess_project_risks_messages(self, project_description: str, timeline: str, resources: str) -> list:
+        """Messages for assess_project_risks."""
+        return [
+            *self.system_messages["risks"],
+            HumanMessage(content=_ASSESS_PROJECT_RISKS_PROMPT.format(project_description=project_description,
+                                                                     timeline=timeline, resources=resources))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
     def create_status_report(self, project_plan: str, current_progress: str, 
-                           issues: str, next_steps: str) -> str:
+                           issues: str, next_steps: str, max_tokens: Optional[int] = 1500) -> str:
         """Create project status report.
         
         Args:
@@ -212,45 +354,37 @@ class ProjectManagerAgent:
             current_progress: Current project progress
             issues: Current issues and blockers
             next_steps: Planned next steps
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Formatted project status report
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For status reporting:
-            - Provide clear progress summary
-            - Highlight key achievements and milestones
-            - Identify issues and blockers with impact
-            - Communicate risks and mitigation actions
-            - Define clear next steps and timeline
-            - Include metrics and KPIs
-            - Format for stakeholder consumption"""),
-            HumanMessage(content=f"""
-            Project Plan: {project_plan}
-            
-            Current Progress: {current_progress}
-            
-            Issues: {issues}
-            
-            Next Steps: {next_steps}
-            
-            Please create a professional status report including:
-            1. Executive Summary
-            2. Project Health Dashboard
-            3. Progress Against Plan
-            4. Key Achievements This Period
-            5. Current Issues and Blockers
-            6. Risk Status Update
-            7. Budget and Resource Status
-            8. Upcoming Milestones
-            9. Next Steps and Action Items
-            10. Stakeholder Action Required
-            11. Success Metrics and KPIs
-            12. Overall Project Health Assessment
-            """)
+        messages = self._create_status_report_messages(project_plan, current_progress, issues, next_steps)
+        return self._invoke(messages, instant=True, max_tokens=max_tokens)
+    
+    async def acreate_status_report(self, project_plan: str, current_progress: str, 
+                                  issues: str, next_steps: str, max_tokens: Optional[int] = 1500) -> str:
+        """Async variant of create_status_report, so other agents' calls can run alongside it."""
+        return await run_limited(self.create_status_report, project_plan, current_progress, issues, next_steps,
+                                 max_tokens)
+    
+    async def acreate_status_report_stream(self, project_plan: str, current_progress: str, 
+                                         issues: str, next_steps: str,
+                                         max_tokens: Optional[int] = 1500) -> AsyncIterator[str]:
+        """Yield the answer of create_status_report in pieces as it is generated."""
+        messages = self._create_status_report_messages(project_plan, current_progress, issues, next_steps)
+        llm, model = self._client(instant=True)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, llm, model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _create_status_report_messages(self, project_plan: str, current_progress: str, 
+                                     issues: str, next_steps: str) -> list:
+        """Messages for create_status_report."""
+        return [
+            *self.system_messages["status"],
+            HumanMessage(content=_CREATE_STATUS_REPORT_PROMPT.format(project_plan=project_plan,
+                                                                     current_progress=current_progress, issues=issues,
+                                                                     next_steps=next_steps))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
@@ -2,26 +2,96 @@
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
-import os
-from dotenv import load_dotenv
+from typing import AsyncIterator, Optional
 
-load_dotenv()
+from langest.tools.groq_client import MAX_ATTEMPTS, MODEL_TIERS, client_options, request_slots, run_limited
+from langest.tools.llm_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LLMCache, astream_cached, cached_invoke
+
+
+# What each task asks for, filled in per call with str.format
+_CREATE_TEST_PLAN_PROMPT = """
+            Please create a comprehensive test plan including:
+            1. Test strategy and approach
+            2. Detailed functional test cases
+            3. Integration test scenarios
+            4. Edge cases and error conditions
+            5. Performance testing considerations
+            6. Security testing requirements
+            7. Test data requirements
+            8. Expected results for each test case
+            9. Risk assessment and mitigation
+            10. Quality evaluation of the code
+            11. Bug reports and recommendations
+            12. Test automation suggestions
+            
+            Project Request: {project_request}
+            
+            Project Plan: {project_plan}
+            
+            Code Implementation: {code_implementation}
+            """
+
+_EXECUTE_TEST_ANALYSIS_PROMPT = """
+            Please provide test execution analysis including:
+            1. Test case execution results (simulated)
+            2. Issues and bugs identified
+            3. Code coverage assessment
+            4. Security vulnerability analysis
+            5. Performance bottlenecks identified
+            6. Error handling evaluation
+            7. Overall quality score and recommendations
+            8. Priority ranking of issues found
+            
+            Test Plan: {test_plan}
+            
+            Code to Analyze: {code}
+            """
+
+_QUALITY_ASSESSMENT_PROMPT = """
+            Please provide a comprehensive quality assessment including:
+            1. Requirements compliance analysis
+            2. Code quality evaluation
+            3. Security assessment
+            4. Performance evaluation
+            5. Maintainability assessment
+            6. Scalability considerations
+            7. Overall quality rating (1-10 scale)
+            8. Critical issues that must be fixed
+            9. Recommendations for improvement
+            10. Go/No-go recommendation for release
+            
+            Requirements: {requirements}
+            
+            Implementation: {implementation}
+            """
 
 
 class QAEngineerAgent:
     """QA Engineer AI Agent."""
     
-    def __init__(self, model: str = "gemma-7b-it", temperature: float = 0.1):
+    def __init__(self, model: str = MODEL_TIERS["balanced"], temperature: float = 0.1,
+                 response_cache: Optional[LLMCache] = None, max_attempts: int = MAX_ATTEMPTS):
         """Initialize the QA Engineer agent.
         
         Args:
             model: Groq model to use
             temperature: Temperature for response generation
+            response_cache: Replies to reuse for identical requests; by
+                default persisted to DEFAULT_CACHE_PATH for DEFAULT_TTL, so
+                reruns of a pipeline skip the calls they already made.
+                Requests sampled above MAX_CACHEABLE_TEMPERATURE aren't cached
+            max_attempts: Tries per request before a rate limit or a
+                connection error is raised
         """
+        self.model = model
+        self.temperature = temperature
+        self.max_attempts = max_attempts
+        self.response_cache = response_cache or LLMCache(
+            path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL)
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options(self.max_attempts)
         )
         
         self.system_prompt = """You are a Senior QA Engineer with expertise in software testing. Your responsibilities:
@@ -57,116 +127,132 @@ class QAEngineerAgent:
         - Bug reports with severity classifications
         - Recommendations for improvements and fixes
         - Test automation suggestions"""
+
+        # Every call starts with the same byte-identical system prompt, a
+        # prefix the provider's prompt cache can reuse; a task's extra
+        # instructions follow in a second system message. Built once.
+        base = SystemMessage(content=self.system_prompt)
+        self.system_messages = {
+            "default": [base],
+            "test_analysis": [base, SystemMessage(content="""For test execution analysis:
+            - Simulate test case execution mentally
+            - Identify potential failures and issues
+            - Assess code coverage and completeness
+            - Evaluate error handling effectiveness
+            - Check for security vulnerabilities
+            - Validate performance characteristics""")],
+        }
     
-    def create_test_plan(self, project_request: str, project_plan: str, code_implementation: str) -> str:
+    def _invoke(self, messages: list, **options) -> str:
+        """Answer a request from the response cache, or ask the LLM and cache it."""
+        return cached_invoke(self.response_cache, self.llm, self.model, self.temperature, messages, **options)
+    
+    def create_test_plan(self, project_request: str, project_plan: str, code_implementation: str,
+                         max_tokens: Optional[int] = None) -> str:
         """Create a comprehensive test plan.
         
         Args:
             project_request: Original project requirements
             project_plan: Project plan from Project Manager
             code_implementation: Code from Software Engineer
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Detailed test plan with test cases and quality assessment
         """
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""
-            Project Request: {project_request}
-            
-            Project Plan: {project_plan}
-            
-            Code Implementation: {code_implementation}
-            
-            Please create a comprehensive test plan including:
-            1. Test strategy and approach
-            2. Detailed functional test cases
-            3. Integration test scenarios
-            4. Edge cases and error conditions
-            5. Performance testing considerations
-            6. Security testing requirements
-            7. Test data requirements
-            8. Expected results for each test case
-            9. Risk assessment and mitigation
-            10. Quality evaluation of the code
-            11. Bug reports and recommendations
-            12. Test automation suggestions
-            """)
+        return self._invoke(self._create_test_plan_messages(project_request, project_plan, code_implementation),
+                            max_tokens=max_tokens)
+    
+    async def acreate_test_plan(self, project_request: str, project_plan: str, code_implementation: str,
+                                max_tokens: Optional[int] = None) -> str:
+        """Async variant of create_test_plan, so other agents' calls can run alongside it."""
+        return await run_limited(self.create_test_plan, project_request, project_plan, code_implementation,
+                                 max_tokens)
+    
+    async def acreate_test_plan_stream(self, project_request: str, project_plan: str,
+                                       code_implementation: str,
+                                       max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of create_test_plan in pieces as it is generated."""
+        messages = self._create_test_plan_messages(project_request, project_plan, code_implementation)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _create_test_plan_messages(self, project_request: str, project_plan: str, code_implementation: str) -> list:
+        """Messages for create_test_plan."""
+        return [
+            *self.system_messages["default"],
+            HumanMessage(content=_CREATE_TEST_PLAN_PROMPT.format(project_request=project_request,
+                                                                 project_plan=project_plan,
+                                                                 code_implementation=code_implementation))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def execute_test_analysis(self, test_plan: str, code: str) -> str:
+    def execute_test_analysis(self, test_plan: str, code: str, max_tokens: Optional[int] = None) -> str:
         """Analyze code execution against test plan.
         
         Args:
             test_plan: Test plan to execute
             code: Code to analyze
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Test execution results and analysis
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For test execution analysis:
-            - Simulate test case execution mentally
-            - Identify potential failures and issues
-            - Assess code coverage and completeness
-            - Evaluate error handling effectiveness
-            - Check for security vulnerabilities
-            - Validate performance characteristics"""),
-            HumanMessage(content=f"""
-            Test Plan: {test_plan}
-            
-            Code to Analyze: {code}
-            
-            Please provide test execution analysis including:
-            1. Test case execution results (simulated)
-            2. Issues and bugs identified
-            3. Code coverage assessment
-            4. Security vulnerability analysis
-            5. Performance bottlenecks identified
-            6. Error handling evaluation
-            7. Overall quality score and recommendations
-            8. Priority ranking of issues found
-            """)
+        return self._invoke(self._execute_test_analysis_messages(test_plan, code), max_tokens=max_tokens)
+    
+    async def aexecute_test_analysis(self, test_plan: str, code: str, max_tokens: Optional[int] = None) -> str:
+        """Async variant of execute_test_analysis, so other agents' calls can run alongside it."""
+        return await run_limited(self.execute_test_analysis, test_plan, code, max_tokens)
+    
+    async def aexecute_test_analysis_stream(self, test_plan: str, code: str,
+                                            max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of execute_test_analysis in pieces as it is generated."""
+        messages = self._execute_test_analysis_messages(test_plan, code)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _execute_test_analysis_messages(self, test_plan: str, code: str) -> list:
+        """Messages for execute_test_analysis."""
+        return [
+            *self.system_messages["test_analysis"],
+            HumanMessage(content=_EXECUTE_TEST_ANALYSIS_PROMPT.format(test_plan=test_plan, code=code))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def quality_assessment(self, requirements: str, implementation: str) -> str:
+    def quality_assessment(self, requirements: str, implementation: str, max_tokens: Optional[int] = 1500) -> str:
         """Perform overall quality assessment.
         
         Args:
             requirements: Original requirements
             implementation: Implementation to assess
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Quality assessment report
         """
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""
-            Requirements: {requirements}
-            
-            Implementation: {implementation}
-            
-            Please provide a comprehensive quality assessment including:
-            1. Requirements compliance analysis
-            2. Code quality evaluation
-            3. Security assessment
-            4. Performance evaluation
-            5. Maintainability assessment
-            6. Scalability considerations
-            7. Overall quality rating (1-10 scale)
-            8. Critical issues that must be fixed
-            9. Recommendations for improvement
-            10. Go/No-go recommendation for release
-            """)
+        return self._invoke(self._quality_assessment_messages(requirements, implementation),
+                            max_tokens=max_tokens, temperature=0)
+    
+    async def aquality_assessment(self, requirements: str, implementation: str,
+                                  max_tokens: Optional[int] = 1500) -> str:
+        """Async variant of quality_assessment, so other agents' calls can run alongside it."""
+        return await run_limited(self.quality_assessment, requirements, implementation, max_tokens)
+    
+    async def aquality_assessment_stream(self, requirements: str, implementation: str,
+                                         max_tokens: Optional[int] = 1500) -> AsyncIterator[str]:
+        """Yield the answer of quality_assessment in pieces as it is generated."""
+        messages = self._quality_assessment_messages(requirements, implementation)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens, temperature=0):
+                yield piece
+    
+    def _quality_assessment_messages(self, requirements: str, implementation: str) -> list:
+        """Messages for quality_assessment."""
+        return [
+            *self.system_messages["default"],
+            HumanMessage(content=_QUALITY_ASSESSMENT_PROMPT.format(requirements=requirements,
+                                                                   implementation=implementation))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
@@ -2,26 +2,69 @@
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
-import os
-from dotenv import load_dotenv
+from typing import AsyncIterator, Optional
 
-load_dotenv()
+from langest.tools.groq_client import MAX_ATTEMPTS, MODEL_TIERS, client_options, request_slots, run_limited
+from langest.tools.llm_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LLMCache, astream_cached, cached_invoke
+
+
+# What each task asks for, filled in per call with str.format
+_PROCESS_REQUEST_PROMPT = """
+            Please provide a complete software implementation including:
+            1. Architecture design and rationale
+            2. Full code implementation with proper structure
+            3. Error handling and input validation
+            4. Installation and setup instructions
+            5. Key technical decisions explained
+            6. Performance and security considerations
+            
+            Project Request: {project_request}
+            
+            Project Plan: {project_plan}
+            """
+
+_REVIEW_CODE_PROMPT = """
+            Please provide a comprehensive code review including:
+            1. Overall code quality assessment
+            2. Bugs or issues identified
+            3. Security considerations
+            4. Performance optimization suggestions
+            5. Code structure and maintainability feedback
+            6. Specific improvement recommendations
+            
+            Requirements: {requirements}
+            
+            Code to Review:
+            {code}
+            """
 
 
 class SoftwareEngineerAgent:
     """Software Engineer AI Agent."""
     
-    def __init__(self, model: str = "llama2-70b-4096", temperature: float = 0.3):
+    def __init__(self, model: str = MODEL_TIERS["balanced"], temperature: float = 0.3,
+                 response_cache: Optional[LLMCache] = None, max_attempts: int = MAX_ATTEMPTS):
         """Initialize the Software Engineer agent.
         
         Args:
             model: Groq model to use
             temperature: Temperature for response generation
+            response_cache: Replies to reuse for identical requests; by
+                default persisted to DEFAULT_CACHE_PATH for DEFAULT_TTL, so
+                reruns of a pipeline skip the calls they already made.
+                Requests sampled above MAX_CACHEABLE_TEMPERATURE aren't cached
+            max_attempts: Tries per request before a rate limit or a
+                connection error is raised
         """
+        self.model = model
+        self.temperature = temperature
+        self.max_attempts = max_attempts
+        self.response_cache = response_cache or LLMCache(
+            path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL)
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options(self.max_attempts)
         )
         
         self.system_prompt = """You are a Senior Software Engineer. Your responsibilities:
@@ -47,71 +90,89 @@ class SoftwareEngineerAgent:
         - Setup and installation instructions
         - Key technical decisions explained
         - Performance and security considerations"""
+
+        # Every call starts with the same byte-identical system prompt, a
+        # prefix the provider's prompt cache can reuse; a task's extra
+        # instructions follow in a second system message. Built once.
+        base = SystemMessage(content=self.system_prompt)
+        self.system_messages = {
+            "default": [base],
+            "code_review": [base, SystemMessage(content="""Additionally, when reviewing code:
+            - Check for bugs and potential issues
+            - Verify alignment with requirements
+            - Suggest improvements for readability and performance
+            - Identify security vulnerabilities
+            - Recommend refactoring opportunities""")],
+        }
+    
+    def _invoke(self, messages: list, **options) -> str:
+        """Answer a request from the response cache, or ask the LLM and cache it."""
+        return cached_invoke(self.response_cache, self.llm, self.model, self.temperature, messages, **options)
     
-    def process_request(self, project_request: str, project_plan: str) -> str:
+    def process_request(self, project_request: str, project_plan: str, max_tokens: Optional[int] = None) -> str:
         """Process the software engineering request.
         
         Args:
             project_request: Original project requirements
             project_plan: Project plan from Project Manager
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Code implementation and technical documentation
         """
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""
-            Project Request: {project_request}
-            
-            Project Plan: {project_plan}
-            
-            Please provide a complete software implementation including:
-            1. Architecture design and rationale
-            2. Full code implementation with proper structure
-            3. Error handling and input validation
-            4. Installation and setup instructions
-            5. Key technical decisions explained
-            6. Performance and security considerations
-            """)
+        return self._invoke(self._process_request_messages(project_request, project_plan), max_tokens=max_tokens)
+    
+    async def aprocess_request(self, project_request: str, project_plan: str,
+                               max_tokens: Optional[int] = None) -> str:
+        """Async variant of process_request, so other agents' calls can run alongside it."""
+        return await run_limited(self.process_request, project_request, project_plan, max_tokens)
+    
+    async def aprocess_request_stream(self, project_request: str, project_plan: str,
+                                      max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of process_request in pieces as it is generated."""
+        messages = self._process_request_messages(project_request, project_plan)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _process_request_messages(self, project_request: str, project_plan: str) -> list:
+        """Messages for process_request."""
+        return [
+            *self.system_messages["default"],
+            HumanMessage(content=_PROCESS_REQUEST_PROMPT.format(project_request=project_request,
+                                                                project_plan=project_plan))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def review_code(self, code: str, requirements: str) -> str:
+    def review_code(self, code: str, requirements: str, max_tokens: Optional[int] = None) -> str:
         """Review existing code against requirements.
         
         Args:
             code: Code to review
             requirements: Original requirements
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Code review with suggestions
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            Additionally, when reviewing code:
-            - Check for bugs and potential issues
-            - Verify alignment with requirements
-            - Suggest improvements for readability and performance
-            - Identify security vulnerabilities
-            - Recommend refactoring opportunities"""),
-            HumanMessage(content=f"""
-            Requirements: {requirements}
-            
-            Code to Review:
-            {code}
-            
-            Please provide a comprehensive code review including:
-            1. Overall code quality assessment
-            2. Bugs or issues identified
-            3. Security considerations
-            4. Performance optimization suggestions
-            5. Code structure and maintainability feedback
-            6. Specific improvement recommendations
-            """)
+        return self._invoke(self._review_code_messages(code, requirements), max_tokens=max_tokens, temperature=0)
+    
+    async def areview_code(self, code: str, requirements: str, max_tokens: Optional[int] = None) -> str:
+        """Async variant of review_code, so other agents' calls can run alongside it."""
+        return await run_limited(self.review_code, code, requirements, max_tokens)
+    
+    async def areview_code_stream(self, code: str, requirements: str,
+                                  max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of review_code in pieces as it is generated."""
+        messages = self._review_code_messages(code, requirements)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens, temperature=0):
+                yield piece
+    
+    def _review_code_messages(self, code: str, requirements: str) -> list:
+        """Messages for review_code."""
+        return [
+            *self.system_messages["code_review"],
+            HumanMessage(content=_REVIEW_CODE_PROMPT.format(code=code, requirements=requirements))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
@@ -2,26 +2,120 @@
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
-import os
-from dotenv import load_dotenv
+from typing import AsyncIterator, Optional
 
-load_dotenv()
+from langest.tools.groq_client import MAX_ATTEMPTS, MODEL_TIERS, client_options, request_slots, run_limited
+from langest.tools.llm_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LLMCache, astream_cached, cached_invoke
+
+
+# What each task asks for, filled in per call with str.format
+_CREATE_DOCUMENTATION_PROMPT = """
+            Please create comprehensive documentation including:
+            1. Executive Summary and Overview
+            2. User Guide with step-by-step instructions
+            3. Installation and Setup Guide
+            4. Configuration and Customization
+            5. API Documentation (if applicable)
+            6. Code Examples and Tutorials
+            7. Troubleshooting Guide
+            8. FAQ Section
+            9. Technical Architecture Overview
+            10. Developer Guide (for maintenance)
+            11. Glossary of Terms
+            12. Version History and Updates
+            
+            Structure the documentation for easy navigation and ensure it serves both technical and non-technical audiences.
+            
+            Project Request: {project_request}
+            
+            Project Plan: {project_plan}
+            
+            Code Implementation: {code_implementation}
+            
+            Test Results: {test_results}
+            """
+
+_CREATE_USER_GUIDE_PROMPT = """
+            Please create a comprehensive user guide including:
+            1. Getting Started section
+            2. Feature overview with benefits
+            3. Step-by-step tutorials
+            4. Common use cases and examples
+            5. Tips and best practices
+            6. Common issues and solutions
+            7. Where to get help
+            
+            Project Description: {project_description}
+            
+            Features: {features}
+            
+            Usage Examples: {usage_examples}
+            """
+
+_CREATE_API_DOCUMENTATION_PROMPT = """
+            Please create comprehensive API documentation including:
+            1. API Overview and Purpose
+            2. Authentication and Authorization
+            3. Endpoint Reference
+            4. Request/Response Formats
+            5. Error Codes and Messages
+            6. Code Examples in Multiple Languages
+            7. SDK Usage Examples
+            8. Rate Limiting and Best Practices
+            9. Changelog and Versioning
+            
+            Source Code: {code}
+            
+            API Details: {api_details}
+            """
+
+_REVIEW_DOCUMENTATION_PROMPT = """
+            Please provide a documentation review including:
+            1. Completeness assessment
+            2. Clarity and readability evaluation
+            3. Organization and structure feedback
+            4. Missing information identification
+            5. Suggestions for improvement
+            6. Consistency check results
+            7. Overall quality rating
+            8. Priority recommendations for updates
+            
+            Requirements: {requirements}
+            
+            Documentation to Review: {documentation}
+            """
 
 
 class TechWriterAgent:
     """Technical Writer AI Agent."""
     
-    def __init__(self, model: str = "mixtral-8x7b-32768", temperature: float = 0.4):
+    def __init__(self, model: str = MODEL_TIERS["balanced"], temperature: float = 0.4,
+                 response_cache: Optional[LLMCache] = None, instant_model: str = MODEL_TIERS["instant"],
+                 max_attempts: int = MAX_ATTEMPTS):
         """Initialize the Technical Writer agent.
         
         Args:
             model: Groq model to use
             temperature: Temperature for response generation
+            response_cache: Replies to reuse for identical requests; by
+                default persisted to DEFAULT_CACHE_PATH for DEFAULT_TTL, so
+                reruns of a pipeline skip the calls they already made.
+                Requests sampled above MAX_CACHEABLE_TEMPERATURE aren't cached
+            instant_model: Faster model for the quick, low-stakes tasks
+            max_attempts: Tries per request before a rate limit or a
+                connection error is raised
         """
+        self.model = model
+        self.instant_model = instant_model
+        self._instant_llm = None  # built on first use
+        self.temperature = temperature
+        self.max_attempts = max_attempts
+        self.response_cache = response_cache or LLMCache(
+            path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL)
         self.llm = ChatGroq(
             model=model,
             temperature=temperature,
-            api_key=os.getenv("GROQ_API_KEY")
+            **client_options(self.max_attempts)
         )
         
         self.system_prompt = """You are an experienced Technical Writer specializing in software documentation. Your responsibilities:
@@ -66,9 +160,55 @@ class TechWriterAgent:
         - Troubleshooting guides
         - FAQ sections
         - Glossary of terms when needed"""
+
+        # Every call starts with the same byte-identical system prompt, a
+        # prefix the provider's prompt cache can reuse; a task's extra
+        # instructions follow in a second system message. Built once.
+        base = SystemMessage(content=self.system_prompt)
+        self.system_messages = {
+            "default": [base],
+            "user_guide": [base, SystemMessage(content="""Focus on creating user-centric documentation that:
+            - Uses simple, clear language
+            - Provides step-by-step instructions
+            - Includes practical examples
+            - Anticipates user questions
+            - Offers multiple ways to accomplish tasks""")],
+            "api_docs": [base, SystemMessage(content="""For API documentation, focus on:
+            - Clear endpoint descriptions
+            - Request/response examples
+            - Parameter specifications
+            - Error codes and handling
+            - Authentication requirements
+            - Rate limiting information
+            - SDK/library usage examples""")],
+            "review": [base, SystemMessage(content="""When reviewing documentation:
+            - Check for completeness against requirements
+            - Verify clarity and readability
+            - Ensure logical organization
+            - Identify missing information
+            - Suggest improvements for user experience
+            - Check for consistency in style and tone""")],
+        }
+    
+    def _client(self, instant: bool = False) -> tuple:
+        """The (chat model, model name) to call, the instant tier's if asked for."""
+        if not instant:
+            return self.llm, self.model
+        if self._instant_llm is None:
+            self._instant_llm = ChatGroq(
+                model=self.instant_model,
+                temperature=self.temperature,
+                **client_options(self.max_attempts)
+            )
+        return self._instant_llm, self.instant_model
+    
+    def _invoke(self, messages: list, instant: bool = False, **options) -> str:
+        """Answer a request from the response cache, or ask the LLM and cache it."""
+        llm, model = self._client(instant)
+        return cached_invoke(self.response_cache, llm, model, self.temperature, messages, **options)
     
     def create_documentation(self, project_request: str, project_plan: str, 
-                           code_implementation: str, test_results: str) -> str:
+                           code_implementation: str, test_results: str, max_tokens: Optional[int] = 4000) -> str:
         """Create comprehensive project documentation.
         
         Args:
@@ -76,161 +216,150 @@ class TechWriterAgent:
             project_plan: Project plan from Project Manager
             code_implementation: Code from Software Engineer
             test_results: Test results from QA Engineer
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Complete documentation package
         """
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""
-            Project Request: {project_request}
-            
-            Project Plan: {project_plan}
-            
-            Code Implementation: {code_implementation}
-            
-            Test Results: {test_results}
-            
-            Please create comprehensive documentation including:
-            1. Executive Summary and Overview
-            2. User Guide with step-by-step instructions
-            3. Installation and Setup Guide
-            4. Configuration and Customization
-            5. API Documentation (if applicable)
-            6. Code Examples and Tutorials
-            7. Troubleshooting Guide
-            8. FAQ Section
-            9. Technical Architecture Overview
-            10. Developer Guide (for maintenance)
-            11. Glossary of Terms
-            12. Version History and Updates
-            
-            Structure the documentation for easy navigation and ensure it serves both technical and non-technical audiences.
-            """)
+        return self._invoke(self._create_documentation_messages(project_request, project_plan,
+                                                                code_implementation, test_results),
+                                                                max_tokens=max_tokens)
+    
+    async def acreate_documentation(self, project_request: str, project_plan: str, 
+                                  code_implementation: str, test_results: str,
+                                  max_tokens: Optional[int] = 4000) -> str:
+        """Async variant of create_documentation, so other agents' calls can run alongside it."""
+        return await run_limited(self.create_documentation, project_request, project_plan,
+                                 code_implementation, test_results, max_tokens)
+    
+    async def acreate_documentation_stream(self, project_request: str, project_plan: str, 
+                                         code_implementation: str, test_results: str,
+                                         max_tokens: Optional[int] = 4000) -> AsyncIterator[str]:
+        """Yield the answer of create_documentation in pieces as it is generated."""
+        messages = self._create_documentation_messages(project_request, project_plan, code_implementation, test_results)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _create_documentation_messages(self, project_request: str, project_plan: str, 
+                                     code_implementation: str, test_results: str) -> list:
+        """Messages for create_documentation."""
+        return [
+            *self.system_messages["default"],
+            HumanMessage(content=_CREATE_DOCUMENTATION_PROMPT.format(project_request=project_request,
+                                                                     project_plan=project_plan,
+                                                                     code_implementation=code_implementation,
+                                                                     test_results=test_results))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def create_user_guide(self, project_description: str, features: str, usage_examples: str) -> str:
+    def create_user_guide(self, project_description: str, features: str, usage_examples: str,
+                          max_tokens: Optional[int] = None) -> str:
         """Create focused user guide documentation.
         
         Args:
             project_description: Description of the project
             features: List of features
             usage_examples: Usage examples
+            max_tokens: Most tokens the answer may take
             
         Returns:
             User guide documentation
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            Focus on creating user-centric documentation that:
-            - Uses simple, clear language
-            - Provides step-by-step instructions
-            - Includes practical examples
-            - Anticipates user questions
-            - Offers multiple ways to accomplish tasks"""),
-            HumanMessage(content=f"""
-            Project Description: {project_description}
-            
-            Features: {features}
-            
-            Usage Examples: {usage_examples}
-            
-            Please create a comprehensive user guide including:
-            1. Getting Started section
-            2. Feature overview with benefits
-            3. Step-by-step tutorials
-            4. Common use cases and examples
-            5. Tips and best practices
-            6. Common issues and solutions
-            7. Where to get help
-            """)
+        messages = self._create_user_guide_messages(project_description, features, usage_examples)
+        return self._invoke(messages, instant=True, max_tokens=max_tokens)
+    
+    async def acreate_user_guide(self, project_description: str, features: str, usage_examples: str,
+                                 max_tokens: Optional[int] = None) -> str:
+        """Async variant of create_user_guide, so other agents' calls can run alongside it."""
+        return await run_limited(self.create_user_guide, project_description, features, usage_examples, max_tokens)
+    
+    async def acreate_user_guide_stream(self, project_description: str, features: str,
+                                        usage_examples: str,
+                                        max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of create_user_guide in pieces as it is generated."""
+        messages = self._create_user_guide_messages(project_description, features, usage_examples)
+        llm, model = self._client(instant=True)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, llm, model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _create_user_guide_messages(self, project_description: str, features: str, usage_examples: str) -> list:
+        """Messages for create_user_guide."""
+        return [
+            *self.system_messages["user_guide"],
+            HumanMessage(content=_CREATE_USER_GUIDE_PROMPT.format(project_description=project_description,
+                                                                  features=features, usage_examples=usage_examples))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def create_api_documentation(self, code: str, api_details: str) -> str:
+    def create_api_documentation(self, code: str, api_details: str, max_tokens: Optional[int] = None) -> str:
         """Create API documentation from code and details.
         
         Args:
             code: Source code containing API
             api_details: Additional API details
+            max_tokens: Most tokens the answer may take
             
         Returns:
             API documentation
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            For API documentation, focus on:
-            - Clear endpoint descriptions
-            - Request/response examples
-            - Parameter specifications
-            - Error codes and handling
-            - Authentication requirements
-            - Rate limiting information
-            - SDK/library usage examples"""),
-            HumanMessage(content=f"""
-            Source Code: {code}
-            
-            API Details: {api_details}
-            
-            Please create comprehensive API documentation including:
-            1. API Overview and Purpose
-            2. Authentication and Authorization
-            3. Endpoint Reference
-            4. Request/Response Formats
-            5. Error Codes and Messages
-            6. Code Examples in Multiple Languages
-            7. SDK Usage Examples
-            8. Rate Limiting and Best Practices
-            9. Changelog and Versioning
-            """)
+        return self._invoke(self._create_api_documentation_messages(code, api_details), max_tokens=max_tokens)
+    
+    async def acreate_api_documentation(self, code: str, api_details: str,
+                                        max_tokens: Optional[int] = None) -> str:
+        """Async variant of create_api_documentation, so other agents' calls can run alongside it."""
+        return await run_limited(self.create_api_documentation, code, api_details, max_tokens)
+    
+    async def acreate_api_documentation_stream(self, code: str, api_details: str,
+                                               max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield the answer of create_api_documentation in pieces as it is generated."""
+        messages = self._create_api_documentation_messages(code, api_details)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, self.llm, self.model, self.temperature, messages,
+                                              max_tokens=max_tokens):
+                yield piece
+    
+    def _create_api_documentation_messages(self, code: str, api_details: str) -> list:
+        """Messages for create_api_documentation."""
+        return [
+            *self.system_messages["api_docs"],
+            HumanMessage(content=_CREATE_API_DOCUMENTATION_PROMPT.format(code=code, api_details=api_details))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
     
-    def review_documentation(self, documentation: str, requirements: str) -> str:
+    def review_documentation(self, documentation: str, requirements: str, max_tokens: Optional[int] = 1200) -> str:
         """Review and improve existing documentation.
         
         Args:
             documentation: Documentation to review
             requirements: Original requirements to check against
+            max_tokens: Most tokens the answer may take
             
         Returns:
             Documentation review with improvement suggestions
         """
-        messages = [
-            SystemMessage(content=self.system_prompt + """
-            
-            When reviewing documentation:
-            - Check for completeness against requirements
-            - Verify clarity and readability
-            - Ensure logical organization
-            - Identify missing information
-            - Suggest improvements for user experience
-            - Check for consistency in style and tone"""),
-            HumanMessage(content=f"""
-            Requirements: {requirements}
-            
-            Documentation to Review: {documentation}
-            
-            Please provide a documentation review including:
-            1. Completeness assessment
-            2. Clarity and readability evaluation
-            3. Organization and structure feedback
-            4. Missing information identification
-            5. Suggestions for improvement
-            6. Consistency check results
-            7. Overall quality rating
-            8. Priority recommendations for updates
-            """)
+        messages = self._review_documentation_messages(documentation, requirements)
+        return self._invoke(messages, instant=True, max_tokens=max_tokens, temperature=0)
+    
+    async def areview_documentation(self, documentation: str, requirements: str,
+                                    max_tokens: Optional[int] = 1200) -> str:
+        """Async variant of review_documentation, so other agents' calls can run alongside it."""
+        return await run_limited(self.review_documentation, documentation, requirements, max_tokens)
+    
+    async def areview_documentation_stream(self, documentation: str, requirements: str,
+                                           max_tokens: Optional[int] = 1200) -> AsyncIterator[str]:
+        """Yield the answer of review_documentation in pieces as it is generated."""
+        messages = self._review_documentation_messages(documentation, requirements)
+        llm, model = self._client(instant=True)
+        async with request_slots():
+            async for piece in astream_cached(self.response_cache, llm, model, self.temperature, messages,
+                                              max_tokens=max_tokens, temperature=0):
+                yield piece
+    
+    def _review_documentation_messages(self, documentation: str, requirements: str) -> list:
+        """Messages for review_documentation."""
+        return [
+            *self.system_messages["review"],
+            HumanMessage(content=_REVIEW_DOCUMENTATION_PROMPT.format(documentation=documentation,
+                                                                     requirements=requirements))
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
@@ -1,41 +1,55 @@
 """Development team graph with 4 AI agents: Software Engineer, QA Engineer, Tech Writer, and Project Manager."""
 
-from typing import TypedDict, Annotated, Literal
+from typing import TypedDict, Annotated, Optional
 import operator
+import re
+import sys
+from langgraph.cache.base import BaseCache
+from langgraph.cache.memory import InMemoryCache
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.types import CachePolicy
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_groq import ChatGroq
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-# Load environment variables
-load_dotenv()
+from langest.tools.groq_client import MODEL_TIERS, client_options, loop_model
+from langest.tools.llm_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LLMCache
 
 
-class DevTeamState(TypedDict):
-    """State for the development team workflow."""
-    messages: Annotated[list, operator.add]
-    project_request: str
-    project_plan: str
-    code_implementation: str
-    test_plan: str
-    test_results: str
-    documentation: str
-    final_deliverable: str
-    current_agent: str
-    next_step: Literal["project_manager", "software_engineer", "qa_engineer", "tech_writer", "review", "end"]
+# Agent outputs are reused for identical node inputs within this window
+NODE_CACHE_TTL = 3600
 
+# Replies are also persisted, so reruns with the same request, as in dev
+# loops and CI, skip the calls; nodes sampled hotter always ask the model
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.2
+_response_cache = LLMCache(path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_temperature=RESPONSE_CACHE_MAX_TEMPERATURE)
 
-def project_manager_node(state: DevTeamState) -> DevTeamState:
-    """Project Manager agent - Plans and coordinates the project."""
-    llm = ChatGroq(
-        model="llama3-8b-8192",
-        temperature=0.2,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    messages = [
-        SystemMessage(content="""You are an experienced Project Manager. Your responsibilities:
+# Nodes that only need the project plan and can run concurrently
+BUILD_BRANCHES = ("software_engineer", "qa_engineer", "tech_writer")
+
+# (model, temperature, output token cap) per agent node. Only the code needs
+# the large model and a long answer; the review summarises digests, so the
+# instant tier does
+MODEL_CONFIG = {
+    "project_manager": (MODEL_TIERS["instant"], 0.2, 2048),
+    "software_engineer": (MODEL_TIERS["balanced"], 0.3, 4096),
+    "qa_engineer": (MODEL_TIERS["instant"], 0.1, 2048),
+    "tech_writer": (MODEL_TIERS["instant"], 0.4, 2048),
+    "review": (MODEL_TIERS["instant"], 0.1, 1024),
+}
+
+# Most of each deliverable the review prompt quotes; longer ones are cut to
+# their outline and closing paragraphs
+REVIEW_ARTIFACT_CHARS = 1500
+
+_HEADING_RE = re.compile(r"^[ \t]*#{1,6}[ \t].*$", re.MULTILINE)
+_CODE_FENCE_RE = re.compile(r"```.*?(?:```|\Z)", re.DOTALL)  # its comments aren't headings
+
+# Each agent's role, sent first and unchanged on every call, so the
+# provider's automatic prompt caching can reuse the prefix across runs
+PM_SYSTEM_PROMPT = """You are an experienced Project Manager. Your responsibilities:
         1. Analyze project requirements thoroughly
         2. Break down the project into clear, actionable tasks
         3. Define project scope, timeline, and deliverables
@@ -48,31 +62,9 @@ def project_manager_node(state: DevTeamState) -> DevTeamState:
         - Task breakdown
         - Success criteria
         - Timeline estimates
-        - Risk assessment"""),
-        HumanMessage(content=f"Project Request: {state['project_request']}")
-    ]
-    
-    response = llm.invoke(messages)
-    
-    return {
-        **state,
-        "project_plan": response.content,
-        "messages": [response],
-        "current_agent": "Project Manager",
-        "next_step": "software_engineer"
-    }
-
+        - Risk assessment"""
 
-def software_engineer_node(state: DevTeamState) -> DevTeamState:
-    """Software Engineer agent - Implements the code solution."""
-    llm = ChatGroq(
-        model="llama3-70b-8192",
-        temperature=0.3,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    messages = [
-        SystemMessage(content="""You are a Senior Software Engineer. Your responsibilities:
+SE_SYSTEM_PROMPT = """You are a Senior Software Engineer. Your responsibilities:
         1. Review project requirements and plan
         2. Design software architecture and implementation strategy
         3. Write clean, efficient, and maintainable code
@@ -84,80 +76,24 @@ def software_engineer_node(state: DevTeamState) -> DevTeamState:
         - Architecture overview
         - Complete code implementation
         - Code comments explaining key decisions
-        - Setup/installation instructions"""),
-        HumanMessage(content=f"""
-        Project Request: {state['project_request']}
-        Project Plan: {state['project_plan']}
-        
-        Please implement the software solution based on the requirements and plan.
-        """)
-    ]
-    
-    response = llm.invoke(messages)
-    
-    return {
-        **state,
-        "code_implementation": response.content,
-        "messages": state["messages"] + [response],
-        "current_agent": "Software Engineer",
-        "next_step": "qa_engineer"
-    }
-
+        - Setup/installation instructions"""
 
-def qa_engineer_node(state: DevTeamState) -> DevTeamState:
-    """QA Engineer agent - Creates test plans and validates the implementation."""
-    llm = ChatGroq(
-        model="llama3-8b-8192",
-        temperature=0.1,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    messages = [
-        SystemMessage(content="""You are a Senior QA Engineer. Your responsibilities:
-        1. Review project requirements and code implementation
+QA_SYSTEM_PROMPT = """You are a Senior QA Engineer. Your responsibilities:
+        1. Review project requirements and the project plan
         2. Create comprehensive test plans and test cases
         3. Identify potential bugs, edge cases, and security issues
         4. Design both functional and non-functional tests
-        5. Validate that implementation meets requirements
-        6. Recommend improvements and fixes
+        5. Define acceptance criteria the implementation must meet
+        6. Recommend quality gates and test automation
         
         Deliver:
         - Detailed test plan with test cases
-        - Test execution results/analysis
-        - Bug reports and recommendations
-        - Quality assessment of the implementation"""),
-        HumanMessage(content=f"""
-        Project Request: {state['project_request']}
-        Project Plan: {state['project_plan']}
-        Code Implementation: {state['code_implementation']}
-        
-        Please create a comprehensive test plan and analyze the code quality.
-        """)
-    ]
-    
-    response = llm.invoke(messages)
-    
-    return {
-        **state,
-        "test_plan": response.content,
-        "test_results": response.content,
-        "messages": state["messages"] + [response],
-        "current_agent": "QA Engineer",
-        "next_step": "tech_writer"
-    }
+        - Acceptance criteria for each requirement
+        - Risk areas and likely defects to watch for
+        - Quality gates for the implementation"""
 
-
-def tech_writer_node(state: DevTeamState) -> DevTeamState:
-    """Tech Writer agent - Creates comprehensive documentation."""
-    llm = ChatGroq(
-        model="llama3-8b-8192",
-        temperature=0.4,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    messages = [
-        SystemMessage(content="""You are an experienced Technical Writer. Your responsibilities:
-        1. Review all project deliverables and create user-friendly documentation
+TW_SYSTEM_PROMPT = """You are an experienced Technical Writer. Your responsibilities:
+        1. Review the project plan and create user-friendly documentation
         2. Write clear, concise, and comprehensive documentation
         3. Create user guides, API documentation, and developer guides
         4. Ensure documentation is accessible to different audience levels
@@ -169,38 +105,9 @@ def tech_writer_node(state: DevTeamState) -> DevTeamState:
         - Technical/API documentation
         - Installation and setup instructions
         - Examples and tutorials
-        - FAQ and troubleshooting section"""),
-        HumanMessage(content=f"""
-        Project Request: {state['project_request']}
-        Project Plan: {state['project_plan']}
-        Code Implementation: {state['code_implementation']}
-        Test Plan & Results: {state['test_plan']}
-        
-        Please create comprehensive documentation for this project.
-        """)
-    ]
-    
-    response = llm.invoke(messages)
-    
-    return {
-        **state,
-        "documentation": response.content,
-        "messages": state["messages"] + [response],
-        "current_agent": "Tech Writer",
-        "next_step": "review"
-    }
+        - FAQ and troubleshooting section"""
 
-
-def review_and_finalize_node(state: DevTeamState) -> DevTeamState:
-    """Final review node - Project Manager reviews all deliverables."""
-    llm = ChatGroq(
-        model="llama3-8b-8192",
-        temperature=0.1,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    messages = [
-        SystemMessage(content="""You are the Project Manager conducting a final review. Your tasks:
+REVIEW_SYSTEM_PROMPT = """You are the Project Manager conducting a final review. Your tasks:
         1. Review all team deliverables for completeness and quality
         2. Ensure the solution meets original requirements
         3. Identify any gaps or missing elements
@@ -211,134 +118,354 @@ def review_and_finalize_node(state: DevTeamState) -> DevTeamState:
         - Executive summary
         - All key deliverables organized clearly
         - Quality assessment
-        - Recommendations for deployment/next steps"""),
-        HumanMessage(content=f"""
-        Original Request: {state['project_request']}
+        - Recommendations for deployment/next steps"""
+
+# Each node's request, filled in from the state. The fixed instructions
+# come first and the state values last, so consecutive requests share the
+# longest possible prefix after the system prompt for Groq's prompt cache
+PM_USER_TEMPLATE = "Project Request: {project_request}"
+
+SE_USER_TEMPLATE = """
+        Please implement the software solution based on the requirements and plan.
         
-        Team Deliverables:
-        - Project Plan: {state['project_plan']}
-        - Code Implementation: {state['code_implementation']}
-        - Test Plan & Results: {state['test_results']}
-        - Documentation: {state['documentation']}
+        Project Request: {project_request}
+        Project Plan: {project_plan}
+        """
+
+QA_USER_TEMPLATE = """
+        Please create a comprehensive test plan for this project.
         
-        Please create the final project deliverable package.
-        """)
-    ]
+        Project Request: {project_request}
+        Project Plan: {project_plan}
+        """
+
+TW_USER_TEMPLATE = """
+        Please create comprehensive documentation for this project.
+        
+        Project Request: {project_request}
+        Project Plan: {project_plan}
+        """
+
+REVIEW_USER_TEMPLATE = """
+        Please create the final project deliverable package from the
+        original request and the team deliverables below.
+        
+        Original Request: {project_request}
+        
+        Team Deliverables:
+        - Project Plan: {project_plan}
+        - Code Implementation: {code_implementation}
+        - Test Plan & Results: {test_results}
+        - Documentation: {documentation}
+        """
+
+# Built once; every call sends the same message objects
+_PM_SYSTEM = SystemMessage(content=PM_SYSTEM_PROMPT)
+_SE_SYSTEM = SystemMessage(content=SE_SYSTEM_PROMPT)
+_QA_SYSTEM = SystemMessage(content=QA_SYSTEM_PROMPT)
+_TW_SYSTEM = SystemMessage(content=TW_SYSTEM_PROMPT)
+_REVIEW_SYSTEM = SystemMessage(content=REVIEW_SYSTEM_PROMPT)
+
+
+class DevTeamState(TypedDict):
+    """State for the development team workflow."""
+    messages: Annotated[list, operator.add]
+    project_request: str
+    project_plan: str
+    code_implementation: str
+    test_plan: str
+    test_results: str
+    documentation: str
+    final_deliverable: str
+    current_agent: str
+
+
+def new_dev_team_state(project_request: str) -> DevTeamState:
+    """Build the starting state for a project request with every field set."""
+    return DevTeamState(
+        project_request=project_request,
+        messages=[],
+        project_plan="",
+        code_implementation="",
+        test_plan="",
+        test_results="",
+        documentation="",
+        final_deliverable="",
+        current_agent=""
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_llm(model: str, temperature: float, max_tokens: int) -> ChatGroq:
+    """Build each (model, temperature, max_tokens) client once and share it across runs."""
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        **client_options()
+    )
+
+
+def _get_async_llm(model: str, temperature: float, max_tokens: int) -> ChatGroq:
+    """The (model, temperature, max_tokens) client for awaiting on the running event loop.
+    
+    It is built on that loop's shared async HTTP client, once per loop.
+    """
+    return loop_model((model, temperature, max_tokens), lambda http_async_client: ChatGroq(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        http_async_client=http_async_client,
+        **client_options()
+    ))
+
+
+def _cached_reply(name: str, key) -> Optional[AIMessage]:
+    """The persisted reply for a response cache key, if there is one.
+    
+    A hit reports the tokens the original call used, or the reply's size
+    for entries stored before usage was recorded.
+    """
+    cached = _response_cache.get(key)
+    if cached is None:
+        return None
+    if cached.get("tokens") is not None:
+        print(f"♻️  {name}: cached reply, {cached['tokens']} tokens saved")
+    else:
+        print(f"♻️  {name}: cached reply, {len(cached['content'])} characters")
+    return AIMessage(content=cached["content"])
+
+
+def _cache_reply(key, response: AIMessage) -> None:
+    """Persist a reply with the tokens it cost, when the API reported them."""
+    usage = response.usage_metadata
+    _response_cache.set(key, {"content": response.content,
+                              "tokens": usage["total_tokens"] if usage else None})
+
+
+def _agent_node(name: str, build_messages, update) -> RunnableLambda:
+    """A graph node asking MODEL_CONFIG[name]'s model for build_messages(state).
     
-    response = llm.invoke(messages)
+    The node's result is update(state, reply). ``graph.invoke`` runs it
+    with ``invoke``; ``graph.ainvoke`` and ``astream`` await ``ainvoke``
+    instead, so concurrent runs on one event loop don't each hold a thread
+    while waiting on Groq. A reply already in the response cache is used
+    without asking.
+    """
+    def run(state: DevTeamState) -> DevTeamState:
+        model, temperature, max_tokens = MODEL_CONFIG[name]
+        messages = build_messages(state)
+        key = _response_cache.key(model, messages, temperature, {"max_tokens": max_tokens})
+        response = _cached_reply(name, key)
+        if response is None:
+            response = _get_llm(model, temperature, max_tokens).invoke(messages)
+            _cache_reply(key, response)
+        return update(state, response)
     
+    async def arun(state: DevTeamState) -> DevTeamState:
+        model, temperature, max_tokens = MODEL_CONFIG[name]
+        messages = build_messages(state)
+        key = _response_cache.key(model, messages, temperature, {"max_tokens": max_tokens})
+        response = _cached_reply(name, key)
+        if response is None:
+            response = await _get_async_llm(model, temperature, max_tokens).ainvoke(messages)
+            _cache_reply(key, response)
+        return update(state, response)
+    
+    return RunnableLambda(run, afunc=arun, name=name)
+
+
+# Project Manager agent - Plans and coordinates the project
+def _project_manager_messages(state: DevTeamState) -> list:
+    return [
+        _PM_SYSTEM,
+        HumanMessage(content=PM_USER_TEMPLATE.format_map(state))
+    ]
+
+
+def _project_manager_update(state: DevTeamState, response) -> DevTeamState:
+    return {
+        "project_plan": response.content,
+        "messages": [response],
+        "current_agent": "Project Manager"
+    }
+
+
+project_manager_node = _agent_node("project_manager", _project_manager_messages, _project_manager_update)
+
+
+# Software Engineer agent - Implements the code solution
+def _software_engineer_messages(state: DevTeamState) -> list:
+    return [
+        _SE_SYSTEM,
+        HumanMessage(content=SE_USER_TEMPLATE.format_map(state))
+    ]
+
+
+def _software_engineer_update(state: DevTeamState, response) -> DevTeamState:
+    # Only this branch's keys: it runs concurrently with QA and docs
+    return {
+        "code_implementation": response.content,
+        "messages": [response]
+    }
+
+
+software_engineer_node = _agent_node("software_engineer", _software_engineer_messages, _software_engineer_update)
+
+
+# QA Engineer agent - Creates test plans and validates the implementation
+def _qa_engineer_messages(state: DevTeamState) -> list:
+    return [
+        _QA_SYSTEM,
+        HumanMessage(content=QA_USER_TEMPLATE.format_map(state))
+    ]
+
+
+def _qa_engineer_update(state: DevTeamState, response) -> DevTeamState:
+    return {
+        "test_plan": response.content,
+        "test_results": response.content,
+        "messages": [response]
+    }
+
+
+qa_engineer_node = _agent_node("qa_engineer", _qa_engineer_messages, _qa_engineer_update)
+
+
+# Tech Writer agent - Creates comprehensive documentation
+def _tech_writer_messages(state: DevTeamState) -> list:
+    return [
+        _TW_SYSTEM,
+        HumanMessage(content=TW_USER_TEMPLATE.format_map(state))
+    ]
+
+
+def _tech_writer_update(state: DevTeamState, response) -> DevTeamState:
+    return {
+        "documentation": response.content,
+        "messages": [response]
+    }
+
+
+tech_writer_node = _agent_node("tech_writer", _tech_writer_messages, _tech_writer_update)
+
+
+def _digest(text: str, max_chars: int = REVIEW_ARTIFACT_CHARS) -> str:
+    """Shorten a deliverable to at most max_chars: its headings, then its last two paragraphs."""
+    if len(text) <= max_chars:
+        return text
+    tail = "\n\n".join(re.split(r"\n\s*\n", text.strip())[-2:])[-max_chars:]
+    prose = _CODE_FENCE_RE.sub("", text)
+    outline = "\n".join(match.group().strip() for match in _HEADING_RE.finditer(prose))
+    room = max_chars - len(tail) - len("\n[...]\n")
+    return f"{outline[:room]}\n[...]\n{tail}" if room > 0 else tail
+
+
+# Final review node - Project Manager reviews all deliverables
+def _review_messages(state: DevTeamState) -> list:
+    return [
+        _REVIEW_SYSTEM,
+        HumanMessage(content=REVIEW_USER_TEMPLATE.format(
+            project_request=state["project_request"],
+            project_plan=_digest(state["project_plan"]),
+            code_implementation=_digest(state["code_implementation"]),
+            test_results=_digest(state["test_results"]),
+            documentation=_digest(state["documentation"])
+        ))
+    ]
+
+
+def _review_update(state: DevTeamState, response) -> DevTeamState:
     return {
-        **state,
         "final_deliverable": response.content,
-        "messages": state["messages"] + [response],
-        "current_agent": "Project Manager (Final Review)",
-        "next_step": "end"
+        "messages": [response],
+        "current_agent": "Project Manager (Final Review)"
     }
 
 
-def route_next_step(state: DevTeamState) -> str:
-    """Route to the next step based on current state."""
-    return state["next_step"]
+review_and_finalize_node = _agent_node("review", _review_messages, _review_update)
 
 
-def create_dev_team_graph() -> StateGraph:
-    """Create the development team workflow graph."""
+def _cache_policy(*keys: str) -> CachePolicy:
+    """Cache a node on just the state fields its prompt is built from."""
+    return CachePolicy(key_func=lambda state: "\x1f".join(state[key] for key in keys), ttl=NODE_CACHE_TTL)
+
+
+def create_dev_team_graph(cache: Optional[BaseCache] = None,
+                          checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """Create the development team workflow graph.
+    
+    Args:
+        cache: Node cache for agent responses; defaults to an in-memory
+            cache, so repeating a request in one process skips the LLM calls
+        checkpointer: Saver for per-thread progress; with one, a run that
+            fails partway can be resumed by invoking the same thread_id with
+            ``None`` as input, re-running only the nodes that didn't finish.
+            No default cache is attached then: LangGraph skips a resumed node
+            that has a cache policy instead of re-running it
+    """
     workflow = StateGraph(DevTeamState)
     
     # Add all agent nodes
-    workflow.add_node("project_manager", project_manager_node)
-    workflow.add_node("software_engineer", software_engineer_node)
-    workflow.add_node("qa_engineer", qa_engineer_node)
-    workflow.add_node("tech_writer", tech_writer_node)
-    workflow.add_node("review", review_and_finalize_node)
+    plan_inputs = _cache_policy("project_request", "project_plan")
+    workflow.add_node("project_manager", project_manager_node, cache_policy=_cache_policy("project_request"))
+    workflow.add_node("software_engineer", software_engineer_node, cache_policy=plan_inputs)
+    workflow.add_node("qa_engineer", qa_engineer_node, cache_policy=plan_inputs)
+    workflow.add_node("tech_writer", tech_writer_node, cache_policy=plan_inputs)
+    workflow.add_node("review", review_and_finalize_node, cache_policy=_cache_policy(
+        "project_request", "project_plan", "code_implementation", "test_results", "documentation"))
     
     # Set entry point
     workflow.set_entry_point("project_manager")
     
-    # Add edges following the workflow: PM -> SE -> QA -> TW -> Review -> End
-    workflow.add_conditional_edges(
-        "project_manager",
-        route_next_step,
-        {
-            "software_engineer": "software_engineer",
-            "end": END
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "software_engineer",
-        route_next_step,
-        {
-            "qa_engineer": "qa_engineer",
-            "end": END
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "qa_engineer",
-        route_next_step,
-        {
-            "tech_writer": "tech_writer",
-            "end": END
-        }
-    )
+    # Once the plan exists, engineering, QA and docs only depend on it, so
+    # they fan out in parallel and the review waits for all three:
+    # PM -> (SE | QA | TW) -> Review -> End
+    # The routing is static, so plain edges: no router call per hop
+    for branch in BUILD_BRANCHES:
+        workflow.add_edge("project_manager", branch)
+    workflow.add_edge(list(BUILD_BRANCHES), "review")
+    workflow.add_edge("review", END)
     
-    workflow.add_conditional_edges(
-        "tech_writer",
-        route_next_step,
-        {
-            "review": "review",
-            "end": END
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "review",
-        route_next_step,
-        {
-            "end": END
-        }
+    return workflow.compile(
+        checkpointer=checkpointer,
+        cache=cache if cache is not None or checkpointer is not None else InMemoryCache()
     )
+
+
+# Compiled once at import and shared by every caller in the process, along
+# with its in-memory node cache; build another with create_dev_team_graph
+# for a different cache or a checkpointer
+DEV_TEAM_GRAPH = create_dev_team_graph()
+invoke = DEV_TEAM_GRAPH.invoke
+
+
+def stream_agent_output(graph, state: DevTeamState, config: Optional[dict] = None):
+    """Yield (node, text) pieces of each agent's answer as it is generated.
     
-    return workflow.compile()
+    The nodes still call ``invoke``; LangGraph's "messages" stream mode
+    has the models stream underneath, so the first words of the plan show
+    up without waiting for whole answers. The build branches' pieces
+    interleave as they run in parallel. Answers served from the node cache
+    yield nothing.
+    """
+    for chunk, metadata in graph.stream(state, config, stream_mode="messages"):
+        if chunk.content:
+            yield metadata["langgraph_node"], chunk.content
 
 
 if __name__ == "__main__":
     # Example usage
-    graph = create_dev_team_graph()
-    
-    result = graph.invoke({
-        "project_request": "Create a Python CLI tool that helps developers manage their Git repositories by providing quick statistics, branch information, and commit summaries",
-        "messages": [],
-        "project_plan": "",
-        "code_implementation": "",
-        "test_plan": "",
-        "test_results": "",
-        "documentation": "",
-        "final_deliverable": "",
-        "current_agent": "",
-        "next_step": "project_manager"
-    })
-    
-    print("=" * 60)
-    print("DEVELOPMENT TEAM PROJECT DELIVERABLE")
-    print("=" * 60)
-    print("\n🎯 PROJECT PLAN:")
-    print("-" * 40)
-    print(result["project_plan"])
-    
-    print("\n💻 CODE IMPLEMENTATION:")
-    print("-" * 40)
-    print(result["code_implementation"])
-    
-    print("\n🧪 QA TESTING:")
-    print("-" * 40)
-    print(result["test_results"])
+    result = invoke(new_dev_team_state(
+        "Create a Python CLI tool that helps developers manage their Git repositories by providing quick statistics, branch information, and commit summaries"
+    ))
     
-    print("\n📚 DOCUMENTATION:")
-    print("-" * 40)
-    print(result["documentation"])
+    lines = ["=" * 60, "DEVELOPMENT TEAM PROJECT DELIVERABLE", "=" * 60]
+    for title, key in (("🎯 PROJECT PLAN", "project_plan"),
+                       ("💻 CODE IMPLEMENTATION", "code_implementation"),
+                       ("🧪 QA TESTING", "test_results"),
+                       ("📚 DOCUMENTATION", "documentation"),
+                       ("📋 FINAL DELIVERABLE", "final_deliverable")):
+        lines.extend([f"\n{title}:", "-" * 40, result[key]])
     
-    print("\n📋 FINAL DELIVERABLE:")
-    print("-" * 40)
-    print(result["final_deliverable"])
+    sys.stdout.write("\n".join(lines) + "\n")
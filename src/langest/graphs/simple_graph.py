@@ -2,14 +2,12 @@
 
 from typing import TypedDict, Annotated
 import operator
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
-import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from langest.tools.groq_client import client_options
 
 
 class GraphState(TypedDict):
@@ -19,14 +17,20 @@ class GraphState(TypedDict):
     output: str
 
 
+@lru_cache(maxsize=None)
+def _get_llm(model: str, temperature: float) -> ChatGroq:
+    """Build each (model, temperature) client once and share it across runs."""
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        **client_options()
+    )
+
+
 def chatbot_node(state: GraphState) -> GraphState:
     """Simple chatbot node that processes the input message."""
-    # Initialize the Groq LLM
-    llm = ChatGroq(
-        model="mixtral-8x7b-32768",  # You can also use "llama2-70b-4096", "gemma-7b-it", etc.
-        temperature=0.7,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
+    # The Groq LLM; you can also use "llama2-70b-4096", "gemma-7b-it", etc.
+    llm = _get_llm("mixtral-8x7b-32768", 0.7)
     
     # Create messages
     messages = [
@@ -1 +1,10 @@
 """Tools module for LangGraph tools and utilities."""
+
+from langest.tools.fix_cache import FixProgram, StructuralFixCache
+from langest.tools.groq_client import client_options, run_parallel, shared_http_client
+from langest.tools.json_extract import decode_first_object
+from langest.tools.llm_cache import LLMCache
+from langest.tools.process import run_command
+
+__all__ = ["FixProgram", "LLMCache", "StructuralFixCache", "client_options", "decode_first_object", "run_command",
+           "run_parallel", "shared_http_client"]
@@ -0,0 +1,54 @@
+"""File writes shared by the agents that apply LLM-proposed changes."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Set
+
+# Changes touching more files than this are written from the I/O pool
+PARALLEL_WRITE_THRESHOLD = 4
+
+# Directories already created this process, so repeated writes skip the mkdir
+_ensured_dirs: Set[str] = set()
+
+
+def ensure_dir(directory: str) -> None:
+    """Create a directory (and parents) unless this process already did."""
+    if directory and directory not in _ensured_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+
+def _write_bytes(file_path: str, data: bytes) -> None:
+    """Write data with raw os.write calls, skipping the text layer."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_text(file_path: str, content: str, ensure_parent: bool = True) -> None:
+    """Write a file, creating its directory on first use.
+
+    Pass ``ensure_parent=False`` when the caller already created it.
+    """
+    data = content.encode("utf-8")
+    directory = os.path.dirname(file_path)
+    if ensure_parent:
+        ensure_dir(directory)
+    try:
+        _write_bytes(file_path, data)
+    except FileNotFoundError:
+        # Removed since it was ensured (a fix can rm -rf); create it again
+        _ensured_dirs.discard(directory)
+        ensure_dir(directory)
+        _write_bytes(file_path, data)
+
+
+@lru_cache(maxsize=1)
+def io_pool() -> ThreadPoolExecutor:
+    """Thread pool shared by every agent for batches of file I/O."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="agent-io")
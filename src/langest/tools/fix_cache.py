@@ -0,0 +1,167 @@
+"""Structural cache of LLM-generated fix programs keyed by error shape."""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+from string import Template
+from typing import Callable, Dict, Optional
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "langest" / "fix_programs.json"
+
+_PATH = re.compile(r"(?:\.{0,2}/)?(?:[\w.-]+/)*[\w-]+\.[A-Za-z]\w*")
+_NUMBER = re.compile(r"\d+")
+
+
+def canonicalize(error: str) -> str:
+    """Reduce an error message to its shape.
+
+    File paths become ``<file>`` and numbers (line, column, counts) become
+    ``<n>``, so two reports of the same mistake at different locations
+    share one key.
+    """
+    text = _PATH.sub("<file>", error)
+    text = _NUMBER.sub("<n>", text)
+    return " ".join(text.split())
+
+
+@dataclass
+class FixProgram:
+    """A regex rewrite that fixes one class of error without the LLM.
+
+    Attributes:
+        pattern: Regex matched against the error description; its named
+            groups can be referenced as ``${name}`` in ``search`` and
+            ``template``
+        search: Regex applied to each matching file
+        template: Replacement for ``search`` (``re.sub`` syntax)
+        files_glob: Glob, relative to the project root, of files to rewrite
+    """
+
+    pattern: str
+    search: str
+    template: str
+    files_glob: str
+
+    def __post_init__(self) -> None:
+        """Reject programs with a bad regex or a glob reaching outside the project."""
+        re.compile(self.pattern)
+        re.compile(self.search)
+        glob = PurePosixPath(self.files_glob.replace("\\", "/"))
+        if not self.files_glob or glob.is_absolute() or ".." in glob.parts:
+            raise ValueError(f"files_glob must stay inside the project: {self.files_glob!r}")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FixProgram":
+        """Build a program from a JSON object, validating it."""
+        return cls(**{field: str(data[field]) for field in ("pattern", "search", "template", "files_glob")})
+
+    def match(self, error: str) -> Optional[re.Match]:
+        """Return the match of this program's pattern in the error, if any."""
+        return re.search(self.pattern, error, re.MULTILINE)
+
+    def apply(self, error: str, project_path: str) -> Dict[Path, str]:
+        """Rewrite the project's files for the given error.
+
+        Files that aren't UTF-8 text are skipped. If a rewrite fails
+        partway, the files already changed are restored before the error
+        propagates.
+
+        Returns:
+            Original contents of every file that changed, for ``restore``
+        """
+        match = self.match(error)
+        if match is None:
+            return {}
+        groups = {name: value for name, value in match.groupdict().items() if value is not None}
+        search = Template(self.search).safe_substitute({k: re.escape(v) for k, v in groups.items()})
+        template = Template(self.template).safe_substitute({k: v.replace("\\", "\\\\") for k, v in groups.items()})
+
+        originals = {}
+        try:
+            for path in Path(project_path).glob(self.files_glob):
+                if not path.is_file():
+                    continue
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except UnicodeDecodeError:  # a binary, such as a built executable
+                    continue
+                updated = re.sub(search, template, text, flags=re.MULTILINE)
+                if updated != text:
+                    originals[path] = text
+                    path.write_text(updated, encoding="utf-8")
+        except BaseException:
+            self.restore(originals)
+            raise
+        return originals
+
+    @staticmethod
+    def restore(originals: Dict[Path, str]) -> None:
+        """Undo an ``apply`` using the contents it returned."""
+        for path, text in originals.items():
+            path.write_text(text, encoding="utf-8")
+
+
+class StructuralFixCache:
+    """Persistent map from canonical error shapes to validated fix programs."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        """Load any programs saved by earlier sessions.
+
+        Args:
+            path: JSON file the programs are persisted to
+        """
+        self.path = Path(path)
+        self.programs: Dict[str, FixProgram] = {}
+        try:
+            for key, data in json.loads(self.path.read_text()).items():
+                self.programs[key] = FixProgram.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError, re.error):
+            pass
+
+    def lookup(self, error: str) -> Optional[FixProgram]:
+        """Find the program cached for the error's shape, if its pattern matches."""
+        program = self.programs.get(canonicalize(error))
+        if program is not None and program.match(error):
+            return program
+        return None
+
+    def validate(self, program: FixProgram, error: str, project_path: str,
+                 verify_command: str, run: Callable[..., dict]) -> bool:
+        """Dry-run a program on a copy of the project.
+
+        Args:
+            program: Candidate fix program
+            error: Error description the program was generated for
+            project_path: Project to copy
+            verify_command: Command that failed with the error
+            run: Executor called as ``run(command, cwd=...)`` returning a
+                result dict with a ``success`` key
+
+        Returns:
+            True if the command fails on the unmodified copy, the program
+            changes something, and the command then passes
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            copy = Path(tmp) / "project"
+            shutil.copytree(project_path, copy, symlinks=True, ignore=shutil.ignore_patterns(".git", "node_modules"))
+            if run(verify_command, cwd=str(copy))["success"]:
+                return False  # nothing to fix, so passing afterwards proves nothing
+            if not program.apply(error, str(copy)):
+                return False
+            return bool(run(verify_command, cwd=str(copy))["success"])
+
+    def add(self, error: str, program: FixProgram) -> None:
+        """Store a validated program and persist the cache."""
+        self.programs[canonicalize(error)] = program
+        self.save()
+
+    def save(self) -> None:
+        """Write the cache atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({key: asdict(p) for key, p in self.programs.items()}, indent=2))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,181 @@
+"""Shared HTTP transport for Groq chat models."""
+
+import asyncio
+import os
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, TypeVar, cast
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # optional: httpx needs it for HTTP/2
+    h2 = None  # type: ignore[assignment]
+
+# Once per process, for every agent and graph that builds a model
+load_dotenv()
+
+# Groq models by what a call needs: quick answers for low-stakes tasks, or
+# the larger model where the quality of the answer matters
+MODEL_TIERS = {
+    "instant": "llama-3.1-8b-instant",
+    "balanced": "llama-3.3-70b-versatile",
+}
+
+# Idle connections stay open this long, so calls between agent steps reuse them
+KEEPALIVE_EXPIRY = 60
+
+# Pool sizes: enough idle connections kept for a full fan-out of agent
+# calls, with headroom for the models the graphs build alongside them
+MAX_KEEPALIVE_CONNECTIONS = 16
+MAX_CONNECTIONS = 32
+
+# A stalled connect fails fast and is retried; a read may take the time a
+# long generation needs between chunks
+REQUEST_TIMEOUT = httpx.Timeout(60, connect=10)
+
+# Tries per request before an error reaches the agent. The Groq SDK retries
+# rate limits, 5xx responses, timeouts and dropped connections with jittered
+# exponential backoff, waiting as long as a 429's retry-after asks
+MAX_ATTEMPTS = 6
+
+# Requests the async agent variants have in flight at once, per event loop,
+# to stay within Groq's rate limits during fan-out
+MAX_CONCURRENT_REQUESTS = 8
+
+# asyncio primitives belong to one loop, so each loop gets its own limit
+_request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary())
+
+# Async connections belong to one loop too, and so do the models built on
+# them; closed loops' entries are dropped
+_async_http_clients: Dict[asyncio.AbstractEventLoop, "_LoopTransport"] = {}
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=1)
+def shared_http_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP client for ChatGroq.
+
+    Every model built with it reuses the same keep-alive connections, so
+    the TCP and TLS handshakes happen once per process instead of once per
+    client, and with ``h2`` installed requests are multiplexed over HTTP/2.
+    The Groq SDK sends its own timeout with each request, REQUEST_TIMEOUT
+    when built with client_options().
+    """
+    return httpx.Client(http2=h2 is not None, limits=_pool_limits(), timeout=REQUEST_TIMEOUT)
+
+
+class _LoopTransport:
+    """One event loop's pooled async HTTP client and the models built on it."""
+
+    def __init__(self) -> None:
+        self.client = httpx.AsyncClient(http2=h2 is not None, limits=_pool_limits(), timeout=REQUEST_TIMEOUT)
+        self.models: Dict[Hashable, Any] = {}
+        # asyncio.run() finalizes the loop's async generators before closing
+        # it, so this one closes the client while the loop can still await it
+        self._closer = _close_at_shutdown(self.client)
+        asyncio.ensure_future(self._closer.__anext__())
+
+
+async def _close_at_shutdown(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def _loop_transport() -> _LoopTransport:
+    loop = asyncio.get_running_loop()
+    for closed in [other for other in _async_http_clients if other.is_closed()]:
+        del _async_http_clients[closed]
+    transport = _async_http_clients.get(loop)
+    if transport is None:
+        transport = _async_http_clients[loop] = _LoopTransport()
+    return transport
+
+
+def shared_async_http_client() -> httpx.AsyncClient:
+    """Return the running event loop's pooled HTTP client, for models awaited on it.
+
+    The async counterpart of shared_http_client(). Its connections can't
+    be reused from another loop, so each loop gets a client of its own,
+    closed when ``asyncio.run`` shuts the loop down.
+    """
+    return _loop_transport().client
+
+
+def loop_model(key: Hashable, build: Callable[[httpx.AsyncClient], T]) -> T:
+    """Return the running loop's model for key, built once by build(its client).
+
+    Models live and die with their loop's entry, so a closed loop's
+    client isn't kept alive by the models built on it.
+    """
+    transport = _loop_transport()
+    if key not in transport.models:
+        transport.models[key] = build(transport.client)
+    return cast(T, transport.models[key])
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS, max_connections=MAX_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY)
+
+
+def client_options(max_attempts: int = MAX_ATTEMPTS) -> dict:
+    """Connection settings every ChatGroq is built with.
+
+    That is the API key, shared_http_client(), REQUEST_TIMEOUT, and
+    retries of transient failures so a rate limit doesn't abort a whole
+    pipeline run.
+    """
+    return {
+        "api_key": os.getenv("GROQ_API_KEY"),
+        "http_client": shared_http_client(),
+        "timeout": REQUEST_TIMEOUT,
+        "max_retries": max_attempts - 1,
+    }
+
+
+def request_slots() -> asyncio.Semaphore:
+    """The running loop's limit of MAX_CONCURRENT_REQUESTS model calls at once."""
+    loop = asyncio.get_running_loop()
+    slots = _request_slots.get(loop)
+    if slots is None:
+        slots = _request_slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return slots
+
+
+async def run_limited(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking model call in a worker thread, within MAX_CONCURRENT_REQUESTS.
+
+    The async agent methods use it, so ``asyncio.gather`` over several of
+    them overlaps the calls' network waits while the sync methods, and the
+    pooled client underneath, stay as they are.
+    """
+    async with request_slots():
+        return await asyncio.to_thread(func, *args)
+
+
+async def run_parallel(*coros: Awaitable[Any], limit: int = MAX_CONCURRENT_REQUESTS) -> list:
+    """Await independent agent calls together, at most limit of them at a time.
+
+    Every call is scheduled before any result is awaited, so their network
+    waits overlap::
+
+        test_plan, api_docs = await run_parallel(
+            qa.acreate_test_plan(request, plan, code),
+            writer.acreate_api_documentation(code, api_details))
+
+    Results come back in the order given; the first exception is raised.
+    """
+    slots = asyncio.Semaphore(limit)
+
+    async def run(coro: Awaitable[Any]) -> Any:
+        async with slots:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
@@ -0,0 +1,86 @@
+"""JSON helpers for LLM prompts and replies."""
+
+import json
+from typing import TYPE_CHECKING, Any, Optional, Tuple, cast
+
+try:
+    import orjson
+except ImportError:  # optional: a faster encoder for prompts and cache keys
+    orjson = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def dumps_compact(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize to compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode_first_object(text: str) -> Any:
+    """Decode the first JSON object embedded in free text.
+
+    Tries each '{' in turn, so prose or a markdown fence around the object
+    doesn't matter and no regex has to find where it ends.
+
+    Raises:
+        ValueError: If there is no '{' at all
+        json.JSONDecodeError: The error from the first '{' if none decodes
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("no JSON object in text")
+    if orjson is not None and text.rstrip().endswith('}'):
+        # A bare object (JSON mode, or just the object with leading prose
+        # already skipped) parses in one orjson call
+        try:
+            return orjson.loads(text[start:])
+        except orjson.JSONDecodeError:
+            pass
+    try:
+        return _JSON_DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError as e:
+        first_error = e
+    start = text.find('{', start + 1)
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            pass
+        start = text.find('{', start + 1)
+    raise first_error
+
+
+def stream_first_object(llm: "BaseChatModel", messages: list) -> Tuple[str, Optional[Any]]:
+    """Stream a chat model's reply, stopping as soon as it holds a whole JSON object.
+
+    The chunks are kept in a list and only joined when one closes a brace
+    and the object may be complete, rather than concatenated as they come.
+
+    Returns:
+        (text received, decoded object or None)
+    """
+    pieces: list = []
+    received = 0
+    start = -1
+    for chunk in llm.stream(messages):
+        content = cast(str, chunk.content)  # chat replies are plain text, never content blocks
+        if start == -1:
+            # Only decode from the first '{': a partial reply can contain
+            # a complete nested object that isn't the answer
+            brace = content.find('{')
+            if brace != -1:
+                start = received + brace
+        pieces.append(content)
+        received += len(content)
+        if start != -1 and '}' in content:
+            text = "".join(pieces)
+            try:
+                return text, _JSON_DECODER.raw_decode(text, start)[0]
+            except json.JSONDecodeError:
+                pass
+    return "".join(pieces), None
@@ -0,0 +1,163 @@
+"""Exact-match cache of decoded LLM replies keyed by the full request."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional, Tuple, cast
+
+from langest.tools.json_extract import dumps_compact
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "langest" / "llm_responses.sqlite3"
+
+# Replies kept per cache before the least recently used is dropped
+DEFAULT_MAX_ENTRIES = 128
+
+# Above this temperature the same request may deserve a different reply
+MAX_CACHEABLE_TEMPERATURE = 0.1
+
+# Seconds a persisted agent reply stays valid unless the agent sets its own
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+class LLMCache:
+    """Thread-safe LRU of decoded replies for byte-identical requests.
+
+    The key covers the model, the temperature, any per-call options and
+    every message's type and content, so a hit only happens when the LLM
+    would be sent exactly the same request again. ``stats`` counts hits and misses.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[Path] = None,
+                 ttl: Optional[float] = None, max_temperature: float = MAX_CACHEABLE_TEMPERATURE):
+        """Create an empty cache.
+
+        Args:
+            max_entries: Replies kept in memory
+            path: SQLite file replies are also persisted to, so later
+                sessions can reuse them; in-memory only when None
+            ttl: Seconds a persisted reply stays valid; forever when None
+            max_temperature: Requests sampled hotter than this aren't cached
+        """
+        self.max_entries = max_entries
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def key(self, model: str, messages: list, temperature: float,
+            options: Optional[dict] = None) -> Optional[str]:
+        """Key for a request, or None if its temperature is too high to cache."""
+        if temperature > self.max_temperature:
+            return None
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[message.type, message.content] for message in messages],
+        }
+        if options:  # left out when empty, so keys from before options stay valid
+            payload["options"] = options
+        return hashlib.sha256(dumps_compact(payload, sort_keys=True).encode()).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the persistent store on first use; call with the lock held."""
+        if self._db is None:
+            assert self.path is not None, "only a cache with a path has a store"
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+        return self._db
+
+    def _load(self, key: str) -> Optional[dict]:
+        """Read a persisted reply that hasn't expired; call with the lock held."""
+        if self.path is None:
+            return None
+        row = self._connection().execute("SELECT value, created FROM replies WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        value: dict = json.loads(row[0])
+        return value
+
+    def get(self, key: Optional[str]) -> Optional[dict]:
+        """Return a copy of the cached reply for key, counting the lookup."""
+        if key is None:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                value = self._load(key)
+                if value is None:
+                    self.stats["misses"] += 1
+                    return None
+                self._entries[key] = value
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return dict(value)
+
+    def set(self, key: Optional[str], value: dict) -> None:
+        """Store a reply, evicting the oldest past max_entries."""
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = dict(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path is not None:
+                with self._connection() as db:
+                    db.execute("INSERT OR REPLACE INTO replies VALUES (?, ?, ?)",
+                               (key, dumps_compact(value), time.time()))
+
+
+def _request_key(cache: LLMCache, model: str, temperature: float, messages: list,
+                 options: dict) -> Tuple[Optional[str], dict]:
+    """Drop unset options, and key the request at the temperature it is sent with."""
+    options = {name: value for name, value in options.items() if value is not None}
+    return cache.key(model, messages, options.get("temperature", temperature), options), options
+
+
+def cached_invoke(cache: LLMCache, llm: "BaseChatModel", model: str, temperature: float, messages: list, /,
+                  **options: Any) -> str:
+    """Answer a chat request from the cache, or ask the model and cache its reply.
+
+    Options such as ``max_tokens``, or a ``temperature`` overriding the
+    model's, are sent with the request; those set to None are left out.
+    """
+    key, options = _request_key(cache, model, temperature, messages, options)
+    cached = cache.get(key)
+    if cached is not None:
+        return cast(str, cached["content"])
+    content = cast(str, llm.invoke(messages, **options).content)
+    cache.set(key, {"content": content})
+    return content
+
+
+async def astream_cached(cache: LLMCache, llm: "BaseChatModel", model: str, temperature: float, messages: list, /,
+                        **options: Any) -> AsyncIterator[str]:
+    """Yield a chat reply's text as it arrives, caching the whole reply at the end.
+
+    A cached reply is yielded in one piece. The pieces are joined once,
+    after the stream ends, rather than concatenated as they come. Options
+    are handled as by cached_invoke.
+    """
+    key, options = _request_key(cache, model, temperature, messages, options)
+    cached = cache.get(key)
+    if cached is not None:
+        yield cached["content"]
+        return
+    pieces = []
+    async for chunk in llm.astream(messages, **options):
+        content = cast(str, chunk.content)
+        if content:
+            pieces.append(content)
+            yield content
+    cache.set(key, {"content": "".join(pieces)})
@@ -0,0 +1,132 @@
+"""Running agent commands with bounded output capture."""
+
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+# Lines of each output stream kept from the start and the end of a command;
+# prompts only ever show the first part of it
+OUTPUT_HEAD_LINES = 50
+OUTPUT_TAIL_LINES = 200
+# Longer lines are kept as several pieces, so one can't hold megabytes
+OUTPUT_LINE_CHARS = 1024
+
+# Anything that needs /bin/sh to interpret it: operators, redirection,
+# expansion, globbing, or a leading VAR=value assignment
+_SHELL_META = re.compile(r"[|&;<>()$`\\*?\[\]{}~\n]|^\s*\w+=")
+_CD_COMMAND = re.compile(r"\s*cd\s+(\S+)\s*&&\s*(.*)", re.DOTALL)
+
+
+def exec_args(command: str, cwd: Optional[str]) -> Tuple[Union[str, List[str]], bool, Optional[str]]:
+    """Return (args, shell, cwd) for running a command without a shell if it can.
+
+    A leading 'cd dir &&' becomes the working directory, so the common
+    'cd backend && go build' runs as a plain exec too.
+    """
+    cd = _CD_COMMAND.fullmatch(command)
+    run_cwd: Optional[str]
+    if cd and not _SHELL_META.search(cd.group(1)):
+        run_cwd, rest = os.path.join(cwd or os.getcwd(), cd.group(1)), cd.group(2)
+    else:
+        run_cwd, rest = cwd, command
+    if _SHELL_META.search(rest):
+        return command, True, cwd
+    try:
+        args = shlex.split(rest)
+    except ValueError:  # unbalanced quotes: let the shell report it
+        return command, True, cwd
+    if not args:
+        return command, True, cwd
+    return args, False, run_cwd
+
+
+def _spawn(args: Union[str, List[str]], shell: bool, cwd: Optional[str]) -> "subprocess.Popen[str]":
+    return subprocess.Popen(
+        args,
+        shell=shell,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1
+    )
+
+
+def run_command(command: str, cwd: Optional[str] = None, timeout: int = 60) -> dict:
+    """Run a command, keeping only the head and tail of each output stream.
+
+    The output is drained line by line while the command runs, so a
+    verbose build or test suite never sits in memory whole; the lines in
+    between are replaced by a count of how many were omitted.
+
+    Returns:
+        Dictionary with stdout, stderr, return_code and success
+    """
+    args, shell, run_cwd = exec_args(command, cwd)
+    try:
+        try:
+            proc = _spawn(args, shell, run_cwd)
+        except OSError:
+            if shell:
+                raise
+            # A shell builtin, a missing program or a bad cd: let sh
+            # run it so the exit code and message are the usual ones
+            proc = _spawn(command, True, cwd)
+    except Exception as e:
+        return {"stdout": "", "stderr": str(e), "return_code": 1, "success": False}
+
+    # Per stream: the head lines, the tail lines, and how many were dropped
+    captured: Dict[str, Tuple[List[str], Deque[str], List[int]]] = {
+        "stdout": ([], deque(maxlen=OUTPUT_TAIL_LINES), [0]),
+        "stderr": ([], deque(maxlen=OUTPUT_TAIL_LINES), [0])}
+
+    def drain(name: str) -> None:
+        head, tail, dropped = captured[name]
+        pipe = getattr(proc, name)
+        for line in iter(lambda: pipe.readline(OUTPUT_LINE_CHARS), ""):
+            if len(head) < OUTPUT_HEAD_LINES:
+                head.append(line)
+            else:
+                if len(tail) == tail.maxlen:
+                    dropped[0] += 1
+                tail.append(line)
+
+    readers = [threading.Thread(target=drain, args=(name,), daemon=True) for name in captured]
+    for reader in readers:
+        reader.start()
+
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        return {
+            "stdout": "",
+            "stderr": f"Command timed out after {timeout} seconds",
+            "return_code": 124,
+            "success": False
+        }
+
+    # Background children may keep the pipes open; don't wait on them
+    join_deadline = time.monotonic() + 1
+    for reader in readers:
+        reader.join(timeout=max(0, join_deadline - time.monotonic()))
+
+    def joined(name: str) -> str:
+        head, tail, dropped = captured[name]
+        gap = [f"... {dropped[0]} lines omitted ...\n"] if dropped[0] else []
+        return "".join(head + gap + list(tail))
+
+    return {
+        "stdout": joined("stdout"),
+        "stderr": joined("stderr"),
+        "return_code": proc.returncode,
+        "success": proc.returncode == 0
+    }
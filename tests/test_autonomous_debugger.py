@@ -0,0 +1,215 @@
+"""Tests for the autonomous debugging agent."""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import tempfile
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langest.agents.autonomous_debugger import AutonomousDebuggingAgent
+from langest.tools.process import exec_args
+
+
+class TestProbeCache(unittest.TestCase):
+    """Test cases for caching of read-only probe commands."""
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_debugger.ChatGroq')
+    def setUp(self, mock_chat_groq):
+        """Set up test fixtures."""
+        self.agent = AutonomousDebuggingAgent()
+        self.cwd = tempfile.mkdtemp()
+        self.result = {"command": "ls", "stdout": "", "stderr": "", "return_code": 0, "success": True, "cwd": self.cwd}
+
+    def test_probe_result_is_reused(self):
+        """Test that a successful allowlisted probe only runs once."""
+        with patch.object(self.agent, '_run_command', return_value=self.result) as mock_run:
+            self.agent.execute_command("ls", cwd=self.cwd)
+            self.agent.execute_command("ls", cwd=self.cwd)
+
+        mock_run.assert_called_once()
+
+    def test_mutating_command_invalidates_cache(self):
+        """Test that a non-probe command forces probes to run again."""
+        with patch.object(self.agent, '_run_command', return_value=self.result) as mock_run:
+            self.agent.execute_command("ls", cwd=self.cwd)
+            self.agent.execute_command("npm install", cwd=self.cwd)
+            self.agent.execute_command("ls", cwd=self.cwd)
+
+        self.assertEqual(mock_run.call_count, 3)
+
+    def test_shell_commands_are_not_probes(self):
+        """Test that redirection, chaining or extra arguments keep a command out of the cache."""
+        commands = ["cat x > go.mod", "ls && rm -rf node_modules", "which go; npm install",
+                    "curl -f http://localhost:1/health -o go.mod http://localhost:2/health"]
+        with patch.object(self.agent, '_run_command', return_value=self.result) as mock_run:
+            for command in commands * 2:
+                self.agent.execute_command(command, cwd=self.cwd)
+
+        self.assertEqual(mock_run.call_count, 2 * len(commands))
+
+    def test_build_is_reused_until_a_write(self):
+        """Test that an unchanged tree isn't rebuilt, and a write forces a rebuild."""
+        with patch.object(self.agent, '_run_command', return_value=self.result) as mock_run:
+            self.agent.execute_command("go build", cwd=self.cwd)
+            self.agent.execute_command("go build", cwd=self.cwd)
+            self.agent.write_file(os.path.join(self.cwd, "main.go"), "package main\n")
+            self.agent.execute_command("go build", cwd=self.cwd)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    def test_chained_command_forces_a_rebuild(self):
+        """Test that a cached build is rerun after a command chained onto a probe."""
+        with patch.object(self.agent, '_run_command', return_value=self.result) as mock_run:
+            self.agent.execute_command("cd backend && go build", cwd=self.cwd)
+            self.agent.execute_command("ls && go mod tidy", cwd=self.cwd)
+            self.agent.execute_command("cd backend && go build", cwd=self.cwd)
+
+        self.assertEqual(mock_run.call_count, 3)
+
+    def test_failed_probe_is_not_cached(self):
+        """Test that failing probes are retried rather than cached."""
+        failed = {**self.result, "return_code": 7, "success": False}
+        with patch.object(self.agent, '_run_command', return_value=failed) as mock_run:
+            self.agent.execute_command("curl -f http://localhost:8080/health", cwd=self.cwd)
+            self.agent.execute_command("curl -f http://localhost:8080/health", cwd=self.cwd)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+
+class TestSolutionCache(unittest.TestCase):
+    """Test cases for reuse of fixes that solved an error."""
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_debugger.ChatGroq')
+    def setUp(self, mock_chat_groq):
+        """Set up test fixtures."""
+        self.agent = AutonomousDebuggingAgent()
+        self.agent.llm.stream.side_effect = lambda messages: iter(
+            [MagicMock(content='{"root_cause": "undefined handler", '), MagicMock(content='"solution_type": "FILE_UPDATE"}')])
+        self.cwd = tempfile.mkdtemp()
+        self.failed = {"command": "go build", "stdout": "", "stderr": "./main.go:12:5: undefined: handler", "return_code": 1, "success": False}
+        self.passed = {**self.failed, "stderr": "", "return_code": 0, "success": True}
+
+    @patch('langest.agents.autonomous_debugger.time.sleep')
+    def test_verified_fix_skips_llm(self, mock_sleep):
+        """Test that an error fixed once is fixed again without the LLM."""
+        with patch.object(self.agent, 'execute_command', side_effect=[self.failed, self.passed] * 2):
+            self.assertTrue(self.agent.debug_until_working("go build", self.cwd))
+            self.assertTrue(self.agent.debug_until_working("go build", self.cwd))
+
+        self.agent.llm.stream.assert_called_once()
+
+    @patch('langest.agents.autonomous_debugger.time.sleep')
+    def test_failed_fix_is_not_reused(self, mock_sleep):
+        """Test that a fix followed by the same error is not cached."""
+        with patch.object(self.agent, 'execute_command', side_effect=[self.failed, self.failed, self.passed]):
+            self.assertTrue(self.agent.debug_until_working("go build", self.cwd))
+
+        self.assertEqual(self.agent.llm.stream.call_count, 2)
+
+
+class TestKnownErrors(unittest.TestCase):
+    """Test cases for the rule-based fixes tried before the LLM."""
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_debugger.ChatGroq')
+    def setUp(self, mock_chat_groq):
+        """Set up test fixtures."""
+        self.agent = AutonomousDebuggingAgent()
+        self.agent.llm.stream.side_effect = lambda messages: iter(
+            [MagicMock(content='{"root_cause": "other", "solution_type": "COMMAND_RUN"}')])
+        self.result = {"stdout": "", "stderr": "sh: 1: react-scripts: not found", "return_code": 127, "success": False}
+
+    def test_known_error_skips_llm(self):
+        """Test that a recognised error gets its fix without an LLM call."""
+        solution = self.agent.analyze_and_fix_issue("cd frontend && npm start", self.result)
+
+        self.assertEqual(solution["commands_to_run"], ["cd frontend && npm install"])
+        self.agent.llm.stream.assert_not_called()
+
+    def test_failed_rule_falls_back_to_llm(self):
+        """Test that a rule whose fix left the same error is not tried again."""
+        self.agent.debug_history.append({
+            "iteration": 1,
+            "command": "cd frontend && npm start",
+            "error": self.result["stderr"],
+            "solution": {"rule": "npm_tool"}
+        })
+
+        solution = self.agent.analyze_and_fix_issue("cd frontend && npm start", self.result)
+
+        self.assertEqual(solution["root_cause"], "other")
+        self.agent.llm.stream.assert_called_once()
+
+
+class TestStreamedResponse(unittest.TestCase):
+    """Test cases for decoding the solution from a streamed reply."""
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_debugger.ChatGroq')
+    def test_stops_reading_once_object_is_complete(self, mock_chat_groq):
+        """Test that the stream is abandoned after the closing brace."""
+        agent = AutonomousDebuggingAgent()
+        chunks = iter(['Here: {"root_cause": {"detail": "x"}', ', "solution_type": "COMMAND_RUN"}', ' trailing', ' text'])
+        agent.llm.stream.return_value = (MagicMock(content=chunk) for chunk in chunks)
+
+        text, solution = agent._stream_response([])
+
+        self.assertEqual(solution, {"root_cause": {"detail": "x"}, "solution_type": "COMMAND_RUN"})
+        self.assertEqual(list(chunks), [' trailing', ' text'])
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test cases for reuse of replies to identical requests."""
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_debugger.ChatGroq')
+    def test_identical_request_is_answered_once(self, mock_chat_groq):
+        """Test that the same failure analysed twice only reaches the LLM once."""
+        agent = AutonomousDebuggingAgent()
+        agent.llm.stream.side_effect = lambda messages: iter([MagicMock(content='{"root_cause": "x"}')])
+        result = {"stdout": "", "stderr": "boom", "return_code": 1, "success": False}
+
+        first = agent.analyze_and_fix_issue("make test", result)
+        second = agent.analyze_and_fix_issue("make test", result)
+
+        self.assertEqual(first, second)
+        agent.llm.stream.assert_called_once()
+        self.assertEqual(agent._llm_cache.stats, {"hits": 1, "misses": 1})
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_debugger.ChatGroq')
+    def test_repeated_fix_is_reprompted(self, mock_chat_groq):
+        """Test that a fix already proposed for the error gets a second opinion."""
+        agent = AutonomousDebuggingAgent()
+        replies = iter(['{"solution_type": "COMMAND_RUN", "commands_to_run": ["make clean"]}',
+                        '{"solution_type": "COMMAND_RUN", "commands_to_run": ["make deps"]}'])
+        agent.llm.stream.side_effect = lambda messages: iter([MagicMock(content=next(replies))])
+        result = {"stdout": "", "stderr": "boom", "return_code": 1, "success": False}
+
+        agent.analyze_and_fix_issue("make test", result)
+        second = agent.analyze_and_fix_issue("make test", result)
+
+        self.assertEqual(second["commands_to_run"], ["make deps"])
+        self.assertEqual(agent.llm.stream.call_count, 2)
+
+
+class TestExecArgs(unittest.TestCase):
+    """Test cases for running commands without a shell."""
+
+    def test_cd_prefix_becomes_cwd(self):
+        """Test that a leading cd is turned into the working directory."""
+        self.assertEqual(exec_args("cd backend && go build", "/p"), (["go", "build"], False, "/p/backend"))
+
+    def test_shell_features_keep_the_shell(self):
+        """Test that pipes and globs still go through /bin/sh."""
+        self.assertEqual(exec_args("ls | wc -l", "/p"), ("ls | wc -l", True, "/p"))
+        self.assertEqual(exec_args("cd frontend && rm -rf *", "/p"), ("cd frontend && rm -rf *", True, "/p"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the autonomous updater agent."""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langest.agents.autonomous_updater import AutonomousUpdaterAgent, _test_error
+
+
+class TestProjectContextCache(unittest.TestCase):
+    """Test cases for reuse of the project listing between iterations."""
+
+    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
+    @patch('langest.agents.autonomous_updater.ChatGroq')
+    def setUp(self, mock_chat_groq):
+        """Set up test fixtures."""
+        self.agent = AutonomousUpdaterAgent()
+        self.project = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.project)
+        self.agent.write_file(os.path.join(self.project, "main.go"), "package main\n")
+
+    def test_written_files_are_added_without_a_walk(self):
+        """Test that files written by apply_changes appear in the cached listing."""
+        self.agent.get_project_context(self.project)
+        with patch('langest.agents.autonomous_updater._walk_files') as mock_walk:
+            self.agent.apply_changes({"files_to_create": [{"path": "web/app.js", "content": ""}]}, self.project)
+            context = self.agent.get_project_context(self.project)
+
+        mock_walk.assert_not_called()
+        self.assertIn(os.path.join("web", "app.js"), context)
+
+    def test_commands_drop_the_listing(self):
+        """Test that running a command forces the project to be walked again."""
+        self.agent.get_project_context(self.project)
+        with patch.object(self.agent, 'execute_command', return_value={"success": True}):
+            self.agent.apply_changes({"commands_to_run": ["touch extra.txt"]}, self.project)
+
+        self.assertNotIn(self.project, self.agent._file_lists)
+
+    def test_unchanged_fix_skips_verification(self):
+        """Test that a change identical to the files on disk isn't verified again."""
+        requirements = os.path.join(self.project, "requirements.md")
+        self.agent.write_file(requirements, "Add a handler\n")
+        self.agent.max_iterations = 2
+        unchanged = {"plan": "same", "files_to_update": [{"path": "main.go", "content": "package main\n"}]}
+        failed = {"stdout": "", "stderr": "FAIL", "return_code": 1, "success": False}
+        with patch.object(self.agent, 'analyze_and_propose_changes', return_value=unchanged), \
+                patch.object(self.agent, 'execute_command', return_value=failed) as mock_run, \
+                patch('langest.agents.autonomous_updater.time.sleep'):
+            self.assertFalse(self.agent.run_update(self.project, requirements))
+
+        mock_run.assert_called_once()
+
+
+class TestTestError(unittest.TestCase):
+    """Test cases for what a failed verification sends back to the LLM."""
+
+    def test_long_output_is_truncated_behind_its_error_lines(self):
+        """Test that the error lines come first and the middle of the log is cut."""
+        stdout = "ok\n" * 5000 + "main_test.go:9: Error: want 2, got 3\n" + "ok\n" * 5000
+        error = _test_error({"stdout": stdout, "stderr": "FAIL\tapp\t0.01s\n"})
+
+        self.assertTrue(error.startswith("Error lines:\nFAIL\tapp\t0.01s\nmain_test.go:9: Error: want 2, got 3\n"))
+        self.assertIn("...[TRUNCATED", error)
+        self.assertLess(len(error), 9000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 """Tests for the development team agents and workflow."""
 
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import tempfile
+from pathlib import Path
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -14,6 +17,7 @@ from langest.agents import (
     QAEngineerAgent,
     TechWriterAgent
 )
+from langest.tools.groq_client import run_parallel
 
 
 class TestDevTeamAgents(unittest.TestCase):
@@ -21,73 +25,82 @@ class TestDevTeamAgents(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        self._start(patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'}))
+        # One fake ChatGroq per agent module, and replies to the mocked
+        # models kept out of the real response cache
+        cache_path = Path(tempfile.mkdtemp()) / "replies.sqlite3"
+        self.chat_groq = {}
+        for module in ("project_manager", "software_engineer", "qa_engineer", "tech_writer"):
+            self._start(patch(f"langest.agents.{module}.DEFAULT_CACHE_PATH", cache_path))
+            self.chat_groq[module] = self._start(patch(f"langest.agents.{module}.ChatGroq"))
         self.sample_project_request = "Create a simple Python calculator CLI tool"
         self.sample_project_plan = "Basic project plan for calculator tool"
         self.sample_code = "def add(a, b): return a + b"
         self.sample_test_results = "All tests passed"
         self.sample_documentation = "User guide for calculator"
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.project_manager.ChatGroq')
-    def test_project_manager_initialization(self, mock_chat_groq):
+    def _start(self, patcher):
+        """Start a patcher for the rest of the test."""
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+    
+    def test_project_manager_initialization(self):
         """Test ProjectManager agent initialization."""
         mock_llm = MagicMock()
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["project_manager"].return_value = mock_llm
         
         agent = ProjectManagerAgent()
         
         self.assertIsNotNone(agent)
         self.assertEqual(agent.llm, mock_llm)
-        mock_chat_groq.assert_called_once()
+        self.chat_groq["project_manager"].assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.software_engineer.ChatGroq')
-    def test_software_engineer_initialization(self, mock_chat_groq):
+    def test_software_engineer_initialization(self):
         """Test SoftwareEngineer agent initialization."""
         mock_llm = MagicMock()
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["software_engineer"].return_value = mock_llm
         
         agent = SoftwareEngineerAgent()
         
         self.assertIsNotNone(agent)
         self.assertEqual(agent.llm, mock_llm)
-        mock_chat_groq.assert_called_once()
+        self.chat_groq["software_engineer"].assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.qa_engineer.ChatGroq')
-    def test_qa_engineer_initialization(self, mock_chat_groq):
+    def test_qa_engineer_initialization(self):
         """Test QAEngineer agent initialization."""
         mock_llm = MagicMock()
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["qa_engineer"].return_value = mock_llm
         
         agent = QAEngineerAgent()
         
         self.assertIsNotNone(agent)
         self.assertEqual(agent.llm, mock_llm)
-        mock_chat_groq.assert_called_once()
+        self.chat_groq["qa_engineer"].assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.tech_writer.ChatGroq')
-    def test_tech_writer_initialization(self, mock_chat_groq):
+    def test_tech_writer_initialization(self):
         """Test TechWriter agent initialization."""
         mock_llm = MagicMock()
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["tech_writer"].return_value = mock_llm
         
         agent = TechWriterAgent()
         
         self.assertIsNotNone(agent)
         self.assertEqual(agent.llm, mock_llm)
-        mock_chat_groq.assert_called_once()
+        self.chat_groq["tech_writer"].assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.project_manager.ChatGroq')
-    def test_project_manager_create_plan(self, mock_chat_groq):
+    def test_transient_errors_are_retried(self):
+        """Test that the model retries failed requests up to max_attempts in all."""
+        QAEngineerAgent(max_attempts=3)
+        
+        self.assertEqual(self.chat_groq["qa_engineer"].call_args.kwargs["max_retries"], 2)
+    
+    def test_project_manager_create_plan(self):
         """Test project manager plan creation."""
         mock_llm = MagicMock()
         mock_response = MagicMock()
         mock_response.content = "Sample project plan"
         mock_llm.invoke.return_value = mock_response
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["project_manager"].return_value = mock_llm
         
         agent = ProjectManagerAgent()
         result = agent.create_project_plan(self.sample_project_request)
@@ -95,15 +108,13 @@ class TestDevTeamAgents(unittest.TestCase):
         self.assertEqual(result, "Sample project plan")
         mock_llm.invoke.assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.software_engineer.ChatGroq')
-    def test_software_engineer_process_request(self, mock_chat_groq):
+    def test_software_engineer_process_request(self):
         """Test software engineer request processing."""
         mock_llm = MagicMock()
         mock_response = MagicMock()
         mock_response.content = "Sample code implementation"
         mock_llm.invoke.return_value = mock_response
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["software_engineer"].return_value = mock_llm
         
         agent = SoftwareEngineerAgent()
         result = agent.process_request(self.sample_project_request, self.sample_project_plan)
@@ -111,15 +122,13 @@ class TestDevTeamAgents(unittest.TestCase):
         self.assertEqual(result, "Sample code implementation")
         mock_llm.invoke.assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.qa_engineer.ChatGroq')
-    def test_qa_engineer_create_test_plan(self, mock_chat_groq):
+    def test_qa_engineer_create_test_plan(self):
         """Test QA engineer test plan creation."""
         mock_llm = MagicMock()
         mock_response = MagicMock()
         mock_response.content = "Sample test plan"
         mock_llm.invoke.return_value = mock_response
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["qa_engineer"].return_value = mock_llm
         
         agent = QAEngineerAgent()
         result = agent.create_test_plan(
@@ -131,15 +140,13 @@ class TestDevTeamAgents(unittest.TestCase):
         self.assertEqual(result, "Sample test plan")
         mock_llm.invoke.assert_called_once()
     
-    @patch.dict(os.environ, {'GROQ_API_KEY': 'test_key'})
-    @patch('langest.agents.tech_writer.ChatGroq')
-    def test_tech_writer_create_documentation(self, mock_chat_groq):
+    def test_tech_writer_create_documentation(self):
         """Test tech writer documentation creation."""
         mock_llm = MagicMock()
         mock_response = MagicMock()
         mock_response.content = "Sample documentation"
         mock_llm.invoke.return_value = mock_response
-        mock_chat_groq.return_value = mock_llm
+        self.chat_groq["tech_writer"].return_value = mock_llm
         
         agent = TechWriterAgent()
         result = agent.create_documentation(
@@ -151,6 +158,80 @@ class TestDevTeamAgents(unittest.TestCase):
         
         self.assertEqual(result, "Sample documentation")
         mock_llm.invoke.assert_called_once()
+    
+    def test_async_variants_run_together(self):
+        """Test that async variants of different agents can be gathered."""
+        self.chat_groq["qa_engineer"].return_value.invoke.return_value = MagicMock(content="Sample test plan")
+        self.chat_groq["tech_writer"].return_value.invoke.return_value = MagicMock(content="Sample documentation")
+        qa, writer = QAEngineerAgent(), TechWriterAgent()
+        
+        async def run():
+            return await asyncio.gather(
+                qa.acreate_test_plan(self.sample_project_request, self.sample_project_plan, self.sample_code),
+                writer.acreate_documentation(self.sample_project_request, self.sample_project_plan,
+                                             self.sample_code, self.sample_test_results)
+            )
+        
+        self.assertEqual(asyncio.run(run()), ["Sample test plan", "Sample documentation"])
+    
+    def test_run_parallel_keeps_call_order(self):
+        """Test that run_parallel returns each call's answer in the order given."""
+        self.chat_groq["software_engineer"].return_value.invoke.return_value = MagicMock(content="Sample review")
+        self.chat_groq["tech_writer"].return_value.invoke.return_value = MagicMock(content="Sample API docs")
+        engineer, writer = SoftwareEngineerAgent(), TechWriterAgent()
+        
+        results = asyncio.run(run_parallel(
+            writer.acreate_api_documentation(self.sample_code, "GET /add"),
+            engineer.areview_code(self.sample_code, self.sample_project_request),
+            limit=1
+        ))
+        
+        self.assertEqual(results, ["Sample API docs", "Sample review"])
+    
+    def test_repeated_request_is_answered_from_cache(self):
+        """Test that a rerun with the same inputs doesn't call the LLM again."""
+        self.chat_groq["software_engineer"].return_value.invoke.return_value = MagicMock(content="Sample code implementation")
+        
+        SoftwareEngineerAgent(temperature=0).process_request(self.sample_project_request, self.sample_project_plan)
+        result = SoftwareEngineerAgent(temperature=0).process_request(self.sample_project_request, self.sample_project_plan)
+        
+        self.assertEqual(result, "Sample code implementation")
+        self.chat_groq["software_engineer"].return_value.invoke.assert_called_once()
+    
+    def test_sampled_replies_are_not_cached(self):
+        """Test that a rerun at the engineer's default temperature asks the LLM again."""
+        self.chat_groq["software_engineer"].return_value.invoke.return_value = MagicMock(content="Sample code implementation")
+        
+        SoftwareEngineerAgent().process_request(self.sample_project_request, self.sample_project_plan)
+        SoftwareEngineerAgent().process_request(self.sample_project_request, self.sample_project_plan)
+        
+        self.assertEqual(self.chat_groq["software_engineer"].return_value.invoke.call_count, 2)
+    
+    def test_streamed_answer_is_cached_whole(self):
+        """Test that a streamed answer arrives in pieces and is then cached."""
+        async def astream(messages):
+            for piece in ("def add", "(a, b): ", "return a + b"):
+                yield MagicMock(content=piece)
+        self.chat_groq["software_engineer"].return_value.astream = astream
+        agent = SoftwareEngineerAgent(temperature=0)
+        
+        async def collect():
+            return [piece async for piece in agent.aprocess_request_stream(
+                self.sample_project_request, self.sample_project_plan)]
+        
+        self.assertEqual(asyncio.run(collect()), ["def add", "(a, b): ", "return a + b"])
+        self.assertEqual(agent.process_request(self.sample_project_request, self.sample_project_plan), self.sample_code)
+        self.chat_groq["software_engineer"].return_value.invoke.assert_not_called()
+    
+    def test_review_is_capped_and_deterministic(self):
+        """Test that a review is sent with its token cap at temperature 0."""
+        self.chat_groq["tech_writer"].return_value.invoke.return_value = MagicMock(content="Looks complete")
+        agent = TechWriterAgent()
+        
+        agent.review_documentation(self.sample_documentation, self.sample_project_request)
+        
+        _, kwargs = self.chat_groq["tech_writer"].return_value.invoke.call_args
+        self.assertEqual(kwargs, {"max_tokens": 1200, "temperature": 0})
 
 
 class TestAgentIntegration(unittest.TestCase):
@@ -0,0 +1,141 @@
+"""Tests for the development team workflow graph."""
+
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from langest.tools.llm_cache import LLMCache
+from langest.graphs.dev_team_graph import _digest, create_dev_team_graph, new_dev_team_state, stream_agent_output
+
+
+class TestDigest(unittest.TestCase):
+    """Test cases for shortening deliverables quoted in the review prompt."""
+
+    def test_long_deliverable_keeps_outline_and_ending(self):
+        """Test that a long deliverable is cut to its headings and last paragraphs."""
+        text = "# Plan\n\n" + "detail " * 400 + "\n\n```python\n# not a heading\n```\n\n## Risks\n\nNone.\n\nShip it."
+
+        digest = _digest(text, max_chars=200)
+
+        self.assertEqual(digest, "# Plan\n## Risks\n[...]\nNone.\n\nShip it.")
+
+    def test_short_deliverable_is_unchanged(self):
+        """Test that a deliverable within the limit is quoted whole."""
+        self.assertEqual(_digest("Short plan", max_chars=200), "Short plan")
+
+
+class TestDevTeamGraph(unittest.TestCase):
+    """Test cases for the development team graph."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # Keep replies to the mocked models out of the real response cache
+        patcher = patch('langest.graphs.dev_team_graph._response_cache', LLMCache(max_temperature=0.2))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('langest.graphs.dev_team_graph._get_llm')
+    def test_failed_run_resumes_from_checkpoint(self, mock_get_llm):
+        """Test that resuming a failed run only re-runs the failed agent."""
+        # Responses are real messages because the checkpointer serializes them
+        calls = []
+
+        def get_llm(model, temperature, max_tokens):
+            def invoke(messages):
+                role = messages[0].content.split(".")[0]
+                calls.append(role)
+                if "QA" in role and calls.count(role) == 1:
+                    raise RuntimeError("rate limited")
+                return AIMessage(content=f"{role} output")
+            return MagicMock(invoke=invoke)
+
+        mock_get_llm.side_effect = get_llm
+        graph = create_dev_team_graph(checkpointer=InMemorySaver())
+        config = {"configurable": {"thread_id": "test"}}
+
+        with self.assertRaises(RuntimeError):
+            graph.invoke(new_dev_team_state("Build a calculator"), config)
+        self.assertEqual(graph.get_state(config).next, ("qa_engineer",))
+
+        finished = len(calls)
+        result = graph.invoke(None, config)
+
+        self.assertEqual(len(calls), finished + 2)  # QA again, then the review
+        self.assertTrue(result["test_results"])
+        self.assertTrue(result["final_deliverable"])
+
+
+    @patch('langest.graphs.dev_team_graph._get_llm')
+    def test_agent_output_is_streamed(self, mock_get_llm):
+        """Test that each agent's answer arrives in pieces, tagged with its node."""
+        mock_get_llm.side_effect = lambda model, temperature, max_tokens: GenericFakeChatModel(
+            messages=iter([AIMessage(content="first draft")]))
+
+        pieces = list(stream_agent_output(create_dev_team_graph(), new_dev_team_state("Build a calculator")))
+
+        self.assertEqual(pieces[:3], [("project_manager", "first"), ("project_manager", " "),
+                                      ("project_manager", "draft")])
+        self.assertEqual({node for node, _ in pieces},
+                         {"project_manager", "software_engineer", "qa_engineer", "tech_writer", "review"})
+
+
+    @patch('langest.graphs.dev_team_graph._get_llm')
+    @patch('langest.graphs.dev_team_graph._get_async_llm')
+    def test_async_run_awaits_the_models(self, mock_get_async_llm, mock_get_llm):
+        """Test that ainvoke runs every agent through the async client."""
+        mock_get_async_llm.side_effect = lambda model, temperature, max_tokens: GenericFakeChatModel(
+            messages=iter([AIMessage(content="async output")]))
+
+        result = asyncio.run(create_dev_team_graph().ainvoke(new_dev_team_state("Build a calculator")))
+
+        self.assertEqual(result["final_deliverable"], "async output")
+        self.assertEqual(mock_get_async_llm.call_count, 5)
+        mock_get_llm.assert_not_called()
+
+
+    @patch('langest.graphs.dev_team_graph._get_llm')
+    def test_rerun_reuses_low_temperature_replies(self, mock_get_llm):
+        """Test that a rerun only asks the models of the nodes sampled too hot to cache."""
+        calls = []
+
+        def get_llm(model, temperature, max_tokens):
+            def invoke(messages):
+                calls.append(temperature)
+                return AIMessage(content=f"{temperature} output")
+            return MagicMock(invoke=invoke)
+
+        mock_get_llm.side_effect = get_llm
+        create_dev_team_graph().invoke(new_dev_team_state("Build a calculator"))
+        del calls[:]
+
+        result = create_dev_team_graph().invoke(new_dev_team_state("Build a calculator"))
+
+        self.assertEqual(sorted(calls), [0.3, 0.4])  # the engineer and the writer
+        self.assertEqual(result["final_deliverable"], "0.1 output")
+
+    @patch('builtins.print')
+    @patch('langest.graphs.dev_team_graph._get_llm')
+    def test_cache_hit_reports_tokens_saved(self, mock_get_llm, mock_print):
+        """Test that a reply answered from the cache reports the tokens its call used."""
+        usage = {"input_tokens": 90, "output_tokens": 30, "total_tokens": 120}
+        mock_get_llm.side_effect = lambda model, temperature, max_tokens: MagicMock(
+            invoke=lambda messages: AIMessage(content="output", usage_metadata=usage))
+        create_dev_team_graph().invoke(new_dev_team_state("Build a calculator"))
+        mock_print.reset_mock()
+
+        create_dev_team_graph().invoke(new_dev_team_state("Build a calculator"))
+
+        mock_print.assert_any_call("♻️  project_manager: cached reply, 120 tokens saved")
+
+
+if __name__ == '__main__':
+    unittest.main()
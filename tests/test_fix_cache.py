@@ -0,0 +1,96 @@
+"""Tests for the structural fix program cache."""
+
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langest.tools.fix_cache import FixProgram, StructuralFixCache, canonicalize
+
+
+UNUSED_IMPORT = FixProgram(
+    pattern=r'"(?P<pkg>[\w./-]+)" imported and not used',
+    search=r'^\s*"${pkg}"\n',
+    template='',
+    files_glob='backend/*.go',
+)
+
+
+class TestStructuralFixCache(unittest.TestCase):
+    """Test cases for StructuralFixCache and FixProgram."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp = tempfile.mkdtemp()
+        self.project = Path(self.tmp) / "project"
+        (self.project / "backend").mkdir(parents=True)
+        self.main_go = self.project / "backend" / "main.go"
+        self.main_go.write_text('package main\n\nimport (\n\t"fmt"\n\t"net/http"\n)\n')
+        self.cache_path = Path(self.tmp) / "fix_programs.json"
+
+    def test_canonicalize_strips_locations(self):
+        """Test that errors differing only by file and line share a key."""
+        self.assertEqual(
+            canonicalize('./main.go:4:2: "os" imported and not used'),
+            canonicalize('./server/api.go:17:9: "os" imported and not used'),
+        )
+
+    def test_apply_rewrites_and_restores(self):
+        """Test that a program edits matching files and can be undone."""
+        originals = UNUSED_IMPORT.apply('./main.go:5:2: "net/http" imported and not used', str(self.project))
+
+        self.assertNotIn('net/http', self.main_go.read_text())
+        FixProgram.restore(originals)
+        self.assertIn('net/http', self.main_go.read_text())
+
+    def test_validate_runs_on_a_copy(self):
+        """Test that validation leaves the real project untouched."""
+        cache = StructuralFixCache(self.cache_path)
+        run = lambda command, cwd: {"success": 'net/http' not in (Path(cwd) / "backend" / "main.go").read_text()}
+
+        self.assertTrue(cache.validate(UNUSED_IMPORT, '"net/http" imported and not used', str(self.project), "go build", run))
+        self.assertIn('net/http', self.main_go.read_text())
+
+    def test_validate_needs_a_failing_command(self):
+        """Test that a program isn't validated against a command that already passes."""
+        cache = StructuralFixCache(self.cache_path)
+        run = lambda command, cwd: {"success": True}
+
+        self.assertFalse(cache.validate(UNUSED_IMPORT, '"net/http" imported and not used', str(self.project), "go build", run))
+
+    def test_apply_skips_binaries_and_rejects_escaping_globs(self):
+        """Test that undecodable files are left alone and '..' globs are refused."""
+        binary = self.project / "backend" / "main"
+        binary.write_bytes(b"\x7fELF\xff\xfe\x00")
+        program = FixProgram(pattern=UNUSED_IMPORT.pattern, search=UNUSED_IMPORT.search,
+                             template='', files_glob='backend/*')
+
+        program.apply('"net/http" imported and not used', str(self.project))
+
+        self.assertNotIn('net/http', self.main_go.read_text())
+        self.assertEqual(binary.read_bytes(), b"\x7fELF\xff\xfe\x00")
+        with self.assertRaises(ValueError):
+            FixProgram.from_dict({**UNUSED_IMPORT.__dict__, "files_glob": "../*.go"})
+
+    def test_programs_persist_and_match_variants(self):
+        """Test that a saved program is found for a different occurrence."""
+        StructuralFixCache(self.cache_path).add('./main.go:4:2: "net/http" imported and not used', UNUSED_IMPORT)
+
+        program = StructuralFixCache(self.cache_path).lookup('./api.go:12:2: "net/http" imported and not used')
+        self.assertEqual(program, UNUSED_IMPORT)
+
+    def test_lookup_needs_the_same_error_shape(self):
+        """Test that a program is not reused for an error of another shape."""
+        cache = StructuralFixCache(self.cache_path)
+        cache.add('./main.go:4:2: "net/http" imported and not used', FixProgram(
+            pattern='.*', search=UNUSED_IMPORT.search, template='', files_glob='backend/*.go'))
+
+        self.assertIsNone(cache.lookup('./main.go:9:1: undefined: handler'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for the LLM reply cache."""
+
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langest.tools.llm_cache import LLMCache
+
+
+MESSAGES = [SystemMessage(content="You are a DevOps engineer."), HumanMessage(content="go build fails")]
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test cases for LLMCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.path = Path(tempfile.mkdtemp()) / "replies.sqlite3"
+
+    def test_persisted_reply_is_reused_by_a_new_cache(self):
+        """Test that a reply saved by one session is found by the next."""
+        first = LLMCache(path=self.path)
+        first.set(first.key("m", MESSAGES, 0.0), {"content": "run go mod tidy"})
+
+        second = LLMCache(path=self.path)
+
+        self.assertEqual(second.get(second.key("m", MESSAGES, 0.0)), {"content": "run go mod tidy"})
+        self.assertEqual(second.stats, {"hits": 1, "misses": 0})
+
+    def test_expired_reply_is_a_miss(self):
+        """Test that a persisted reply older than the TTL is not reused."""
+        cache = LLMCache(path=self.path, ttl=60)
+        key = cache.key("m", MESSAGES, 0.0)
+        with patch('langest.tools.llm_cache.time.time', return_value=1000.0):
+            cache.set(key, {"content": "stale"})
+
+        with patch('langest.tools.llm_cache.time.time', return_value=1100.0):
+            self.assertIsNone(LLMCache(path=self.path, ttl=60).get(key))
+
+    def test_hot_requests_are_not_cached(self):
+        """Test that requests above max_temperature get no key."""
+        self.assertIsNone(LLMCache().key("m", MESSAGES, 0.7))
+        self.assertIsNotNone(LLMCache(max_temperature=0.7).key("m", MESSAGES, 0.7))
+
+
+if __name__ == '__main__':
+    unittest.main()